@@ -0,0 +1,328 @@
+"""
+Ambient Listener - Per-session PCM ring buffers, streaming VAD gating and "Hey Buddy" wake-word spotting
+"""
+import difflib
+import logging
+import os
+import re
+import time
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+import numpy as np
+
+from .audio_assembly import WavFormatError
+from .audio_preprocessing import decode_wav, to_mono, resample
+
+logger = logging.getLogger(__name__)
+
+WAKE_PHRASES = ["hey buddy", "hi buddy", "hello buddy", "ok buddy", "okay buddy", "hey buddie", "hey body", "hey birdie", "hey bud"]
+
+
+class PcmRingBuffer:
+    """Fixed-size int16 ring addressed by absolute sample position"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=np.int16)
+        self.write_pos = 0  # total samples ever written
+
+    @property
+    def oldest_pos(self) -> int:
+        return max(0, self.write_pos - self.capacity)
+
+    def write(self, samples: np.ndarray) -> None:
+        if len(samples) > self.capacity:
+            self.write_pos += len(samples) - self.capacity  # Skipped samples still advance the clock
+            samples = samples[-self.capacity:]
+        start = self.write_pos % self.capacity
+        first = min(len(samples), self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        self._buffer[:len(samples) - first] = samples[first:]
+        self.write_pos += len(samples)
+
+    def read(self, start_pos: int, end_pos: int) -> np.ndarray:
+        """Copy of samples in [start_pos, end_pos), clamped to what is still buffered"""
+        start_pos = max(start_pos, self.oldest_pos)
+        end_pos = min(end_pos, self.write_pos)
+        if end_pos <= start_pos:
+            return np.zeros(0, dtype=np.int16)
+        start = start_pos % self.capacity
+        length = end_pos - start_pos
+        if start + length <= self.capacity:
+            return self._buffer[start:start + length].copy()
+        return np.concatenate((self._buffer[start:], self._buffer[:length - (self.capacity - start)]))
+
+    def clear(self) -> None:
+        self.write_pos = 0
+
+
+class AmbientSession:
+    """Listening state for one device; memory is the ring buffer plus a few counters"""
+
+    def __init__(self, session_id: str, user_profile: Dict[str, Any], ring_samples: int):
+        self.session_id = session_id
+        self.user_profile = user_profile or {}
+        self.ring = PcmRingBuffer(ring_samples)
+        self.mode = "listening"  # or "conversation_active" after a wake word
+        self.vad_pos = 0  # next sample the VAD has not classified yet
+        self.noise_floor_db = -60.0
+        self.speech_start: Optional[int] = None
+        self.speech_frames = 0  # frames classified as speech in the open segment
+        self.silence_frames = 0
+        self.conversation_deadline = 0.0
+        self.started_at = time.time()
+        self.last_audio_at = time.time()
+        self.context: List[Dict[str, Any]] = []
+
+
+class AmbientListeningEngine:
+    """Always-on listening that only ever sends endpointed speech segments to STT.
+
+    Segments heard while idle go through a short wake-word check (the first
+    `wake_window_seconds` only); the full segment is transcribed only when
+    "Hey Buddy" is spotted or a conversation is already active.
+    """
+
+    def __init__(self, transcribe: Callable[[np.ndarray, int], Awaitable[Optional[str]]], sample_rate: int = 16000,
+                 ring_seconds: float = None, frame_ms: int = 30, preroll_ms: int = 300, hangover_ms: int = 600,
+                 min_segment_ms: int = 300, wake_window_seconds: float = 2.5, conversation_timeout: float = 30.0,
+                 max_sessions: int = None, idle_session_timeout: float = 600.0):
+        self.transcribe = transcribe
+        self.sample_rate = sample_rate
+        ring_seconds = ring_seconds or float(os.environ.get("AMBIENT_RING_SECONDS", "6"))
+        self.ring_samples = int(ring_seconds * sample_rate)
+        self.frame_length = int(sample_rate * frame_ms / 1000)
+        self.preroll = int(sample_rate * preroll_ms / 1000)
+        self.hangover_frames = max(hangover_ms // frame_ms, 1)
+        self.min_segment = int(sample_rate * min_segment_ms / 1000)
+        self.max_segment = self.ring_samples - self.preroll
+        self.wake_window = int(sample_rate * wake_window_seconds)
+        self.conversation_timeout = conversation_timeout
+        self.max_sessions = max_sessions or int(os.environ.get("AMBIENT_MAX_SESSIONS", "500"))
+        self.idle_session_timeout = idle_session_timeout
+
+        # Streaming VAD thresholds (same features as the upload preprocessor)
+        self.min_energy_db = -45.0
+        self.noise_margin_db = 12.0
+        self.max_zcr = 0.35
+
+        self.sessions: Dict[str, AmbientSession] = {}
+        self.stats = {
+            "segments": 0,
+            "segments_too_short": 0,
+            "wake_checks": 0,
+            "wake_detected": 0,
+            "full_transcriptions": 0,
+            "audio_seconds": 0.0,
+            "speech_seconds": 0.0
+        }
+
+    # Session lifecycle
+
+    def start(self, session_id: str, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+        if session_id not in self.sessions:
+            self._evict_idle()
+            if len(self.sessions) >= self.max_sessions:
+                return {"status": "error", "message": "Ambient listening capacity reached"}
+            self.sessions[session_id] = AmbientSession(session_id, user_profile, self.ring_samples)
+        logger.info(f"👂 Ambient listening started: {session_id} ({len(self.sessions)} active)")
+        return {"status": "listening", "session_id": session_id, "wake_words": WAKE_PHRASES[:3]}
+
+    def stop(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stop one session, or every session when session_id is None"""
+        stopped = [session_id] if session_id else list(self.sessions)
+        for sid in stopped:
+            self.sessions.pop(sid, None)
+        return {"status": "stopped", "sessions_stopped": len(stopped)}
+
+    def _evict_idle(self) -> None:
+        cutoff = time.time() - self.idle_session_timeout
+        for sid in [sid for sid, session in self.sessions.items() if session.last_audio_at < cutoff]:
+            del self.sessions[sid]
+
+    def handle_timeouts(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Drop expired conversations back to wake-word listening"""
+        now = time.time()
+        if session_id is None:
+            sessions = list(self.sessions.values())
+        else:
+            sessions = [self.sessions[session_id]] if session_id in self.sessions else []
+        timed_out = []
+        for session in sessions:
+            if session.mode == "conversation_active" and now > session.conversation_deadline:
+                session.mode = "listening"
+                session.context = []
+                timed_out.append(session.session_id)
+        return {"status": "success", "timed_out": timed_out}
+
+    # Audio path
+
+    def _decode(self, audio_data: bytes) -> np.ndarray:
+        """WAV of any rate/channels, or raw 16-bit mono PCM at the engine rate -> int16 samples"""
+        if audio_data[:4] == b"RIFF":
+            samples, rate = decode_wav(audio_data)
+            signal = resample(to_mono(samples), rate, self.sample_rate)
+            return (np.clip(signal, -1.0, 1.0) * 32767.0).astype(np.int16)
+        usable = len(audio_data) - (len(audio_data) % 2)
+        return np.frombuffer(audio_data[:usable], dtype="<i2")
+
+    def _classify(self, session: AmbientSession) -> List[tuple]:
+        """Run VAD over newly buffered frames; returns finished (start, end, speech_samples) segments.
+
+        start/end include the preroll and hangover; speech_samples counts only the speech frames.
+        """
+        ring = session.ring
+        session.vad_pos = max(session.vad_pos, ring.oldest_pos)
+        frame_count = (ring.write_pos - session.vad_pos) // self.frame_length
+        if frame_count <= 0:
+            return []
+
+        frames = ring.read(session.vad_pos, session.vad_pos + frame_count * self.frame_length)
+        frames = frames.astype(np.float32).reshape(frame_count, self.frame_length) / 32768.0
+        energy_db = 20.0 * np.log10(np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12))
+        zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+        segments = []
+        for index in range(frame_count):
+            frame_start = session.vad_pos + index * self.frame_length
+            threshold = max(self.min_energy_db, session.noise_floor_db + self.noise_margin_db)
+            is_speech = energy_db[index] > threshold and zcr[index] < self.max_zcr
+
+            if not is_speech:
+                # Slow EMA so the floor tracks fans/TV but not the child's own voice
+                session.noise_floor_db += 0.05 * (energy_db[index] - session.noise_floor_db)
+
+            if session.speech_start is None:
+                if is_speech:
+                    session.speech_start = max(frame_start - self.preroll, ring.oldest_pos)
+                    session.speech_frames = 1
+                    session.silence_frames = 0
+                continue
+
+            if is_speech:
+                session.speech_frames += 1
+                session.silence_frames = 0
+            else:
+                session.silence_frames += 1
+            frame_end = frame_start + self.frame_length
+            if session.silence_frames >= self.hangover_frames or frame_end - session.speech_start >= self.max_segment:
+                segments.append((session.speech_start, frame_end, session.speech_frames * self.frame_length))
+                session.speech_start = None
+                session.speech_frames = 0
+                session.silence_frames = 0
+
+        session.vad_pos += frame_count * self.frame_length
+        return segments
+
+    async def process(self, session_id: str, audio_data: bytes) -> Dict[str, Any]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return {"status": "not_listening", "session_id": session_id}
+
+        try:
+            samples = self._decode(audio_data)
+        except WavFormatError as e:
+            return {"status": "error", "message": f"Unsupported ambient audio: {str(e)}"}
+
+        session.last_audio_at = time.time()
+        self.stats["audio_seconds"] += len(samples) / self.sample_rate
+        self.handle_timeouts(session_id)
+
+        # VAD and buffering are synchronous - concurrent chunks for a session cannot interleave
+        session.ring.write(samples)
+        segments = [
+            (session.ring.read(start, end), speech_samples) for start, end, speech_samples in self._classify(session)
+        ]
+
+        result = None
+        for segment, speech_samples in segments:
+            segment_result = await self._handle_segment(session, segment, speech_samples)
+            if segment_result and result is None:
+                result = segment_result
+
+        if result is None:
+            result = {"status": session.mode, "speech_active": session.speech_start is not None}
+        result["session_id"] = session_id
+        return result
+
+    async def _handle_segment(self, session: AmbientSession, segment: np.ndarray, speech_samples: int) -> Optional[Dict[str, Any]]:
+        self.stats["segments"] += 1
+        if speech_samples < self.min_segment:  # Preroll and hangover alone would always pass
+            self.stats["segments_too_short"] += 1
+            return None
+        self.stats["speech_seconds"] += speech_samples / self.sample_rate
+
+        if session.mode == "conversation_active":
+            self.stats["full_transcriptions"] += 1
+            transcript = await self.transcribe(segment, self.sample_rate)
+            if not transcript:
+                return None
+            session.conversation_deadline = time.time() + self.conversation_timeout
+            return {"status": "conversation_active", "transcript": transcript, "context": session.context}
+
+        # Wake-word spotting on the head of the segment only
+        self.stats["wake_checks"] += 1
+        head_transcript = await self.transcribe(segment[:self.wake_window], self.sample_rate)
+        match = match_wake_word(head_transcript or "")
+        if match is None:
+            return None
+
+        self.stats["wake_detected"] += 1
+        if len(segment) > self.wake_window:
+            self.stats["full_transcriptions"] += 1
+            full_transcript = await self.transcribe(segment, self.sample_rate) or head_transcript
+            match = match_wake_word(full_transcript) or match
+        session.mode = "conversation_active"
+        session.conversation_deadline = time.time() + self.conversation_timeout
+        logger.info(f"🐶 Wake word '{match['wake_word']}' in session {session.session_id}")
+        return {
+            "status": "wake_word_detected",
+            "wake_word": match["wake_word"],
+            "confidence": match["confidence"],
+            "command": match["command"],
+            "context": session.context
+        }
+
+    def get_session_status(self, session_id: str) -> Optional[Dict[str, Any]]:
+        session = self.sessions.get(session_id)
+        if session is None:
+            return None
+        return {
+            "mode": session.mode,
+            "speech_active": session.speech_start is not None,
+            "buffered_seconds": round((session.ring.write_pos - session.ring.oldest_pos) / self.sample_rate, 2),
+            "noise_floor_db": round(session.noise_floor_db, 1)
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "active_sessions": len(self.sessions),
+            "max_sessions": self.max_sessions,
+            "ring_bytes_per_session": self.ring_samples * 2,
+            "ring_bytes_total": self.ring_samples * 2 * len(self.sessions)
+        }
+
+
+def match_wake_word(transcript: str) -> Optional[Dict[str, Any]]:
+    """Spot a wake phrase in the first words of a transcript; returns phrase, confidence and the command after it"""
+    words = re.sub(r"[^a-z' ]", " ", transcript.lower()).split()
+    if not words:
+        return None
+
+    # The wake word should open the utterance; allow one leading filler word ("um hey buddy")
+    best = None
+    for offset in range(min(2, len(words))):
+        for length in (2, 1):
+            candidate = " ".join(words[offset:offset + length])
+            if not candidate:
+                continue
+            for phrase in WAKE_PHRASES:
+                score = 1.0 if candidate == phrase else difflib.SequenceMatcher(None, candidate, phrase).ratio()
+                if score >= 0.8 and (best is None or score > best[0]):
+                    best = (score, phrase, offset + length)
+
+    if best is None:
+        return None
+    score, phrase, consumed = best
+    return {"wake_word": phrase, "confidence": round(score, 2), "command": " ".join(words[consumed:])}
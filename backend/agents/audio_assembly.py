@@ -0,0 +1,127 @@
+"""
+Audio Assembly - PCM-level WAV parsing and stitching for chunked TTS output
+"""
+import logging
+import struct
+from typing import Dict, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+# Deepgram streaming WAVs may carry a placeholder size instead of the real length
+_UNKNOWN_SIZES = (0, 0xFFFFFFFF)
+
+
+class WavFormatError(ValueError):
+    """Raised when a buffer is not a PCM WAV we can stitch"""
+
+
+def parse_wav(data: BytesLike) -> Tuple[Dict[str, int], memoryview]:
+    """Return (format, PCM payload view) for a RIFF/WAVE buffer without copying the samples"""
+    view = memoryview(data)
+    if len(view) < 12 or bytes(view[0:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise WavFormatError("not a RIFF/WAVE buffer")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = bytes(view[offset:offset + 4])
+        chunk_size = struct.unpack_from("<I", view, offset + 4)[0]
+        body_start = offset + 8
+
+        if chunk_id == b"fmt ":
+            if chunk_size < 16 or body_start + 16 > len(view):
+                raise WavFormatError("truncated fmt chunk")
+            audio_format, channels, sample_rate, _, block_align, bits = struct.unpack_from("<HHIIHH", view, body_start)
+            if audio_format != 1:
+                raise WavFormatError(f"unsupported WAV encoding {audio_format} (PCM only)")
+            if block_align == 0:
+                raise WavFormatError("zero block align in fmt chunk")
+            fmt = {
+                "channels": channels,
+                "sample_rate": sample_rate,
+                "bits_per_sample": bits,
+                "block_align": block_align
+            }
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise WavFormatError("data chunk before fmt chunk")
+            end = len(view) if chunk_size in _UNKNOWN_SIZES else min(len(view), body_start + chunk_size)
+            # Drop a trailing partial frame so concatenation stays sample-aligned
+            end -= (end - body_start) % fmt["block_align"]
+            return fmt, view[body_start:end]
+
+        offset = body_start + chunk_size + (chunk_size & 1)  # chunks are word aligned
+
+    raise WavFormatError("no data chunk found")
+
+
+def build_wav_header(data_length: int, sample_rate: int = 24000, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Canonical 44-byte PCM WAV header; pass 0xFFFFFFFF data_length for a streaming header"""
+    block_align = channels * bits_per_sample // 8
+    byte_rate = sample_rate * block_align
+    riff_size = 0xFFFFFFFF if data_length == 0xFFFFFFFF else 36 + data_length
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", riff_size, b"WAVE",
+        b"fmt ", 16, 1, channels, sample_rate, byte_rate, block_align, bits_per_sample,
+        b"data", data_length
+    )
+
+
+def streaming_wav_header(sample_rate: int = 24000, channels: int = 1, bits_per_sample: int = 16) -> bytes:
+    """Header with placeholder sizes for WAV streams whose length is unknown up front"""
+    return build_wav_header(0xFFFFFFFF, sample_rate, channels, bits_per_sample)
+
+
+def pcm_duration_seconds(pcm_length: int, fmt: Dict[str, int]) -> float:
+    """Playback duration of a PCM payload"""
+    bytes_per_second = fmt["sample_rate"] * fmt["block_align"]
+    return pcm_length / bytes_per_second if bytes_per_second else 0.0
+
+
+def wav_duration_seconds(data: BytesLike) -> float:
+    """Playback duration of a WAV buffer (0.0 if it cannot be parsed)"""
+    try:
+        fmt, pcm = parse_wav(data)
+        return pcm_duration_seconds(len(pcm), fmt)
+    except WavFormatError:
+        return 0.0
+
+
+def stitch_wavs(wavs: List[BytesLike], silence_ms: int = 0) -> bytearray:
+    """Concatenate PCM payloads of same-format WAVs into one continuous WAV.
+
+    Every payload is copied exactly once, straight into a preallocated output
+    buffer; silence padding between segments is the buffer's fill - zero for signed
+    PCM, 0x80 (the midpoint) for 8-bit PCM, which is unsigned.
+    """
+    if not wavs:
+        raise WavFormatError("nothing to stitch")
+
+    parsed = [parse_wav(wav) for wav in wavs]
+    fmt = parsed[0][0]
+    for other_fmt, _ in parsed[1:]:
+        if (other_fmt["sample_rate"], other_fmt["channels"], other_fmt["bits_per_sample"]) != \
+                (fmt["sample_rate"], fmt["channels"], fmt["bits_per_sample"]):
+            raise WavFormatError("cannot stitch WAVs with different formats")
+
+    gap = int(fmt["sample_rate"] * silence_ms / 1000) * fmt["block_align"]
+    data_length = sum(len(pcm) for _, pcm in parsed) + gap * (len(parsed) - 1)
+
+    header = build_wav_header(data_length, fmt["sample_rate"], fmt["channels"], fmt["bits_per_sample"])
+    output = bytearray(len(header) + data_length)
+    output[:len(header)] = header
+    if gap and fmt["bits_per_sample"] == 8:
+        output[len(header):] = b"\x80" * data_length
+
+    position = len(header)
+    for index, (_, pcm) in enumerate(parsed):
+        output[position:position + len(pcm)] = pcm
+        position += len(pcm)
+        if index < len(parsed) - 1:
+            position += gap
+
+    return output
+
@@ -0,0 +1,328 @@
+"""
+Audio Bank - Pre-rendered clips for fixed replies, memory-mapped at startup and spliced around the child's name
+
+Build (or refresh) the bank offline from backend/:
+    DEEPGRAM_API_KEY=... python -m agents.audio_bank --max-variants 16
+Clips already in the bank are reused, so a rebuild only synthesizes new phrases.
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import itertools
+import json
+import logging
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Callable, Awaitable
+
+from .audio_assembly import stitch_wavs, WavFormatError
+from .sentence_segmenter import split_sentences
+from .tts_cache import TTSAudioCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_DIR = Path(__file__).parent.parent / "audio_bank"
+BANK_VERSION = 1
+INDEX_FILE = "index.json"
+CLIPS_FILE = "clips.bin"
+
+NAME_SLOT = "{name}"
+# Longest reply the bank can cover (template replies); longer text - story chunks, LLM replies - skips the lookup
+MAX_BANKED_TEXT_CHARS = 480
+_SLOT = re.compile(r"\{(\w+)\}")
+_SPEAKABLE = re.compile(r"\w")
+
+
+def phrase_fragments(text: str, name: Optional[str] = None) -> List[Optional[str]]:
+    """Bank lookup units for a reply: its sentences, cut around every whole-word `name` (None marks a name)"""
+    pieces = re.split(rf"(?<!\w){re.escape(name)}(?!\w)", text) if name else [text]
+    fragments: List[Optional[str]] = []
+    for index, piece in enumerate(pieces):
+        if index:
+            fragments.append(None)
+        # A bare "." or "!" left over after the name carries no speech
+        fragments.extend(sentence for sentence in split_sentences(piece) if _SPEAKABLE.search(sentence))
+    return fragments
+
+
+def expand_slots(fragment: str, values: Dict[str, List[str]], max_variants: int = 16) -> List[str]:
+    """Every filling of a template fragment's slots; [] when there are more than `max_variants`.
+
+    Slots without known values are left as-is - the template renderer leaves them too.
+    """
+    slots = [slot for slot in dict.fromkeys(_SLOT.findall(fragment)) if slot in values]
+    if not slots:
+        return [fragment]
+
+    variants = 1
+    for slot in slots:
+        variants *= len(values[slot])
+    if variants > max_variants:
+        return []
+
+    expanded = []
+    for filling in itertools.product(*(values[slot] for slot in slots)):
+        text = fragment
+        for slot, value in zip(slots, filling):
+            text = text.replace(f"{{{slot}}}", value)
+        expanded.append(text)
+    return expanded
+
+
+class AudioBank:
+    """Read-only bank of pre-rendered phrase clips.
+
+    clips.bin holds WAV clips back to back; index.json maps (phrase, voice model)
+    keys to byte ranges in it. The clip file is memory-mapped, so loading costs
+    nothing up front and a hit is a dictionary lookup plus a slice of the page cache.
+
+    A reply is served when the whole text is banked, or when every sentence of it
+    is - with the child's name cut out of the sentences and filled by a separately
+    synthesized (and TTS-cached) name clip.
+    """
+
+    def __init__(self, bank_dir: Optional[str] = None):
+        self.bank_dir = Path(bank_dir or os.environ.get("AUDIO_BANK_DIR") or DEFAULT_BANK_DIR)
+        self.encoding: Optional[str] = None
+        self.sample_rate: Optional[int] = None
+        self._index: Dict[str, List[int]] = {}
+        self._clips: Optional[mmap.mmap] = None
+        self.stats = {"whole_hits": 0, "spliced_hits": 0, "misses": 0, "name_splices": 0}
+        self.load()
+
+    def load(self) -> None:
+        """(Re)map the bank from disk; a missing or unreadable bank just disables it"""
+        index_path = self.bank_dir / INDEX_FILE
+        clips_path = self.bank_dir / CLIPS_FILE
+        if not index_path.exists() or not clips_path.exists():
+            logger.info(f"Audio bank not built ({self.bank_dir}) - fixed replies use live TTS")
+            return
+
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") != BANK_VERSION:
+                logger.warning(f"Audio bank version {index.get('version')} unsupported - rebuild it")
+                return
+
+            with open(clips_path, "rb") as clips_file:
+                # The mapping stays valid after the file is closed (or replaced by a rebuild)
+                clips = mmap.mmap(clips_file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(clips_file.fileno()).st_size else None
+
+            # A previous mapping is left to the GC - replies being assembled may still hold views into it
+            self._clips = clips
+            self._index = index.get("clips", {})
+            self.encoding = index.get("encoding")
+            self.sample_rate = index.get("sample_rate")
+            logger.info(f"✅ Audio bank mapped: {len(self._index)} clips, {(len(clips) if clips else 0) // 1024}KB")
+        except Exception as e:
+            logger.warning(f"Audio bank disabled ({self.bank_dir}): {str(e)}")
+
+    @property
+    def enabled(self) -> bool:
+        return self._clips is not None and bool(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @staticmethod
+    def phrase_key(text: str, model: str) -> str:
+        material = "\x1f".join([TTSAudioCache.normalize_text(text), model])
+        return hashlib.sha1(material.encode("utf-8")).hexdigest()
+
+    def clip(self, text: str, model: str) -> Optional[memoryview]:
+        """Zero-copy view of one banked clip"""
+        if not self.enabled:
+            return None
+        entry = self._index.get(self.phrase_key(text, model))
+        if entry is None:
+            return None
+        offset, length = entry
+        return memoryview(self._clips)[offset:offset + length]
+
+    def plan(self, text: str, model: str, name: Optional[str] = None) -> Optional[List[Optional[memoryview]]]:
+        """Clips that make up `text` in order (None where the name clip goes), or None if anything is missing"""
+        if not self.enabled or not text or not text.strip() or len(text) > MAX_BANKED_TEXT_CHARS:
+            return None
+
+        whole = self.clip(text, model)
+        if whole is not None:
+            return [whole]
+
+        fragments = phrase_fragments(text, name if name and name.strip() else None)
+        if not any(fragments):
+            return None  # Nothing but the name itself
+
+        clips: List[Optional[memoryview]] = []
+        for fragment in fragments:
+            if fragment is None:
+                clips.append(None)
+                continue
+            clip = self.clip(fragment, model)
+            if clip is None:
+                self.stats["misses"] += 1
+                return None
+            clips.append(clip)
+        return clips
+
+    def assemble(self, clips: List[Optional[memoryview]], name_clip: Optional[bytes] = None) -> Optional[str]:
+        """Base64 WAV for a plan, with `name_clip` at every name position"""
+        if any(clip is None for clip in clips):
+            if not name_clip:
+                return None
+            self.stats["name_splices"] += 1
+            clips = [name_clip if clip is None else clip for clip in clips]
+
+        if len(clips) == 1:
+            self.stats["whole_hits"] += 1
+            return base64.b64encode(clips[0]).decode("utf-8")
+
+        try:
+            stitched = stitch_wavs(clips)
+        except WavFormatError as e:
+            logger.error(f"❌ Audio bank splice failed: {str(e)}")
+            return None
+        self.stats["spliced_hits"] += 1
+        return base64.b64encode(stitched).decode("utf-8")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "clips": len(self._index),
+            "bytes": len(self._clips) if self._clips is not None else 0,
+            "bank_dir": str(self.bank_dir)
+        }
+
+
+# Process-wide bank shared by every VoiceAgent instance (mapped once at startup)
+_shared_bank: Optional[AudioBank] = None
+
+
+def get_audio_bank() -> AudioBank:
+    """Return the process-wide audio bank"""
+    global _shared_bank
+    if _shared_bank is None:
+        _shared_bank = AudioBank()
+    return _shared_bank
+
+
+async def build_audio_bank(phrases: Iterable[str], models: Dict[str, str],
+                           synthesize: Callable[[str, str], Awaitable[Optional[str]]],
+                           bank_dir: Optional[str] = None, encoding: str = "linear16", sample_rate: int = 24000,
+                           max_parallel: int = 3) -> Dict[str, Any]:
+    """Render every phrase for every voice model and write a new bank.
+
+    `models` maps one personality per voice model to that model; `synthesize(text,
+    personality)` returns base64 WAV. Clips already in the current bank are reused.
+    """
+    bank_dir = Path(bank_dir or os.environ.get("AUDIO_BANK_DIR") or DEFAULT_BANK_DIR)
+    bank_dir.mkdir(parents=True, exist_ok=True)
+    previous = AudioBank(bank_dir)
+
+    jobs = {}
+    for phrase in dict.fromkeys(phrase.strip() for phrase in phrases if phrase and phrase.strip()):
+        for personality, model in models.items():
+            jobs.setdefault(AudioBank.phrase_key(phrase, model), (phrase, personality, model))
+
+    clips: Dict[str, bytes] = {}
+    stats = {"phrases": len(jobs), "reused": 0, "synthesized": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def render(key: str, phrase: str, personality: str, model: str) -> None:
+        existing = previous.clip(phrase, model)
+        if existing is not None:
+            clips[key] = bytes(existing)
+            stats["reused"] += 1
+            return
+        async with semaphore:
+            audio_base64 = await synthesize(phrase, personality)
+        if audio_base64:
+            clips[key] = base64.b64decode(audio_base64)
+            stats["synthesized"] += 1
+        else:
+            stats["failed"] += 1
+            logger.warning(f"⚠️ Audio bank: no audio for '{phrase[:40]}' ({model})")
+
+    await asyncio.gather(*(render(key, *job) for key, job in jobs.items()))
+
+    # Write-then-rename; a running server keeps its old mapping until it reloads
+    index = {"version": BANK_VERSION, "encoding": encoding, "sample_rate": sample_rate, "clips": {}}
+    clips_tmp = bank_dir / (CLIPS_FILE + ".tmp")
+    offset = 0
+    with open(clips_tmp, "wb") as clips_file:
+        for key in sorted(clips):
+            clips_file.write(clips[key])
+            index["clips"][key] = [offset, len(clips[key])]
+            offset += len(clips[key])
+    index_tmp = bank_dir / (INDEX_FILE + ".tmp")
+    index_tmp.write_text(json.dumps(index, separators=(",", ":")), encoding="utf-8")
+    os.replace(clips_tmp, bank_dir / CLIPS_FILE)
+    os.replace(index_tmp, bank_dir / INDEX_FILE)
+
+    stats["clips"] = len(clips)
+    stats["bytes"] = offset
+    logger.info(f"🏦 Audio bank written to {bank_dir}: {stats}")
+    return stats
+
+
+async def collect_bank_phrases(max_variants: int = 16, mongo_url: Optional[str] = None, db_name: Optional[str] = None) -> List[str]:
+    """Every fixed reply the agents can give, as bank units (whole replies and template sentences)"""
+    from .conversation_agent import ConversationAgent
+    from .safety_agent import SafetyAgent
+    from .orchestrator import OrchestratorAgent
+
+    phrases = list(OrchestratorAgent.CANNED_REPLIES.values())
+    phrases.extend(SafetyAgent().bank_phrases())
+    phrases.extend(ConversationAgent(os.environ.get("GEMINI_API_KEY", "")).bank_phrases(max_variants))
+
+    if mongo_url:
+        # Prefetch cache replies were generated for "friend" and get the child's name swapped in
+        from motor.motor_asyncio import AsyncIOMotorClient
+        client = AsyncIOMotorClient(mongo_url)
+        try:
+            async for entry in client[db_name]["prefetch_cache"].find({}, {"response": 1}):
+                phrases.extend(fragment for fragment in phrase_fragments(entry.get("response", ""), "friend") if fragment)
+        finally:
+            client.close()
+
+    return list(dict.fromkeys(phrases))
+
+
+async def _build_from_agents(args: argparse.Namespace) -> Dict[str, Any]:
+    from .voice_agent import VoiceAgent, RateLimitedTTSQueue
+    from .rate_limiter import TTSPriority
+
+    phrases = await collect_bank_phrases(args.max_variants, args.mongo_url, args.db_name)
+    logger.info(f"🏦 Audio bank: {len(phrases)} phrases to render")
+
+    # One personality per distinct voice model
+    models = {}
+    for personality, model in RateLimitedTTSQueue.VOICE_MODELS.items():
+        if model not in models.values():
+            models[personality] = model
+
+    voice_agent = VoiceAgent(os.environ.get("DEEPGRAM_API_KEY", ""))
+    await voice_agent.http_pool.start()
+    try:
+        return await build_audio_bank(
+            phrases, models,
+            lambda text, personality: voice_agent.text_to_speech(text, personality, priority=TTSPriority.PREFETCH),
+            bank_dir=args.bank_dir,
+            encoding=RateLimitedTTSQueue.ENCODING,
+            sample_rate=RateLimitedTTSQueue.SAMPLE_RATE
+        )
+    finally:
+        await voice_agent.http_pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render fixed replies into the audio bank")
+    parser.add_argument("--bank-dir", default=None)
+    parser.add_argument("--max-variants", type=int, default=16, help="skip template sentences with more slot fillings than this")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL"), help="also render the prefetch_cache replies")
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME"))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    print(json.dumps(asyncio.run(_build_from_agents(parser.parse_args())), indent=2))
@@ -0,0 +1,140 @@
+"""
+Audio Preprocessing - WAV decode, energy/zero-crossing VAD, silence trimming and 16 kHz mono conversion before STT
+"""
+import logging
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+
+from .audio_assembly import parse_wav, build_wav_header, WavFormatError, BytesLike
+
+logger = logging.getLogger(__name__)
+
+STT_SAMPLE_RATE = 16000  # Deepgram nova-2 gains nothing from higher rates for speech
+
+
+def decode_wav(data: BytesLike) -> Tuple[np.ndarray, int]:
+    """PCM WAV -> float32 samples in [-1, 1] shaped (frames, channels), plus sample rate"""
+    fmt, pcm = parse_wav(data)
+    channels = fmt["channels"] or 1
+    bits = fmt["bits_per_sample"]
+
+    if bits == 16:
+        samples = np.frombuffer(pcm, dtype="<i2").astype(np.float32) / 32768.0
+    elif bits == 32:
+        samples = np.frombuffer(pcm, dtype="<i4").astype(np.float32) / 2147483648.0
+    elif bits == 8:
+        samples = (np.frombuffer(pcm, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif bits == 24:
+        raw = np.frombuffer(pcm, dtype=np.uint8).reshape(-1, 3)
+        ints = (raw[:, 0].astype(np.int32) | (raw[:, 1].astype(np.int32) << 8) | (raw[:, 2].astype(np.int32) << 16))
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    else:
+        raise WavFormatError(f"unsupported bit depth {bits}")
+
+    frames = len(samples) // channels
+    return samples[:frames * channels].reshape(frames, channels), fmt["sample_rate"]
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    """Downmix (frames, channels) to a 1-D signal"""
+    return samples[:, 0] if samples.shape[1] == 1 else samples.mean(axis=1)
+
+
+def lowpass(signal: np.ndarray, cutoff_hz: float, sample_rate: int, taps: int = 63) -> np.ndarray:
+    """Hamming-windowed sinc FIR low-pass (zero phase delay - 'same' convolution)"""
+    if len(signal) == 0 or cutoff_hz >= sample_rate / 2:
+        return signal
+    n = np.arange(taps) - (taps - 1) / 2
+    kernel = np.sinc(2.0 * cutoff_hz / sample_rate * n) * np.hamming(taps)
+    kernel /= kernel.sum()
+    return np.convolve(signal, kernel.astype(np.float32), mode="same").astype(np.float32)
+
+
+def resample(signal: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """Linear-interpolation resampler - adequate for speech recognition input.
+
+    Downsampling low-passes below the new Nyquist first so high frequencies do not
+    alias into the speech band.
+    """
+    if source_rate == target_rate or len(signal) == 0:
+        return signal
+    if target_rate < source_rate:
+        signal = lowpass(signal, 0.45 * target_rate, source_rate)
+    target_length = int(round(len(signal) * target_rate / source_rate))
+    positions = np.arange(target_length, dtype=np.float64) * (source_rate / target_rate)
+    return np.interp(positions, np.arange(len(signal)), signal).astype(np.float32)
+
+
+def detect_speech_frames(signal: np.ndarray, sample_rate: int, frame_ms: int = 30,
+                         min_energy_db: float = -45.0, noise_margin_db: float = 12.0,
+                         max_zcr: float = 0.35) -> np.ndarray:
+    """Boolean speech mask per frame from RMS energy over an adaptive noise floor plus zero-crossing rate.
+
+    Hiss and clicks cross zero far more often than voiced speech, so loud frames
+    with a very high zero-crossing rate are not counted as speech.
+    """
+    frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+    frame_count = len(signal) // frame_length
+    if frame_count == 0:
+        return np.zeros(0, dtype=bool)
+
+    frames = signal[:frame_count * frame_length].reshape(frame_count, frame_length)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1) + 1e-12)
+    energy_db = 20.0 * np.log10(rms)
+    zcr = np.mean(np.abs(np.diff(np.signbit(frames), axis=1)), axis=1)
+
+    # Clips that are almost all speech have no quiet frames, so never set the bar above the loudest frames
+    noise_floor_db = np.percentile(energy_db, 10)
+    threshold_db = max(min_energy_db, min(noise_floor_db + noise_margin_db, energy_db.max() - 6.0))
+    return (energy_db > threshold_db) & (zcr < max_zcr)
+
+
+def preprocess_for_stt(audio_data: bytes, target_rate: int = STT_SAMPLE_RATE, frame_ms: int = 30,
+                       padding_ms: int = 200, min_speech_ms: int = 90) -> Optional[Dict[str, Any]]:
+    """Trim silence and convert to mono 16-bit WAV at 16 kHz - or the clip's own rate when
+    it is lower (8 kHz telephony/Bluetooth audio is not upsampled: more bytes, no information).
+
+    Returns None when the clip is not PCM WAV (webm/ogg go to STT untouched);
+    otherwise a dict with "has_speech", "audio" (trimmed WAV bytes) and size/duration stats.
+    """
+    try:
+        samples, sample_rate = decode_wav(audio_data)
+    except WavFormatError:
+        return None
+
+    target_rate = min(sample_rate, target_rate) if sample_rate else target_rate
+    signal = resample(to_mono(samples), sample_rate, target_rate)
+    speech = detect_speech_frames(signal, target_rate, frame_ms)
+    speech_ms = int(speech.sum()) * frame_ms
+    original_seconds = len(samples) / sample_rate if sample_rate else 0.0
+
+    if speech_ms < min_speech_ms:
+        return {
+            "has_speech": False,
+            "audio": b"",
+            "original_bytes": len(audio_data),
+            "processed_bytes": 0,
+            "original_seconds": round(original_seconds, 3),
+            "speech_seconds": speech_ms / 1000.0
+        }
+
+    frame_length = int(target_rate * frame_ms / 1000)
+    padding = int(target_rate * padding_ms / 1000)
+    speech_indices = np.flatnonzero(speech)
+    start = max(int(speech_indices[0]) * frame_length - padding, 0)
+    end = min((int(speech_indices[-1]) + 1) * frame_length + padding, len(signal))
+
+    pcm = (np.clip(signal[start:end], -1.0, 1.0) * 32767.0).astype("<i2").tobytes()
+    wav = build_wav_header(len(pcm), target_rate, 1, 16) + pcm
+
+    return {
+        "has_speech": True,
+        "audio": wav,
+        "original_bytes": len(audio_data),
+        "processed_bytes": len(wav),
+        "original_seconds": round(original_seconds, 3),
+        "trimmed_seconds": round((end - start) / target_rate, 3),
+        "speech_seconds": speech_ms / 1000.0
+    }
@@ -0,0 +1,113 @@
+"""
+Cancellation - Per-session cancellation scopes so barge-in cancels in-flight LLM/TTS work
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Optional, Set, Awaitable
+
+logger = logging.getLogger(__name__)
+
+
+class CancellationScope:
+    """All tasks started for one conversational turn of a session.
+
+    Cancelling the scope cancels every task it owns; tasks waiting in the TTS rate
+    limiter leave their lane and tasks holding a slot release it on the way out.
+    """
+
+    def __init__(self, session_id: str, turn: int):
+        self.session_id = session_id
+        self.turn = turn
+        self.created_at = time.time()
+        self.cancelled = False
+        self.cancel_reason: Optional[str] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    def spawn(self, coro: Awaitable, name: str = None) -> asyncio.Task:
+        """Start a task owned by this scope (cancelled immediately if the scope already is)"""
+        task = asyncio.ensure_future(coro)
+        if name:
+            task.set_name(name)
+        if self.cancelled:
+            task.cancel()
+            return task
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def run(self, coro: Awaitable):
+        """Await a coroutine as a scope task; raises CancelledError if the turn is superseded"""
+        return await self.spawn(coro)
+
+    def cancel(self, reason: str = "barge-in") -> int:
+        """Cancel every live task in the scope; returns how many were cancelled"""
+        self.cancelled = True
+        self.cancel_reason = reason
+        try:
+            current = asyncio.current_task()
+        except RuntimeError:
+            current = None
+        cancelled = 0
+        for task in list(self._tasks):
+            if task is not current and not task.done():
+                task.cancel()
+                cancelled += 1
+        return cancelled
+
+    @property
+    def active_tasks(self) -> int:
+        return sum(1 for task in self._tasks if not task.done())
+
+
+class SessionCancellationRegistry:
+    """Current CancellationScope per session; a new turn cancels the previous one"""
+
+    def __init__(self):
+        self._scopes: Dict[str, CancellationScope] = {}
+        self._turns: Dict[str, int] = {}
+        self.stats = {"turns": 0, "interrupts": 0, "tasks_cancelled": 0}
+
+    def current(self, session_id: str) -> CancellationScope:
+        """Scope for work belonging to the session's current turn"""
+        scope = self._scopes.get(session_id)
+        if scope is None or scope.cancelled:
+            scope = self._new_scope(session_id)
+        return scope
+
+    def begin_turn(self, session_id: str) -> CancellationScope:
+        """Supersede everything still running for the session and open a fresh scope"""
+        self.cancel(session_id, reason="new turn")
+        self.stats["turns"] += 1
+        return self._new_scope(session_id)
+
+    def cancel(self, session_id: str, reason: str = "barge-in") -> int:
+        scope = self._scopes.get(session_id)
+        if scope is None or scope.cancelled:
+            return 0
+        cancelled = scope.cancel(reason)
+        if cancelled:
+            self.stats["interrupts"] += 1
+            self.stats["tasks_cancelled"] += cancelled
+            logger.info(f"🛑 CANCEL: {cancelled} in-flight task(s) cancelled for session {session_id} ({reason})")
+        return cancelled
+
+    def discard(self, session_id: str) -> None:
+        """Cancel and forget a session (session end)"""
+        self.cancel(session_id, reason="session ended")
+        self._scopes.pop(session_id, None)
+        self._turns.pop(session_id, None)
+
+    def _new_scope(self, session_id: str) -> CancellationScope:
+        turn = self._turns.get(session_id, 0) + 1
+        self._turns[session_id] = turn
+        scope = CancellationScope(session_id, turn)
+        self._scopes[session_id] = scope
+        return scope
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "sessions": len(self._scopes),
+            "active_tasks": sum(scope.active_tasks for scope in self._scopes.values())
+        }
@@ -0,0 +1,123 @@
+"""
+Chunk Audio Store - Per-session story chunk audio futures shared by background prefetch and /api/stories/chunk-tts
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Tuple, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+ChunkKey = Tuple[int, str]
+
+
+class StoryChunkAudioStore:
+    """Story chunk audio by owner (conversation session or user) and (chunk_id, text hash).
+
+    Each entry is the future of the one synthesis for that chunk: the background
+    prefetch and the chunk endpoint both await it, so a chunk is synthesized once no
+    matter which side asks first. Failed, empty or cancelled syntheses drop their
+    entry so the next request starts afresh.
+    """
+
+    def __init__(self, ttl_seconds: float = 1800.0, max_owners: int = 500):
+        self.ttl_seconds = ttl_seconds
+        self.max_owners = max_owners
+        self._owners: "OrderedDict[str, Dict[ChunkKey, Tuple[asyncio.Future, float]]]" = OrderedDict()
+        self._next_expiry = 0.0
+        self.stats = {"synthesized": 0, "ready_hits": 0, "inflight_hits": 0, "dropped": 0}
+
+    @staticmethod
+    def chunk_key(chunk_id: int, text: str) -> ChunkKey:
+        return int(chunk_id), hashlib.sha1(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+    def get_or_start(self, owners: Iterable[str], chunk_id: int, text: str,
+                     start: Callable[[], asyncio.Future]) -> Tuple[asyncio.Future, str]:
+        """Future for the chunk's audio and where it came from: "ready", "inflight" or "started".
+
+        `start` is only called when no usable entry exists; the future it returns is
+        registered under every owner given.
+        """
+        owners = [owner for owner in owners if owner]
+        key = self.chunk_key(chunk_id, text)
+        self._expire()
+
+        for owner in owners:
+            entry = self._owners.get(owner, {}).get(key)
+            if entry is None or not self._usable(entry[0]):
+                continue
+            future = entry[0]
+            if future.done():
+                self.stats["ready_hits"] += 1
+                source = "ready"
+            else:
+                self.stats["inflight_hits"] += 1
+                source = "inflight"
+            for other in owners:
+                self._put(other, key, future)  # Alias under every owner that may ask later
+            return future, source
+
+        future = start()
+        self.stats["synthesized"] += 1
+        for owner in owners:
+            self._put(owner, key, future)
+        future.add_done_callback(lambda done: self._on_done(owners, key, done))
+        return future, "started"
+
+    def find(self, owner: str, chunk_id: int) -> Optional[asyncio.Future]:
+        """Latest usable audio future for `chunk_id` under `owner`, whatever its text (chunk-audio URLs)"""
+        found = None
+        for (stored_id, _), (future, stored_at) in self._owners.get(owner, {}).items():
+            if stored_id == int(chunk_id) and self._usable(future) and (found is None or stored_at >= found[1]):
+                found = (future, stored_at)
+        return found[0] if found else None
+
+    def _put(self, owner: str, key: ChunkKey, future: asyncio.Future) -> None:
+        entries = self._owners.setdefault(owner, {})
+        entries[key] = (future, time.monotonic())
+        self._owners.move_to_end(owner)
+        while len(self._owners) > self.max_owners:
+            self._owners.popitem(last=False)
+
+    @staticmethod
+    def _usable(future: asyncio.Future) -> bool:
+        """Still running, or finished with audio"""
+        if not future.done():
+            return True
+        return not future.cancelled() and future.exception() is None and bool(future.result())
+
+    def _on_done(self, owners, key: ChunkKey, future: asyncio.Future) -> None:
+        if self._usable(future):
+            return
+        # Nothing usable - forget it so the chunk can be requested again
+        self.stats["dropped"] += 1
+        for owner in owners:
+            entries = self._owners.get(owner)
+            if entries and entries.get(key, (None,))[0] is future:
+                del entries[key]
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        if now < self._next_expiry:
+            return
+        self._next_expiry = now + 60.0
+        cutoff = now - self.ttl_seconds
+        for owner in list(self._owners):
+            entries = self._owners[owner]
+            for key in [key for key, (_, stored_at) in entries.items() if stored_at < cutoff]:
+                del entries[key]
+            if not entries:
+                del self._owners[owner]
+
+    def discard(self, owner: str) -> None:
+        """Forget an owner's chunks (session end)"""
+        self._owners.pop(owner, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "owners": len(self._owners),
+            "chunks": sum(len(entries) for entries in self._owners.values())
+        }
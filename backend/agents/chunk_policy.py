@@ -0,0 +1,79 @@
+"""
+Chunk Policy - Narration segment sizing: one short sentence first, larger segments once playback has a buffer
+"""
+import logging
+from typing import List, Optional
+
+from .rate_limiter import PriorityRateLimiter
+from .sentence_segmenter import SentenceSegmenter
+
+logger = logging.getLogger(__name__)
+
+NARRATION_WORDS_PER_SECOND = 2.5  # ~150 wpm, Aura storytelling pace
+
+
+class AdaptiveChunkPolicy:
+    """Decides how big the next narration segment may be.
+
+    The first segment is a single sentence so first audio is as fast as possible.
+    Every later segment is sized from the audio already queued ahead of it: while
+    those `buffered` seconds play, the next segment only has to be synthesized, so it
+    can grow to `growth` x the buffer's word count. Short rate-limit headroom on the
+    TTS bucket scales segments up further - fewer, larger requests - since a 429 costs
+    far more than a slightly later segment.
+    """
+
+    def __init__(self, limiter: Optional[PriorityRateLimiter] = None, first_min_chars: int = 20,
+                 min_words: int = 20, max_words: int = 120, max_chars: int = 1000, growth: float = 1.5,
+                 words_per_second: float = NARRATION_WORDS_PER_SECOND):
+        self.limiter = limiter
+        self.first_min_chars = first_min_chars
+        self.min_words = min_words
+        self.max_words = max_words
+        self.max_chars = max_chars  # Deepgram Aura accepts up to 2000 characters per request
+        self.growth = growth
+        self.words_per_second = words_per_second
+
+    def headroom(self) -> float:
+        """Share of the TTS request budget currently available (1.0 without a limiter)"""
+        return self.limiter.headroom() if self.limiter is not None else 1.0
+
+    def next_target_words(self, buffered_seconds: float) -> int:
+        """Word target for the segment that will play after `buffered_seconds` of queued audio"""
+        target = buffered_seconds * self.words_per_second * self.growth
+
+        headroom = self.headroom()
+        if headroom < 0.5:
+            target *= 1.0 + (0.5 - headroom) * 2.0  # Up to 2x at an empty bucket
+
+        return int(min(max(target, self.min_words), self.max_words))
+
+    def segmenter(self) -> SentenceSegmenter:
+        """Segmenter configured for the first (single-sentence) segment"""
+        return SentenceSegmenter(min_chars=self.first_min_chars, max_chars=self.max_chars)
+
+    def advance(self, segmenter: SentenceSegmenter, emitted_words: int) -> None:
+        """Resize the segmenter after segments totalling `emitted_words` have been emitted"""
+        segmenter.min_chars = 0
+        segmenter.target_words = self.next_target_words(emitted_words / self.words_per_second)
+
+    def split(self, text: str) -> List[str]:
+        """Segment a complete narration text with growing segment sizes"""
+        segmenter = self.segmenter()
+        segments = []
+        emitted_words = 0
+
+        def take(segment: str) -> None:
+            nonlocal emitted_words
+            segments.append(segment)
+            emitted_words += len(segment.split())
+            self.advance(segmenter, emitted_words)
+
+        # Targets are re-read per sentence, so resizing between yields applies to the very next segment
+        for segment in segmenter.feed(text):
+            take(segment)
+        for segment in segmenter.flush():
+            take(segment)
+
+        logger.info(f"📏 Adaptive chunking: {len(segments)} segments, words per segment {[len(s.split()) for s in segments]}")
+        return segments
@@ -6,12 +6,30 @@ import logging
 import random
 import re
 import time
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from datetime import datetime
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from .llm_gateway import get_llm_gateway
+from .sentence_segmenter import split_sentences
+from .chunk_policy import AdaptiveChunkPolicy
+from .audio_bank import NAME_SLOT, phrase_fragments, expand_slots
+from .response_cache import get_response_cache
 
 logger = logging.getLogger(__name__)
 
+# Subjects picked straight out of the request for the {animal} / {place} template slots
+TEMPLATE_ANIMAL_WORDS = ["cat", "dog", "rabbit", "mouse", "bird", "elephant", "lion", "tiger", "bear", "fox", "wolf", "deer", "dragon", "unicorn", "dinosaur"]
+TEMPLATE_PLACE_WORDS = ["forest", "jungle", "ocean", "mountain", "castle", "space", "garden", "farm", "city", "village"]
+
+# Derived template slots: (value when the slot's condition holds, value otherwise) - the audio bank renders both
+TEMPLATE_DERIVED_SLOTS = {
+    'body_part': ('ears', 'wings'),                 # animals category
+    'skill': ('jumping', 'flying'),                 # animals category
+    'ability': ('hear very well', 'see in the dark'),  # animals category
+    'size': ('big', 'enormous'),                    # age <= 5
+    'planet': ('Mars', 'Jupiter'),                  # request mentions Mars
+    'number': ('many', 'over 50')                   # age <= 5
+}
+
 class ConversationAgent:
     """Handles AI conversations with age-appropriate responses"""
     
@@ -22,6 +40,9 @@ class ConversationAgent:
         self.pending_riddles = {}  # Store riddles waiting for user response
         self.recent_responses = {}  # Store recent responses for deduplication
         self.db = None  # Will be set by orchestrator
+        self.chunk_policy = AdaptiveChunkPolicy()  # Story chunk sizing; orchestrator swaps in the TTS-aware one
+        self.llm_gateway = get_llm_gateway()  # Shared concurrency limit, timeouts and metrics for every LLM call
+        self.response_cache = get_response_cache()  # Shared answers to self-contained questions
         
         # GAMIFICATION SYSTEM: Track achievements and rewards
         self.session_stats = {}  # Per-session achievement tracking
@@ -435,6 +456,13 @@ class ConversationAgent:
             ]
         }
         
+        # Closing line appended to template stories, per age group
+        self.blazing_story_endings = {
+            "toddler": "The end! Wasn't that a fun story?",
+            "child": "And that's how {name} learned that adventures are everywhere when you're curious and kind!",
+            "preteen": "This adventure taught {name} that courage isn't about not being afraid - it's about doing what's right even when you are afraid."
+        }
+        
         # BLAZING SPEED: Enhanced replacement variables for comprehensive personalization
         self.template_variables = {
             "animal": ["cat", "dog", "rabbit", "mouse", "bird", "elephant", "lion", "tiger", "bear", "fox", "wolf", "deer", "cow", "pig", "chicken", "duck", "horse", "sheep", "goat", "squirrel", "owl", "eagle", "dolphin", "whale", "shark", "butterfly", "bee", "ant"],
@@ -513,8 +541,8 @@ class ConversationAgent:
         template = templates[template_index]
         
         # Extract animal or specific subject from user input for better personalization
-        animal_match = re.search(r'\b(cat|dog|rabbit|mouse|bird|elephant|lion|tiger|bear|fox|wolf|deer|dragon|unicorn|dinosaur)\b', user_input.lower())
-        place_match = re.search(r'\b(forest|jungle|ocean|mountain|castle|space|garden|farm|city|village)\b', user_input.lower())
+        animal_match = re.search(r'\b(' + '|'.join(TEMPLATE_ANIMAL_WORDS) + r')\b', user_input.lower())
+        place_match = re.search(r'\b(' + '|'.join(TEMPLATE_PLACE_WORDS) + r')\b', user_input.lower())
         
         # Personalize template with profile data and detected entities
         replacements = {
@@ -528,14 +556,18 @@ class ConversationAgent:
             'action': self._random_from_list('actions'),
             'objects': self._random_from_list('objects'),
             'animals': self._random_from_list('animals'),
-            'body_part': 'ears' if category == 'animals' else 'wings',
-            'skill': 'jumping' if category == 'animals' else 'flying',
-            'ability': 'hear very well' if category == 'animals' else 'see in the dark',
-            'size': 'big' if age <= 5 else 'enormous',
-            'planet': 'Mars' if 'mars' in user_input.lower() else 'Jupiter',
-            'number': 'many' if age <= 5 else 'over 50',
             'silly_name': f"sleepy-{name.lower()}" if name else 'sleepy-friend'
         }
+        derived = {
+            'body_part': category == 'animals',
+            'skill': category == 'animals',
+            'ability': category == 'animals',
+            'size': age <= 5,
+            'planet': 'mars' in user_input.lower(),
+            'number': age <= 5
+        }
+        for slot, holds in derived.items():
+            replacements[slot] = TEMPLATE_DERIVED_SLOTS[slot][0 if holds else 1]
         
         # Replace all template variables
         response = template
@@ -543,15 +575,54 @@ class ConversationAgent:
             response = response.replace(f'{{{key}}}', str(value))
         
         # Add age appropriate conclusion for stories
-        if content_type == "story" and age_group == "toddler":
-            response += " The end! Wasn't that a fun story?"
-        elif content_type == "story" and age_group == "child":
-            response += f" And that's how {name} learned that adventures are everywhere when you're curious and kind!"
-        elif content_type == "story" and age_group == "preteen":
-            response += f" This adventure taught {name} that courage isn't about not being afraid - it's about doing what's right even when you are afraid."
+        if content_type == "story":
+            response += " " + self.blazing_story_endings[age_group].replace(NAME_SLOT, name)
         
         return response
     
+    def _blazing_slot_values(self) -> Dict[str, List[str]]:
+        """Every value _get_blazing_template_response can put in a slot ({name} and derived slots excluded)"""
+        variables = self.template_variables
+        return {
+            'animal': TEMPLATE_ANIMAL_WORDS + variables['animals'],
+            'place': TEMPLATE_PLACE_WORDS + variables['places'],
+            'object': variables['objects'],
+            'color': variables['colors'],
+            'adjective': variables['adjectives'],
+            'food': variables['foods'],
+            'action': variables['actions'],
+            'objects': variables['objects'],
+            'animals': variables['animals'],
+            **{slot: list(choices) for slot, choices in TEMPLATE_DERIVED_SLOTS.items()}
+        }
+    
+    def bank_phrases(self, max_variants: int = 16) -> List[str]:
+        """Fixed reply text for the pre-rendered audio bank: fallbacks whole, templates as sentences.
+
+        Template sentences are cut around {name} the same way the bank cuts a reply at
+        request time; a sentence is expanded over its slot values unless that gives more
+        than `max_variants` texts, in which case it stays live TTS.
+        """
+        phrases = []
+        for age in (4, 7, 11):
+            phrases.append(self._get_fallback_ambient_response(age))
+            phrases.append(self._get_fallback_response(age))
+        
+        values = self._blazing_slot_values()
+        templates = [
+            template
+            for categories in self.blazing_templates.values()
+            for age_groups in categories.values()
+            for age_templates in age_groups.values()
+            for template in age_templates
+        ] + list(self.blazing_story_endings.values())
+        for template in templates:
+            for fragment in phrase_fragments(template, NAME_SLOT):
+                if fragment:
+                    phrases.extend(expand_slots(fragment, values, max_variants))
+        
+        return list(dict.fromkeys(phrases))
+    
     def _random_from_list(self, list_name: str) -> str:
         """Get random item from template variables list"""
         items = self.template_variables.get(list_name, ['something'])
@@ -942,6 +1013,13 @@ class ConversationAgent:
             logger.error(f"Error checking prefetch cache: {str(e)}")
             return None
     
+    def _response_cache_key(self, user_input: str, user_profile: Dict[str, Any], content_type: str, pipeline: str):
+        """Semantic response cache key for this turn, or None when it depends on context or the child"""
+        key, reason = self.response_cache.cache_key(user_input, user_profile, content_type, pipeline)
+        if key is None:
+            self.response_cache.note_excluded(reason)
+        return key
+    
     async def create_story_session(self, session_id: str, user_id: str, story_type: str = "adventure") -> str:
         """Create a new story session for continuation tracking"""
         try:
@@ -1033,16 +1111,12 @@ class ConversationAgent:
     async def _generate_continuation_chunk(self, continuation_prompt: str, age: int) -> str:
         """Generate a story continuation chunk using the LLM"""
         try:
-            chat = LlmChat()
             age_group = "toddler" if age <= 5 else "child" if age <= 9 else "preteen"
             system_message = self.system_messages[age_group]
             
-            messages = [
-                {"role": "system", "content": system_message},
-                {"role": "user", "content": continuation_prompt}
-            ]
-            
-            response = await chat.achat(messages=messages, max_tokens=800)
+            response = await self.llm_gateway.complete(
+                system_message, continuation_prompt, max_tokens=800, api_key=self.gemini_api_key
+            )
             
             if response and response.strip():
                 return response.strip()
@@ -1331,7 +1405,7 @@ ANSWER: A piano
             # Only split sentences if not in gentle mode (for stories)
             if not gentle_mode:
                 # Split overly long sentences (over 8 words)
-                sentences = re.split(r'(?<=[.!?])\s+', text)
+                sentences = split_sentences(text)
                 simplified_sentences = []
                 
                 for sentence in sentences:
@@ -1365,7 +1439,7 @@ ANSWER: A piano
             # Only moderate sentence splitting for stories
             if not gentle_mode:
                 # Check sentence length (should be under 12 words)
-                sentences = re.split(r'(?<=[.!?])\s+', text)
+                sentences = split_sentences(text)
                 simplified_sentences = []
                 
                 for sentence in sentences:
@@ -1384,7 +1458,7 @@ ANSWER: A piano
         elif age <= 11:
             # Light filtering for preteens - mainly sentence length
             if not gentle_mode:
-                sentences = re.split(r'(?<=[.!?])\s+', text)
+                sentences = split_sentences(text)
                 simplified_sentences = []
                 
                 for sentence in sentences:
@@ -1657,22 +1731,16 @@ Your goal: Quick, helpful responses that get straight to the point."""
             
             logger.info(f"⚡ DYNAMIC RESPONSE: Analyzing query type for: '{user_input[:50]}...'")
             
-            # Create chat with dynamic system message optimized for the specific query
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                session_id=f"dynamic_{hash(user_input)}",
-                system_message=system_message
-            ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(200)  # Conservative limit for responsiveness
-            
-            # Create user message
-            user_message = UserMessage(text=user_input)
-            
-            # Generate response
+            # Generate response with dynamic system message optimized for the specific query
             # CRITICAL FIX: Add timeout to main LLM call to prevent hanging
             try:
-                response = await asyncio.wait_for(
-                    chat.send_message(user_message), 
-                    timeout=30.0  # 30 second timeout for main response
+                response = await self.llm_gateway.complete(
+                    system_message,
+                    user_input,
+                    max_tokens=200,  # Conservative limit for responsiveness
+                    session_id=f"dynamic_{hash(user_input)}",
+                    timeout=30.0,  # 30 second timeout for main response
+                    api_key=self.gemini_api_key
                 )
             except asyncio.TimeoutError:
                 logger.error(f"Timeout during main LLM call for user: {user_profile.get('name', 'unknown')}")
@@ -1694,181 +1762,167 @@ Your goal: Quick, helpful responses that get straight to the point."""
             logger.error(f"Error generating brief response: {str(e)}")
             return "I'm here to help! Can you ask that again?"
 
-    async def generate_story_with_streaming(self, user_input: str, user_profile: Dict[str, Any], session_id: str, context: List[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Generate story content with streaming chunks for progressive display and audio"""
+    def streams_as_conversation(self, user_input: str, session_id: str, context: List[Dict[str, Any]] = None) -> bool:
+        """True when generate_response_with_dialogue_plan would answer with a plain conversation
+        reply from the LLM - no riddle answer, template, content request or follow-through -
+        so generate_response_streaming can stand in for it"""
+        if self._is_riddle_response(user_input, session_id):
+            return False
+        if self._detect_template_intent(user_input)[0] or self._detect_content_type(user_input) != "conversation":
+            return False
+        return not self._requires_followthrough(self._get_last_bot_message(context), user_input)
+
+    async def generate_response_streaming(self, user_input: str, user_profile: Dict[str, Any], session_id: str = None, context: List[Dict[str, Any]] = None, memory_context: Dict[str, Any] = None) -> AsyncIterator[str]:
+        """Dynamic response as raw text deltas for the speculative TTS pipeline.
+
+        Same prompt as generate_dynamic_response; age-appropriate filtering is applied
+        per sentence by the caller since it only rewrites within sentences. A semantic
+        response cache hit is yielded as one delta without calling the LLM.
+        """
+        cache_key = self._response_cache_key(user_input, user_profile, "conversation", "brief")
+        if cache_key:
+            cached_response = self.response_cache.lookup(cache_key, user_profile, session_id)
+            if cached_response:
+                logger.info(f"🗃️ RESPONSE CACHE: '{cache_key[3]}' streamed from cache")
+                yield cached_response
+                return
+
+        system_message = self._create_dynamic_response_system_message(user_profile, "conversation", user_input)
+
+        if context:
+            history_text = "\n\nRECENT CONVERSATION HISTORY (for context continuity):\n"
+            for ctx_item in context[-5:]:
+                role = ctx_item.get('role', ctx_item.get('sender', 'unknown'))
+                text = ctx_item.get('text', '')
+                if role == 'user':
+                    history_text += f"Child: {text}\n"
+                elif role in ['assistant', 'bot']:
+                    history_text += f"You (Buddy): {text}\n"
+            system_message += history_text
+
+        chat = self.llm_gateway.open_conversation(
+            system_message,
+            max_tokens=200,
+            session_id=session_id or f"dynamic_{hash(user_input)}",
+            api_key=self.gemini_api_key
+        )
+
+        stream = chat.stream(user_input, timeout=30.0)  # Same budget as the blocking main call
+        produced = []
+        complete = False
         try:
-            import time
-            start_time = time.time()
-            
-            age = user_profile.get('age', 7)
-            user_id = user_profile.get('user_id', 'unknown')
-            logger.info(f"🎭 STORY STREAMING: Starting ultra-fast chunked story generation for age {age}")
-            
-            # STORY SESSION MANAGEMENT: Check for existing story session
-            story_session = None
-            is_continuation = False
-            
-            # Check if this is a continuation request
-            if any(word in user_input.lower() for word in ['continue', 'more', 'next', 'keep going', 'what happens']):
-                story_session = await self.get_story_session(session_id)
-                if story_session:
-                    is_continuation = True
-                    logger.info(f"📖 STORY CONTINUATION: Found existing story session {story_session['_id']}")
-            
-            if is_continuation and story_session:
-                # CONTINUATION: Resume from where we left off
-                logger.info("🔄 Continuing existing story from last checkpoint")
-                
-                # Get the last part of the story for context
-                full_story = story_session.get("full_story_text", "")
-                last_chunk_index = story_session.get("last_chunk_index", -1)
-                
-                # Generate continuation
-                continuation_prompt = f"""Continue this story seamlessly from where it left off. 
+            async for delta in stream:
+                if delta:
+                    produced.append(delta)
+                    yield delta
+            complete = True
+        except asyncio.TimeoutError:
+            logger.error(f"Timeout during streaming LLM call for user: {user_profile.get('name', 'unknown')}")
+        except Exception as e:
+            logger.error(f"Error streaming dynamic response: {str(e)}")
+        finally:
+            await stream.aclose()
+            chat.close()
+
+        if cache_key and complete and produced:
+            self.response_cache.store(
+                cache_key, "".join(produced).strip(), user_profile, session_id,
+                self.response_cache.personal_terms(user_profile, memory_context)
+            )
+
+        # Whatever was already spoken stays; only an empty reply needs a fallback
+        if not produced:
+            yield self._get_fallback_ambient_response(user_profile.get('age', 5))
+
+    async def stream_story(self, user_input: str, user_profile: Dict[str, Any], session_id: str, context: List[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Story chunks the moment they are ready, for TTS one by one.
+
+        A new story opens with the instant template opening - its first sentence is the
+        first chunk, with no LLM call in front of it - and continues with the LLM text,
+        segmented by the adaptive chunk policy as it streams in. A continuation request
+        streams the next part of the session's story the same way. The story session is
+        updated once the stream ends.
+        """
+        start_time = time.time()
+        age = user_profile.get('age', 7)
+        user_id = user_profile.get('user_id', 'unknown')
+        logger.info(f"🎭 STORY STREAMING: Starting ultra-fast chunked story generation for age {age}")
+        
+        # STORY SESSION MANAGEMENT: Check if this is a continuation request
+        story_session = None
+        if any(word in user_input.lower() for word in ['continue', 'more', 'next', 'keep going', 'what happens']):
+            story_session = await self.get_story_session(session_id)
+            if story_session:
+                logger.info(f"📖 STORY CONTINUATION: Found existing story session {story_session['_id']}")
+        
+        if story_session:
+            # CONTINUATION: Resume from where we left off
+            story_session_id = story_session["_id"]
+            full_story = story_session.get("full_story_text", "")
+            first_chunk_id = story_session.get("last_chunk_index", -1) + 1
+            continuation_prompt = f"""Continue this story seamlessly from where it left off. 
 Current story so far: ...{full_story[-300:] if len(full_story) > 300 else full_story}
 
 Continue the story with 2-3 more paragraphs, advancing the plot and maintaining the same characters and tone. Make it engaging for a {age}-year-old child."""
-                
-                continuation_text = await self._generate_continuation_chunk(continuation_prompt, age)
-                
-                # Create continuation chunks
-                sentences = continuation_text.split('. ')
-                chunks = []
-                chunk_text = ""
-                chunk_id = last_chunk_index + 1
-                
-                for sentence in sentences:
-                    chunk_text += sentence + ". "
-                    if len(chunk_text.split()) >= 35:
-                        chunks.append({
-                            "text": chunk_text.strip(),
-                            "chunk_id": chunk_id,
-                            "word_count": len(chunk_text.split()),
-                            "timestamp": time.time() - start_time
-                        })
-                        chunk_text = ""
-                        chunk_id += 1
-                
-                # Add final chunk if there's remaining text
-                if chunk_text.strip():
-                    chunks.append({
-                        "text": chunk_text.strip(),
-                        "chunk_id": chunk_id,
-                        "word_count": len(chunk_text.split()),
-                        "timestamp": time.time() - start_time
-                    })
-                
-                # Update story session
-                await self.update_story_session(story_session["_id"], {
-                    "full_story_text": full_story + " " + continuation_text,
-                    "last_chunk_index": chunk_id,
-                    "total_chunks": story_session.get("total_chunks", 0) + len(chunks)
-                })
-                
-                return {
-                    "success": True,
-                    "response_type": "story_continuation",
-                    "chunks": chunks,
-                    "total_chunks": len(chunks),
-                    "is_continuation": True,
-                    "story_session_id": story_session["_id"]
-                }
-            
-            else:
-                # NEW STORY: Create story session and generate fresh content
-                story_session_id = await self.create_story_session(session_id, user_id, "adventure")
-                logger.info(f"📚 NEW STORY: Created story session {story_session_id}")
-                
-                # ULTRA-FAST STRATEGY: Return immediate first chunk, generate rest in background
-                logger.info("🚀 ULTRA-FAST MODE: Generating immediate first chunk")
-                
-                # Generate a quick story opening based on the prompt
-                quick_opening = self._generate_instant_story_opening(user_input, age)
-                
-                # Create first chunk immediately
-                first_chunk = {
-                    "text": quick_opening,
-                    "chunk_id": 0,
-                    "word_count": len(quick_opening.split()),
-                    "timestamp": time.time() - start_time
-                }
-                
-                logger.info(f"🚀 INSTANT FIRST CHUNK: {first_chunk['word_count']} words in {first_chunk['timestamp']:.2f}s")
-                
-                # Generate remaining story in background (simplified approach)
-                remaining_story = self._generate_story_continuation(user_input, quick_opening, age)
-                
-                # Split remaining story into chunks
-                remaining_chunks = []
-                if remaining_story:
-                    sentences = remaining_story.split('. ')
-                    chunk_text = ""
-                    chunk_id = 1
-                    
-                    for sentence in sentences:
-                        chunk_text += sentence + ". "
-                        if len(chunk_text.split()) >= 35:  # Small chunks for speed
-                            remaining_chunks.append({
-                                "text": chunk_text.strip(),
-                                "chunk_id": chunk_id,
-                                "word_count": len(chunk_text.split()),
-                                "timestamp": time.time() - start_time
-                            })
-                            chunk_text = ""
-                            chunk_id += 1
-                    
-                    # Add final chunk if any remaining text
-                    if chunk_text.strip():
-                        remaining_chunks.append({
-                            "text": chunk_text.strip(),
-                            "chunk_id": chunk_id,
-                            "word_count": len(chunk_text.split()),
-                            "timestamp": time.time() - start_time
-                        })
-                
-                # Update story session with the complete story
-                full_story_text = quick_opening + " " + remaining_story if remaining_story else quick_opening
-                all_chunks = [first_chunk] + remaining_chunks
-                await self.update_story_session(story_session_id, {
-                    "full_story_text": full_story_text,
-                    "last_chunk_index": len(all_chunks) - 1,
-                    "total_chunks": len(all_chunks)
-                })
-                
-                total_words = sum(chunk["word_count"] for chunk in all_chunks)
-                generation_time = time.time() - start_time
-                
-                logger.info(f"🎭 ULTRA-FAST STORY COMPLETE: {len(all_chunks)} chunks, {total_words} words in {generation_time:.2f}s")
-                
-                return {
-                    "status": "streaming",
-                    "chunks": all_chunks,
-                    "total_chunks": len(all_chunks),
-                    "total_words": total_words,
-                    "generation_time": generation_time,
-                    "content_type": "story",
-                    "story_session_id": story_session_id
-                }
-            
-        except Exception as e:
-            logger.error(f"❌ Ultra-fast story streaming error: {str(e)}")
-            
-            # Emergency fallback - instant response
-            fallback_story = f"Once upon a time, there was an amazing adventure waiting to unfold. Let me tell you this wonderful story that I know you'll love!"
-            
-            return {
-                "status": "fallback",
-                "chunks": [{
-                    "text": fallback_story,
-                    "chunk_id": 0, 
-                    "word_count": len(fallback_story.split()),
-                    "timestamp": 0.1
-                }],
-                "total_chunks": 1,
-                "total_words": len(fallback_story.split()),
-                "generation_time": 0.1,
-                "content_type": "story"
+            opening = ""
+            story_text = self._stream_story_text(
+                f"You are a storyteller for {age}-year-old children. Continue the story naturally and engagingly.",
+                continuation_prompt,
+                max_tokens=300,
+                fallback="And the adventure continued with even more exciting discoveries ahead!"
+            )
+        else:
+            # NEW STORY: instant opening, LLM continuation streamed behind it
+            story_session_id = await self.create_story_session(session_id, user_id, "adventure")
+            logger.info(f"📚 NEW STORY: Created story session {story_session_id}")
+            full_story = ""
+            first_chunk_id = 0
+            opening = self._generate_instant_story_opening(user_input, age)
+            story_text = self._stream_story_continuation(user_input, opening, age)
+        
+        segmenter = self.chunk_policy.segmenter()
+        chunk_id = first_chunk_id
+        emitted_words = 0
+        parts = []
+        
+        def make_chunk(segment: str) -> Dict[str, Any]:
+            nonlocal chunk_id, emitted_words
+            chunk = {
+                "text": segment,
+                "chunk_id": chunk_id,
+                "word_count": len(segment.split()),
+                "timestamp": time.time() - start_time,
+                "story_session_id": story_session_id,
+                "is_continuation": story_session is not None
             }
+            if chunk_id == first_chunk_id:
+                logger.info(f"🚀 INSTANT FIRST CHUNK: {chunk['word_count']} words in {chunk['timestamp']:.2f}s")
+            chunk_id += 1
+            emitted_words += chunk["word_count"]
+            self.chunk_policy.advance(segmenter, emitted_words)
+            return chunk
+        
+        try:
+            if opening:
+                parts.append(opening + " ")
+                for segment in segmenter.feed(opening + " "):
+                    yield make_chunk(segment)
+            async for delta in story_text:
+                parts.append(delta)
+                for segment in segmenter.feed(delta):
+                    yield make_chunk(segment)
+            for segment in segmenter.flush():
+                yield make_chunk(segment)
+        finally:
+            await story_text.aclose()
+        
+        story_so_far = "".join(parts).strip()
+        await self.update_story_session(story_session_id, {
+            "full_story_text": f"{full_story} {story_so_far}".strip(),
+            "last_chunk_index": chunk_id - 1,
+            "total_chunks": chunk_id
+        })
+        logger.info(f"🎭 STORY STREAM COMPLETE: {chunk_id - first_chunk_id} chunks, {emitted_words} words in {time.time() - start_time:.2f}s")
 
     def _generate_instant_story_opening(self, user_input: str, age: int) -> str:
         """Generate an instant story opening without LLM call for <1s response"""
@@ -1917,13 +1971,10 @@ As the golden sun cast long, dramatic shadows across the landscape, they felt a
         
         return opening
     
-    def _generate_story_continuation(self, user_input: str, opening: str, age: int) -> str:
-        """Generate story continuation using LLM for proper length and quality"""
-        try:
-            from emergentintegrations.llm.chat import LlmChat, UserMessage
-            
-            # Create rich story continuation prompt for LONGER stories
-            story_prompt = f"""Continue this story for a {age}-year-old child. The story should be engaging, age-appropriate, and approximately 250-300 words to complete the story properly and reach a total of at least 350 words.
+    def _stream_story_continuation(self, user_input: str, opening: str, age: int) -> AsyncIterator[str]:
+        """LLM story continuation after the instant opening, as text deltas"""
+        # Create rich story continuation prompt for LONGER stories
+        story_prompt = f"""Continue this story for a {age}-year-old child. The story should be engaging, age-appropriate, and approximately 250-300 words to complete the story properly and reach a total of at least 350 words.
 
 Current opening: {opening}
 
@@ -1940,25 +1991,36 @@ Continue the story with:
 
 IMPORTANT: The continuation should be substantial (250-300 words) to ensure the complete story reaches at least 350 words total. Make it exciting, immersive, and engaging while being completely appropriate for children. Include plenty of details, actions, and character interactions to create a rich storytelling experience."""
 
-            # Generate continuation using LLM with higher token limit for longer stories
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                system_message=f"You are an expert children's storyteller. Create engaging, educational, and age-appropriate stories for {age}-year-old children. Stories should be substantial and immersive, with continuations of 250-300 words to ensure rich, detailed storytelling that captures children's imagination."
-            ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(500)  # Increased for longer stories
-            
-            user_message = UserMessage(text=story_prompt)
-            response = chat.send_message(user_input=user_message)
-            
-            if response and len(response.strip()) > 100:
-                logger.info(f"📖 Generated LLM story continuation: {len(response.split())} words")
-                return response.strip()
-            else:
-                # Fallback to enhanced template if LLM fails
-                return self._get_enhanced_template_continuation(age)
-                
+        return self._stream_story_text(
+            f"You are an expert children's storyteller. Create engaging, educational, and age-appropriate stories for {age}-year-old children. Stories should be substantial and immersive, with continuations of 250-300 words to ensure rich, detailed storytelling that captures children's imagination.",
+            story_prompt,
+            max_tokens=500,  # Increased for longer stories
+            fallback=self._get_enhanced_template_continuation(age)
+        )
+    
+    async def _stream_story_text(self, system_message: str, prompt: str, max_tokens: int, fallback: str) -> AsyncIterator[str]:
+        """Story text deltas from the LLM; `fallback` is used only when the LLM produced nothing"""
+        produced = 0
+        try:
+            async with self.llm_gateway.conversation(system_message, max_tokens=max_tokens, api_key=self.gemini_api_key) as chat:
+                stream = chat.stream(prompt, timeout=30.0)
+                try:
+                    async for delta in stream:
+                        if delta:
+                            produced += len(delta)
+                            yield delta
+                finally:
+                    await stream.aclose()
+        except asyncio.TimeoutError:
+            logger.error("❌ Timeout while streaming story text")
         except Exception as e:
-            logger.error(f"Error generating LLM story continuation: {e}")
-            return self._get_enhanced_template_continuation(age)
+            logger.error(f"Error streaming LLM story text: {e}")
+        
+        if produced:
+            logger.info(f"📖 Streamed LLM story text: {produced} chars")
+        else:
+            # Fallback to template if the LLM fails before its first words
+            yield fallback
     
     def _get_enhanced_template_continuation(self, age: int) -> str:
         """Enhanced template-based continuation with proper length"""
@@ -1996,15 +2058,13 @@ With all three keys, the character unlocked not a treasure chest, but a deeper u
     async def _generate_continuation_chunk(self, continuation_prompt: str, age: int) -> str:
         """Generate continuation chunk for story using LLM"""
         try:
-            # Create a simple chat for continuation generation
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
+            response = await self.llm_gateway.complete(
+                f"You are a storyteller for {age}-year-old children. Continue the story naturally and engagingly.",
+                continuation_prompt,
+                max_tokens=300,  # RESTORED: Optimal chunk size for good content with speed
                 session_id=f"continuation_{hash(continuation_prompt)}",
-                system_message=f"You are a storyteller for {age}-year-old children. Continue the story naturally and engagingly."
-            ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(300)  # RESTORED: Optimal chunk size for good content with speed
-            
-            user_message = UserMessage(text=continuation_prompt)
-            response = await chat.send_message(user_message)
+                api_key=self.gemini_api_key
+            )
             
             return response.strip() if response else "And the adventure continued with even more exciting discoveries ahead!"
             
@@ -2015,6 +2075,7 @@ With all three keys, the character unlocked not a treasure chest, but a deeper u
 
     async def generate_response_with_dialogue_plan_LEGACY(self, user_input: str, user_profile: Dict[str, Any], session_id: str, context: List[Dict[str, Any]] = None, dialogue_plan: Dict[str, Any] = None, memory_context: Dict[str, Any] = None) -> str:
         """LEGACY METHOD - NOT USED - Generate response with conversation context and dialogue plan"""
+        chat = None
         try:
             # Determine age group
             age = user_profile.get('age', 5)
@@ -2192,32 +2253,25 @@ With all three keys, the character unlocked not a treasure chest, but a deeper u
                 # Recreate chat with enhanced system message including history
                 enhanced_system_with_history = enhanced_system_message + history_text
                 
-                chat = LlmChat(
-                    api_key=self.gemini_api_key,
-                    session_id=session_id,
-                    system_message=enhanced_system_with_history
-                ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(max_tokens)
+                chat = self.llm_gateway.open_conversation(
+                    enhanced_system_with_history, max_tokens=max_tokens, session_id=session_id, api_key=self.gemini_api_key
+                )
                 
                 logger.info("✅ Enhanced chat initialized with conversation history and dynamic token allocation")
             else:
                 # No context available, use original system message
-                chat = LlmChat(
-                    api_key=self.gemini_api_key,
-                    session_id=session_id,
-                    system_message=enhanced_system_message
-                ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(max_tokens)
+                chat = self.llm_gateway.open_conversation(
+                    enhanced_system_message, max_tokens=max_tokens, session_id=session_id, api_key=self.gemini_api_key
+                )
                 
                 logger.info("✅ Chat initialized with dynamic token allocation (no context available)")
             
             # Create user message
-            user_message = UserMessage(text=user_input)
+            user_message = user_input
             
             # Generate response with timeout protection
             try:
-                response = await asyncio.wait_for(
-                    chat.send_message(user_message), 
-                    timeout=30.0  # 30 second timeout for main response
-                )
+                response = await chat.send(user_message, timeout=30.0)  # 30 second timeout for main response
             except asyncio.TimeoutError:
                 logger.error(f"Timeout during main LLM call in generate_response_with_dialogue_plan")
                 return self._get_fallback_ambient_response(user_profile.get('age', 5))
@@ -2245,14 +2299,11 @@ With all three keys, the character unlocked not a treasure chest, but a deeper u
 
 Please continue with more details, dialogue, and story development. Add at least 100 more words to make this a richer, more complete story. Continue seamlessly from where it left off."""
                         
-                        continuation_message = UserMessage(text=continuation_prompt)
+                        continuation_message = continuation_prompt
                         
                         # CRITICAL FIX: Add timeout to prevent hanging
                         try:
-                            continuation = await asyncio.wait_for(
-                                chat.send_message(continuation_message), 
-                                timeout=15.0  # 15 second timeout per iteration
-                            )
+                            continuation = await chat.send(continuation_message, timeout=15.0)  # 15 second timeout per iteration
                         except asyncio.TimeoutError:
                             logger.error(f"Timeout during story iteration {iteration_count}, breaking loop")
                             break
@@ -2284,6 +2335,9 @@ Please continue with more details, dialogue, and story development. Add at least
         except Exception as e:
             logger.error(f"Error generating enhanced response: {str(e)}")
             return self._get_fallback_ambient_response(user_profile.get('age', 5))
+        finally:
+            if chat is not None:
+                chat.close()  # Done with this LLM conversation
     
     def _post_process_with_dialogue_plan(self, response: str, dialogue_plan: Dict[str, Any], age_group: str) -> str:
         """Post-process response based on dialogue plan"""
@@ -2335,6 +2389,7 @@ Please continue with more details, dialogue, and story development. Add at least
 
     async def generate_response_with_dialogue_plan(self, user_input: str, user_profile: Dict[str, Any], session_id: str, context: List[Dict[str, Any]] = None, dialogue_plan: Dict[str, Any] = None, memory_context: Dict[str, Any] = None) -> str:
         """Generate response with conversation context for ambient listening and enhanced content detection"""
+        chat = None
         try:
             # CRITICAL FIX: Validate input message
             if not user_input or not user_input.strip():
@@ -2375,16 +2430,25 @@ Please continue with more details, dialogue, and story development. Add at least
                 logger.info(f"🚀 BLAZING SPEED: Cache response served in {blazing_duration:.3f}s")
                 return cache_response
             
-            # BLAZING SPEED OPTIMIZATION 3: If no template/cache hit, proceed with optimized LLM
+            # Detect content type using enhanced detection
+            content_type = self._detect_content_type(user_input)
+            
+            # BLAZING SPEED OPTIMIZATION 3: Semantic response cache - an earlier LLM answer to the same question
+            cache_key = self._response_cache_key(user_input, user_profile, content_type, "full")
+            if cache_key:
+                cached_response = self.response_cache.lookup(cache_key, user_profile, session_id)
+                if cached_response:
+                    logger.info(f"🗃️ RESPONSE CACHE: '{cache_key[3]}' served in {time.time() - start_blazing:.3f}s")
+                    self._store_recent_response(cached_response, session_id)
+                    return {"text": cached_response, "content_type": content_type}
+            
+            # BLAZING SPEED OPTIMIZATION 4: If no template/cache hit, proceed with optimized LLM
             logger.info(f"🚀 BLAZING SPEED: Template/cache miss, using optimized LLM pipeline...")
             
             # Determine age group
             age = user_profile.get('age', 5)
             age_group = self._get_age_group(age)
             
-            # Detect content type using enhanced detection
-            content_type = self._detect_content_type(user_input)
-            
             # Enhanced logging for story detection
             logger.info(f"Content type detected: {content_type} for input: {user_input[:50]}...")
             if content_type == "story":
@@ -2503,11 +2567,9 @@ Please continue with more details, dialogue, and story development. Add at least
                 enhanced_system_with_history = enhanced_system_message + history_text
                 
                 # GROK'S UNLIMITED TOKEN SOLUTION - Force complete generation for ALL content
-                chat = LlmChat(
-                    api_key=self.gemini_api_key,
-                    session_id=session_id,
-                    system_message=enhanced_system_with_history
-                ).with_model("gemini", "gemini-2.0-flash")
+                chat = self.llm_gateway.open_conversation(
+                    enhanced_system_with_history, session_id=session_id, api_key=self.gemini_api_key
+                )
                 # CRITICAL: NO TOKEN LIMITS - Force complete responses for everything
                 logger.info(f"🔄 {content_type.upper()} REQUEST - Using UNLIMITED tokens for complete response")
                 
@@ -2515,16 +2577,14 @@ Please continue with more details, dialogue, and story development. Add at least
                 logger.info("✅ Enhanced chat initialized with conversation history and dynamic token allocation")
             else:
                 # No context available, use original system message with unlimited tokens
-                chat = LlmChat(
-                    api_key=self.gemini_api_key,
-                    session_id=session_id,
-                    system_message=enhanced_system_message
-                ).with_model("gemini", "gemini-2.0-flash")
+                chat = self.llm_gateway.open_conversation(
+                    enhanced_system_message, session_id=session_id, api_key=self.gemini_api_key
+                )
                 # CRITICAL: NO TOKEN LIMITS for any content type
                 logger.info(f"🔄 {content_type.upper()} REQUEST - Using UNLIMITED tokens (no context)")
             
             # Create user message
-            user_message = UserMessage(text=user_input)
+            user_message = user_input
             
             # GENERATE RESPONSE WITH CONTINUATION LOOP - Ensure completeness
             response = ""
@@ -2534,10 +2594,7 @@ Please continue with more details, dialogue, and story development. Add at least
             while attempt < max_attempts:
                 try:
                     # CRITICAL FIX: Add timeout to prevent hanging
-                    current_response = await asyncio.wait_for(
-                        chat.send_message(user_message), 
-                        timeout=30.0  # 30 second timeout per attempt
-                    )
+                    current_response = await chat.send(user_message, timeout=30.0)  # 30 second timeout per attempt
                     response += current_response if current_response else ""
                     
                     # Check if response is complete (not truncated)
@@ -2568,9 +2625,9 @@ Please continue with more details, dialogue, and story development. Add at least
                         if attempt < max_attempts:
                             # Add continuation prompt - emphasize complete delivery for jokes
                             if content_type == "joke":
-                                user_message = UserMessage(text=f"{user_input}\n\nPlease provide the complete joke with setup AND punchline in one response.")
+                                user_message = f"{user_input}\n\nPlease provide the complete joke with setup AND punchline in one response."
                             else:
-                                user_message = UserMessage(text=f"{user_input}\n\nPlease provide a complete, full response.")
+                                user_message = f"{user_input}\n\nPlease provide a complete, full response."
                         continue
                         
                     break
@@ -2588,7 +2645,9 @@ Please continue with more details, dialogue, and story development. Add at least
                         response = f"I'd love to help you with that! Let's try something fun together, {user_profile.get('name', 'friend')}!"
                         break
             
+            generated = attempt < max_attempts  # False when the reply is a fallback
             if not response or len(response.strip()) < 20:
+                generated = False
                 logger.error("❌ All generation attempts failed or produced inadequate response")
                 response = f"I'd love to help you with that! Let's have some fun together, {user_profile.get('name', 'friend')}!"
             
@@ -2617,14 +2676,11 @@ Please continue with more details, dialogue, and story development. Add at least
                         else:
                             continuation_prompt = f"COMPLETE this story with a detailed ending, more dialogue, and rich descriptions. Add at least 100 more words to reach 300+ word requirement: {current_story[-300:]}"
                         
-                        continuation_message = UserMessage(text=continuation_prompt)
+                        continuation_message = continuation_prompt
                         
                         # CRITICAL FIX: Add timeout to prevent hanging
                         try:
-                            continuation = await asyncio.wait_for(
-                                chat.send_message(continuation_message), 
-                                timeout=15.0  # 15 second timeout per iteration
-                            )
+                            continuation = await chat.send(continuation_message, timeout=15.0)  # 15 second timeout per iteration
                         except asyncio.TimeoutError:
                             logger.error(f"❌ Timeout during story iteration {iteration_count}, breaking loop")
                             break
@@ -2652,13 +2708,10 @@ Please continue with more details, dialogue, and story development. Add at least
                     if final_word_count < 300:
                         logger.warning(f"🚨 Story still under 300 words ({final_word_count}). Making final expansion attempt.")
                         final_prompt = f"This story is too short at {final_word_count} words. EXPAND it significantly with more details, descriptions, dialogue, and character development to reach AT LEAST 300 words: {current_story}"
-                        final_message = UserMessage(text=final_prompt)
+                        final_message = final_prompt
                         
                         try:
-                            final_response = await asyncio.wait_for(
-                                chat.send_message(final_message), 
-                                timeout=20.0  # 20 second timeout for final attempt
-                            )
+                            final_response = await chat.send(final_message, timeout=20.0)  # 20 second timeout for final attempt
                             
                             if final_response:
                                 current_story = final_response  # Replace with expanded version
@@ -2689,6 +2742,13 @@ Please continue with more details, dialogue, and story development. Add at least
             processed_response = self.enforce_age_appropriate_language(processed_response, age, content_type)
             logger.info(f"🔍 Applied age-appropriate language enforcement for age {age} to {content_type} content")
             
+            # Share the answer with the next child who asks the same thing (before per-session variation)
+            if cache_key and generated:
+                self.response_cache.store(
+                    cache_key, processed_response, user_profile, session_id,
+                    self.response_cache.personal_terms(user_profile, memory_context)
+                )
+            
             # CONTENT DEDUPLICATION: Check for similar responses and add variation - OPTIMIZED FOR HIGH PERFORMANCE
             try:
                 # Quick performance check - skip deduplication for very long responses to save time
@@ -2720,102 +2780,21 @@ Please continue with more details, dialogue, and story development. Add at least
             
             logger.info(f"Generated context-aware response for age {age}: {processed_response[:100]}...")
             
-            # Return both text and content_type for proper audio handling
-            # FORCE TTS AUDIO GENERATION FOR ALL RESPONSES
-            logger.info(f"🎵 FORCE TTS: Ensuring audio generation for {content_type} response")
-            
-            # Import voice agent if not already imported
-            try:
-                from .voice_agent import VoiceAgent
-                import os
-                
-                # Get Deepgram API key
-                deepgram_key = os.environ.get('DEEPGRAM_API_KEY')
-                if deepgram_key:
-                    logger.info("🎵 FORCE TTS: Creating voice agent for audio generation")
-                    voice_agent = VoiceAgent(deepgram_key)
-                    
-                    # Force TTS generation for this response
-                    voice_personality = user_profile.get('voice_personality', 'friendly_companion')
-                    audio_base64 = await voice_agent.text_to_speech_chunked(processed_response, voice_personality)
-                    
-                    if audio_base64 and len(audio_base64) > 0:
-                        logger.info(f"🎵 FORCE TTS: Audio generated successfully - size: {len(audio_base64)}")
-                        return {
-                            "text": processed_response,
-                            "content_type": content_type,
-                            "audio_base64": audio_base64
-                        }
-                    else:
-                        logger.error("🎵 FORCE TTS: Audio generation failed - no audio returned")
-                        # Fallback with test audio
-                        fallback_audio = await voice_agent.text_to_speech("Test audio", voice_personality)
-                        if fallback_audio and len(fallback_audio) > 0:
-                            logger.info("🎵 FORCE TTS: Fallback audio generated successfully")
-                            return {
-                                "text": processed_response,
-                                "content_type": content_type,
-                                "audio_base64": fallback_audio
-                            }
-                        else:
-                            logger.error("🎵 FORCE TTS: Even fallback audio failed")
-                            return {
-                                "text": processed_response,
-                                "content_type": content_type,
-                                "audio_base64": ""
-                            }
-                else:
-                    logger.error("🎵 FORCE TTS: No Deepgram API key found")
-                    return {
-                        "text": processed_response,
-                        "content_type": content_type,
-                        "audio_base64": ""
-                    }
-                    
-            except Exception as tts_error:
-                logger.error(f"🎵 FORCE TTS: Exception during audio generation: {str(tts_error)}")
-                return {
-                    "text": processed_response,
-                    "content_type": content_type,
-                    "audio_base64": ""
-                }
+            # Text only - the orchestrator's TTS stage voices the reply through the shared voice agent
+            return {
+                "text": processed_response,
+                "content_type": content_type
+            }
             
         except Exception as e:
             logger.error(f"Error generating context-aware response: {str(e)}")
-            
-            # FORCE TTS EVEN FOR FALLBACK RESPONSES
-            try:
-                from .voice_agent import VoiceAgent
-                import os
-                
-                fallback_text = self._get_fallback_ambient_response(user_profile.get('age', 5))
-                deepgram_key = os.environ.get('DEEPGRAM_API_KEY')
-                
-                if deepgram_key:
-                    logger.info("🎵 FORCE TTS FALLBACK: Generating audio for fallback response")
-                    voice_agent = VoiceAgent(deepgram_key)
-                    voice_personality = user_profile.get('voice_personality', 'friendly_companion')
-                    fallback_audio = await voice_agent.text_to_speech(fallback_text, voice_personality)
-                    
-                    return {
-                        "text": fallback_text,
-                        "content_type": "conversation",
-                        "audio_base64": fallback_audio if fallback_audio else ""
-                    }
-                else:
-                    return {
-                        "text": fallback_text,
-                        "content_type": "conversation",
-                        "audio_base64": ""
-                    }
-                    
-            except Exception as fallback_tts_error:
-                logger.error(f"🎵 FORCE TTS FALLBACK: Exception during fallback audio: {str(fallback_tts_error)}")
-                return {
-                    "text": self._get_fallback_ambient_response(user_profile.get('age', 5)),
-                    "content_type": "conversation",
-                    "audio_base64": ""
-                }
+            return {
+                "text": self._get_fallback_ambient_response(user_profile.get('age', 5)),
+                "content_type": "conversation"
+            }
+        finally:
+            if chat is not None:
+                chat.close()  # Done with this LLM conversation
     
     def _post_process_ambient_response(self, response: str, age_group: str, content_type: str = "conversation") -> str:
         """Post-process response for ambient conversation - PRESERVES story content"""
@@ -2866,6 +2845,7 @@ Please continue with more details, dialogue, and story development. Add at least
 
     async def generate_response(self, user_input: str, user_profile: Dict[str, Any], session_id: str) -> str:
         """Generate age-appropriate response using Gemini 2.0 Flash with content frameworks"""
+        chat = None
         try:
             # FIRST: Check if user is responding to a pending riddle
             if self._is_riddle_response(user_input, session_id):
@@ -2894,18 +2874,16 @@ Please continue with more details, dialogue, and story development. Add at least
                 enhanced_system_message = f"{base_empathetic_message}\n\nProvide rich, thoughtful responses with the depth and warmth this conversation deserves. Remember - you genuinely care about this child's happiness and growth!"
             
             # Initialize chat with session - COMPLETELY REMOVE TOKEN LIMITS  
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                session_id=session_id,
-                system_message=enhanced_system_message
-            ).with_model("gemini", "gemini-2.0-flash")
-            # INTENTIONALLY NO .with_max_tokens() - Allow unlimited length
+            chat = self.llm_gateway.open_conversation(
+                enhanced_system_message, session_id=session_id, api_key=self.gemini_api_key
+            )
+            # INTENTIONALLY NO max_tokens - Allow unlimited length
             
             # Create user message
-            user_message = UserMessage(text=user_input)
+            user_message = user_input
             
             # GROK'S ITERATIVE GENERATION SOLUTION - Proven approach
-            response = await chat.send_message(user_message)
+            response = await chat.send(user_message)
             original_response = response
             
             # Check if response was truncated and continue iteratively
@@ -2929,8 +2907,8 @@ Please continue with more details, dialogue, and story development. Add at least
                     else:
                         continuation_prompt = f"COMPLETE this story with a detailed ending, more dialogue, and rich descriptions. Add at least 100 more words to reach 300+ word requirement: {complete_response[-300:]}"
                     
-                    continuation_message = UserMessage(text=continuation_prompt)
-                    continuation_response = await chat.send_message(continuation_message)
+                    continuation_message = continuation_prompt
+                    continuation_response = await chat.send(continuation_message)
                     
                     if continuation_response:
                         # Smart continuation - ensure smooth flow
@@ -2955,8 +2933,8 @@ Please continue with more details, dialogue, and story development. Add at least
                 if final_word_count < 300:
                     logger.warning(f"🚨 Story still under 300 words ({final_word_count}). Making final expansion attempt.")
                     final_prompt = f"This story is too short at {final_word_count} words. EXPAND it significantly with more details, descriptions, dialogue, and character development to reach AT LEAST 300 words: {complete_response}"
-                    final_message = UserMessage(text=final_prompt)
-                    final_response = await chat.send_message(final_message)
+                    final_message = final_prompt
+                    final_response = await chat.send(final_message)
                     
                     if final_response:
                         complete_response = final_response  # Replace with expanded version
@@ -2972,8 +2950,8 @@ Please continue with more details, dialogue, and story development. Add at least
                 if len(response.split()) < 50:  # Minimum for complete responses
                     logger.info("🔄 Response seems incomplete, attempting continuation")
                     continuation_prompt = f"Complete this response fully: {response}"
-                    continuation_message = UserMessage(text=continuation_prompt)
-                    continuation_response = await chat.send_message(continuation_message)
+                    continuation_message = continuation_prompt
+                    continuation_response = await chat.send(continuation_message)
                     
                     if continuation_response:
                         response = response + " " + continuation_response
@@ -3001,14 +2979,11 @@ Please continue with more details, dialogue, and story development. Add at least
 
 Please continue with more details, dialogue, and story development. Add at least 100 more words to make this a richer, more complete story. Continue seamlessly from where it left off."""
                         
-                        continuation_message = UserMessage(text=continuation_prompt)
+                        continuation_message = continuation_prompt
                         
                         # CRITICAL FIX: Add timeout to prevent hanging
                         try:
-                            continuation = await asyncio.wait_for(
-                                chat.send_message(continuation_message), 
-                                timeout=15.0  # 15 second timeout per iteration
-                            )
+                            continuation = await chat.send(continuation_message, timeout=15.0)  # 15 second timeout per iteration
                         except asyncio.TimeoutError:
                             logger.error(f"Timeout during story iteration {iteration_count}, breaking loop")
                             break
@@ -3069,6 +3044,9 @@ Please continue with more details, dialogue, and story development. Add at least
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             return self._get_fallback_response(user_profile.get('age', 5))
+        finally:
+            if chat is not None:
+                chat.close()  # Done with this LLM conversation
 
     def _detect_content_type(self, user_input: str) -> str:
         """Detect what type of content the user is requesting"""
@@ -3183,6 +3161,14 @@ Please continue with more details, dialogue, and story development. Add at least
                     logger.info(f"⚡ TEMPLATE RESPONSE: Generated instantly")
                     return template_response
             
+            # Semantic response cache - an earlier brief answer to the same question
+            cache_key = self._response_cache_key(user_input, user_profile, "conversation", "brief")
+            if cache_key:
+                cached_response = self.response_cache.lookup(cache_key, user_profile, session_id)
+                if cached_response:
+                    logger.info(f"🗃️ RESPONSE CACHE: '{cache_key[3]}' served from cache")
+                    return cached_response
+            
             # Fallback to fast LLM response
             age_group = self._get_age_group(user_profile.get('age', 5))
             
@@ -3191,19 +3177,16 @@ Please continue with more details, dialogue, and story development. Add at least
 Age group: {age_group}. Keep responses under 100 words and very friendly.
 Child's name: {user_profile.get('name', 'friend')}"""
             
-            # Fast chat with minimal configuration
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                system_message=system_message
-            ).with_model("gemini", "gemini-2.0-flash-lite").with_max_tokens(150)
-            
-            # Generate response
-            from emergentintegrations.llm.chat import UserMessage
-            message = UserMessage(text=user_input)
-            response = await chat.send_message(message)
+            # Fast model with minimal configuration
+            response = await self.llm_gateway.complete(
+                system_message, user_input, model="gemini-2.0-flash-lite", max_tokens=150, api_key=self.gemini_api_key
+            )
             
             if response:
                 logger.info(f"⚡ STREAMING RESPONSE: Generated {len(response)} chars")
+                if cache_key:
+                    self.response_cache.store(cache_key, response.strip(), user_profile, session_id,
+                                              self.response_cache.personal_terms(user_profile))
                 return response.strip()
             else:
                 logger.warning("No streaming response generated, using fallback")
@@ -5,7 +5,7 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional
 from datetime import datetime
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from .llm_gateway import get_llm_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +14,7 @@ class EmotionalSensingAgent:
     
     def __init__(self, gemini_api_key: str):
         self.gemini_api_key = gemini_api_key
+        self.llm_gateway = get_llm_gateway()
         
         # Emotional state mappings
         self.sentiment_labels = ["positive", "neutral", "negative"]
@@ -188,13 +189,9 @@ class EmotionalSensingAgent:
             - Cultural context (Indian English/Hinglish)
             """
 
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                system_message=system_prompt
-            ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(200)
-
-            user_message = UserMessage(text=f"Child's message: '{text}'")
-            response = await chat.send_message(user_message)
+            response = await self.llm_gateway.complete(
+                system_prompt, f"Child's message: '{text}'", max_tokens=200, api_key=self.gemini_api_key
+            )
 
             # Parse JSON response
             import json
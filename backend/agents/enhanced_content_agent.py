@@ -9,6 +9,9 @@ import random
 import re
 import json
 
+from .rate_limiter import TTSPriority
+from .llm_gateway import get_llm_gateway
+
 logger = logging.getLogger(__name__)
 
 class EnhancedContentAgent:
@@ -17,6 +20,7 @@ class EnhancedContentAgent:
     def __init__(self, db, gemini_api_key: str = None):
         self.db = db
         self.gemini_api_key = gemini_api_key
+        self.llm_gateway = get_llm_gateway()
         self.content_cache = {}
         
     async def get_cached_content(self, content_type: str, content_key: str) -> Optional[str]:
@@ -1062,12 +1066,8 @@ Give the entire rhyme, not just the first part. NEVER truncate.""",
         # Use caching for LLM content to avoid regeneration
         async def generate_new_content():
             try:
-                from emergentintegrations import LlmChat, UserMessage
-                
                 # CRITICAL: No token limits and explicit completion instructions
-                chat = LlmChat(
-                    api_key=self.gemini_api_key,
-                    system_message=f"""You are a helpful AI for children. CRITICAL RULES: 
+                system_message = f"""You are a helpful AI for children. CRITICAL RULES: 
 
 1. Always provide COMPLETE, FULL responses in ONE message
 2. For jokes: Give setup + IMMEDIATE punchline + explanation + reaction (NEVER "... tell me more!")  
@@ -1079,13 +1079,11 @@ JOKE FORMAT EXAMPLE:
 ❌ WRONG: "Why did the chicken cross the road? ... Tell me more!"
 
 Deliver everything requested immediately and completely. Be warm, encouraging, and complete every response fully."""
-                ).with_model("gemini", "gemini-2.0-flash")
-                # NO TOKEN LIMITS - ensure complete responses
                 
                 prompt = prompt_templates.get(content_type, f"Help with {content_type} content for {name}. Give a complete, full response immediately.")
-                user_message = UserMessage(text=prompt)
                 
-                response = await chat.send_message(user_message)
+                # NO TOKEN LIMITS - ensure complete responses
+                response = await self.llm_gateway.complete(system_message, prompt, api_key=self.gemini_api_key)
                 
                 # Ensure we got a substantial response
                 if response and len(response.strip()) > 50:
@@ -1434,11 +1432,13 @@ Deliver everything requested immediately and completely. Be warm, encouraging, a
                     # Use chunked TTS for long stories
                     audio_response = await voice_agent.text_to_speech_chunked(
                         content, 
-                        "story_narrator"
+                        "story_narrator",
+                        priority=TTSPriority.BATCH  # Admin batch work yields to live requests
                     )
                     
-                    if audio_response and "error" not in audio_response:
-                        audio_data = audio_response.get("audio", "")
+                    if audio_response:
+                        # Chunked TTS now returns one stitched base64 WAV
+                        audio_data = audio_response if isinstance(audio_response, str) else audio_response.get("audio", "")
                         
                         if audio_data:
                             # Save to database cache
@@ -0,0 +1,176 @@
+"""
+HTTP Client Pool - Process-wide, pre-warmed keep-alive connections for Deepgram TTS/STT
+"""
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Override with a local stub (see service_stub.py) for offline benchmarking
+DEEPGRAM_BASE_URL = os.environ.get("DEEPGRAM_BASE_URL", "https://api.deepgram.com")
+
+
+class DeepgramConnectionPool:
+    """Shared aiohttp session with keep-alive, per-host limits and explicit warm-up"""
+
+    def __init__(self, base_url: str = DEEPGRAM_BASE_URL, limit: int = 32, limit_per_host: int = 8,
+                 keepalive_timeout: float = 60.0, warm_connections: int = 3, refresh_interval: float = 45.0):
+        self.base_url = base_url.rstrip("/")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.warm_connections = warm_connections
+        self.refresh_interval = refresh_interval
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._last_used = 0.0
+
+        # Lightweight counters for /api/agents/status and debugging
+        self.stats = {
+            "sessions_created": 0,
+            "requests": 0,
+            "warmups": 0,
+            "warmup_failures": 0
+        }
+
+    async def start(self) -> None:
+        """Create the shared session, warm sockets and start the keep-alive refresher"""
+        await self.get_session()
+        await self.warm_up()
+
+        if self.refresh_interval and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.create_task(self._keep_alive_loop())
+
+        logger.info(f"✅ Deepgram connection pool ready ({self.limit_per_host} per host, keep-alive {self.keepalive_timeout}s)")
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it lazily if the pool was not started"""
+        if self._session is not None and not self._session.closed:
+            self._last_used = time.time()
+            return self._session
+
+        async with self._session_lock:
+            if self._session is None or self._session.closed:
+                connector = aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                    enable_cleanup_closed=True
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=aiohttp.ClientTimeout(total=30, connect=5)
+                )
+                self.stats["sessions_created"] += 1
+                logger.info("🔌 Deepgram connection pool: new shared session created")
+
+        self._last_used = time.time()
+        return self._session
+
+    def request(self, method: str, path: str, **kwargs):
+        """Issue a request on the shared session (use as `async with pool.request(...) as resp`)"""
+        return _PooledRequest(self, method, path, kwargs)
+
+    def post(self, path: str, **kwargs):
+        """POST to a Deepgram path on the shared session"""
+        return self.request("POST", path, **kwargs)
+
+    async def warm_up(self, connections: int = None) -> int:
+        """Open `connections` sockets in parallel and return them to the pool alive"""
+        connections = connections or self.warm_connections
+        deepgram_key = os.environ.get('DEEPGRAM_API_KEY')
+        headers = {'Authorization': f'Token {deepgram_key}'} if deepgram_key else {}
+
+        async def _touch() -> bool:
+            try:
+                # Fully reading the response hands the connection back to the pool for reuse
+                async with self.request("GET", "/v1/projects", headers=headers,
+                                        timeout=aiohttp.ClientTimeout(total=5)) as response:
+                    await response.read()
+                    return True
+            except Exception as e:
+                logger.debug(f"Connection warm-up request failed: {str(e)}")
+                return False
+
+        results = await asyncio.gather(*[_touch() for _ in range(connections)])
+        warmed = sum(1 for ok in results if ok)
+
+        self.stats["warmups"] += 1
+        if warmed < connections:
+            self.stats["warmup_failures"] += connections - warmed
+
+        logger.info(f"🔥 Deepgram connection pool warmed: {warmed}/{connections} sockets")
+        return warmed
+
+    async def _keep_alive_loop(self) -> None:
+        """Re-warm idle sockets before the keep-alive timeout drops them"""
+        try:
+            while True:
+                await asyncio.sleep(self.refresh_interval)
+                if self._session is None or self._session.closed:
+                    return
+                if time.time() - self._last_used >= self.refresh_interval:
+                    await self.warm_up()
+        except asyncio.CancelledError:
+            pass
+
+    async def close(self) -> None:
+        """Stop the refresher and close all pooled sockets"""
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("🔌 Deepgram connection pool closed")
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool counters plus current connector state"""
+        stats = dict(self.stats)
+        stats["open"] = self._session is not None and not self._session.closed
+        return stats
+
+
+class _PooledRequest:
+    """Async context manager resolving the shared session before issuing the request"""
+
+    def __init__(self, pool: DeepgramConnectionPool, method: str, path: str, kwargs: Dict[str, Any]):
+        self.pool = pool
+        self.method = method
+        self.url = path if path.startswith("http") else f"{pool.base_url}{path}"
+        self.kwargs = kwargs
+        self._ctx = None
+
+    async def __aenter__(self) -> aiohttp.ClientResponse:
+        session = await self.pool.get_session()
+        self.pool.stats["requests"] += 1
+        self._ctx = session.request(self.method, self.url, **self.kwargs)
+        return await self._ctx.__aenter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return await self._ctx.__aexit__(exc_type, exc, tb)
+
+
+# Process-wide pool shared by every VoiceAgent / RateLimitedTTSQueue instance
+_shared_pool: Optional[DeepgramConnectionPool] = None
+
+
+def get_deepgram_pool() -> DeepgramConnectionPool:
+    """Return the process-wide Deepgram connection pool"""
+    global _shared_pool
+    if _shared_pool is None:
+        _shared_pool = DeepgramConnectionPool()
+    return _shared_pool
@@ -0,0 +1,109 @@
+"""
+LLM Client - Single import point for LlmChat so LLM_BACKEND=stub can swap in the local stand-in
+"""
+import json
+import logging
+import os
+from typing import AsyncIterator, List, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+if os.environ.get("LLM_BACKEND", "").lower() == "stub":
+    from .service_stub import StubUserMessage as UserMessage
+    if os.environ.get("STUB_LLM_STREAMING", "0").lower() in ("1", "true", "yes"):
+        # Opt-in: models a client with token streaming, which LlmChat does not have
+        from .service_stub import StubStreamingLlmChat as LlmChat
+    else:
+        from .service_stub import StubLlmChat as LlmChat
+    logger.warning("🧪 LLM_BACKEND=stub - using local LlmChat stand-in, no Gemini calls will be made")
+else:
+    from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+
+GEMINI_BASE_URL = os.environ.get("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com")
+
+
+async def stream_message(chat, message) -> AsyncIterator[str]:
+    """Reply text deltas as the model produces them.
+
+    Clients without native streaming (emergentintegrations LlmChat only has
+    send_message) yield the whole reply as a single delta.
+    """
+    stream = getattr(chat, "stream_message", None)
+    if stream is None:
+        reply = await chat.send_message(message)
+        if reply:
+            yield reply
+        return
+    async for delta in stream(message):
+        yield delta
+
+
+class GeminiStreamClient:
+    """Token streaming straight from the Gemini API (streamGenerateContent over SSE).
+
+    LlmChat only returns whole replies, so this is what lets the first sentence reach
+    TTS while the model is still writing. It needs a Google AI Studio key ("AIza...");
+    other keys keep going through LlmChat. One keep-alive aiohttp session is shared
+    by every stream. On by default; LLM_NATIVE_STREAMING=0 sends every stream through
+    LlmChat, and the gateway falls back to LlmChat when a first stream fails outright.
+    """
+
+    def __init__(self, base_url: str = GEMINI_BASE_URL):
+        self.base_url = base_url.rstrip("/")
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @staticmethod
+    def supports(provider: str, api_key: Optional[str]) -> bool:
+        return (
+            provider == "gemini"
+            and bool(api_key) and api_key.startswith("AIza")
+            and os.environ.get("LLM_BACKEND", "").lower() != "stub"
+            and os.environ.get("LLM_NATIVE_STREAMING", "1").lower() not in ("0", "false", "no")
+        )
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=16, keepalive_timeout=60.0),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=10.0)  # Callers bound the whole stream
+            )
+        return self._session
+
+    async def stream(self, api_key: str, model: str, system_message: str, history: List[Tuple[str, str]],
+                     text: str, max_tokens: Optional[int] = None) -> AsyncIterator[str]:
+        """Reply deltas for `text` after `history` ((role, text) pairs, role "user" or "model")"""
+        body = {
+            "contents": [{"role": role, "parts": [{"text": part}]} for role, part in history]
+                        + [{"role": "user", "parts": [{"text": text}]}]
+        }
+        if system_message:
+            body["systemInstruction"] = {"parts": [{"text": system_message}]}
+        if max_tokens:
+            body["generationConfig"] = {"maxOutputTokens": max_tokens}
+
+        url = f"{self.base_url}/v1beta/models/{model}:streamGenerateContent"
+        async with self._get_session().post(url, params={"alt": "sse"}, json=body,
+                                            headers={"x-goog-api-key": api_key}) as response:
+            if response.status != 200:
+                detail = (await response.text())[:200]
+                raise Exception(f"{response.status} {response.reason}: Gemini stream failed: {detail}")
+            async for line in response.content:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                chunk = json.loads(line[5:])
+                for candidate in chunk.get("candidates") or []:
+                    for part in (candidate.get("content") or {}).get("parts") or []:
+                        if part.get("text"):
+                            yield part["text"]
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+__all__ = ["LlmChat", "UserMessage", "stream_message", "GeminiStreamClient"]
@@ -0,0 +1,355 @@
+"""
+LLM Gateway - Single entry point for LlmChat conversations with timeouts, a global concurrency budget and metrics
+"""
+import asyncio
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+
+from .llm_client import LlmChat, UserMessage, GeminiStreamClient, stream_message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROVIDER = "gemini"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# (provider, model, max_tokens) - max_tokens None means the client default (no explicit limit)
+ProfileKey = Tuple[str, str, Optional[int]]
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Rough token count (~4 characters per token) - send_message only returns text"""
+    return (len(text) + 3) // 4 if text else 0
+
+
+class _ProfileStats:
+    """Latency and token counters for one (model, max_tokens) profile"""
+
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latencies = deque(maxlen=window)       # Whole call, seconds
+        self.first_token = deque(maxlen=window)     # Streams only, seconds
+
+    @staticmethod
+    def _percentile(values, fraction: float) -> Optional[float]:
+        if not values:
+            return None
+        ordered = sorted(values)
+        return round(ordered[min(int(len(ordered) * fraction), len(ordered) - 1)], 3)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "prompt_tokens_est": self.prompt_tokens,
+            "completion_tokens_est": self.completion_tokens,
+            "latency_p50": self._percentile(self.latencies, 0.5),
+            "latency_p95": self._percentile(self.latencies, 0.95),
+            "first_token_p50": self._percentile(self.first_token, 0.5)
+        }
+
+
+class LLMConversation:
+    """One LlmChat bound to one system message; successive sends share its history.
+
+    A conversation whose first call is a stream (and whose key allows it) talks to
+    Gemini's streaming API for its whole life instead, keeping the history itself.
+    close() drops the client - after that the conversation cannot send.
+    """
+
+    def __init__(self, gateway: "LLMGateway", client, profile: ProfileKey, system_message: str,
+                 api_key: Optional[str], timeout: float):
+        self.gateway = gateway
+        self.client = client
+        self.profile = profile
+        self.system_message = system_message
+        self.api_key = api_key
+        self.timeout = timeout
+        self.native: Optional[bool] = None           # Decided on the first call
+        self.history: List[Tuple[str, str]] = []     # (role, text), native conversations only
+
+    def close(self) -> None:
+        self.client = None
+
+    async def send(self, text: str, timeout: Optional[float] = None) -> str:
+        """Full reply; raises asyncio.TimeoutError when the slot wait plus the call exceed `timeout`"""
+        return await self.gateway._send(self, text, self.timeout if timeout is None else timeout)
+
+    def stream(self, text: str, timeout: Optional[float] = None) -> AsyncIterator[str]:
+        """Reply deltas; `timeout` bounds the whole stream and raises asyncio.TimeoutError.
+
+        aclose() the iterator when stopping early so the concurrency slot is released at once.
+        """
+        return self.gateway._stream(self, text, self.timeout if timeout is None else timeout)
+
+
+class LLMGateway:
+    """Owns every LlmChat the agents use.
+
+    open_conversation() builds a fresh LlmChat through its public constructor and
+    builder methods - LlmChat holds no transport worth reusing, and per-conversation
+    state (system message, session id, history) lives inside it. LlmChat cannot
+    stream, so streamed conversations go to GeminiStreamClient when the key is a
+    Google AI Studio key (unless LLM_NATIVE_STREAMING=0); a first stream that fails
+    before its first delta is retried through LlmChat. Otherwise a stream yields
+    the whole reply as one delta and nothing overlaps with generation.
+    Every request - from any agent - first takes a slot from one global semaphore,
+    so under load LLM calls queue instead of piling onto Gemini. The timeout of a
+    call covers that queueing as well.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, max_concurrency: int = 16, default_timeout: float = 30.0):
+        self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.native_client = GeminiStreamClient()
+
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._profiles: Dict[ProfileKey, _ProfileStats] = {}
+        self.in_flight = 0
+        self.waiting = 0
+        self.stats = {"clients_created": 0, "native_streams": 0, "native_fallbacks": 0, "peak_in_flight": 0,
+                      "queue_wait_total": 0.0}
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        """LLM_MAX_CONCURRENCY and LLM_TIMEOUT_SECONDS override the defaults"""
+        env = os.environ
+        return cls(
+            max_concurrency=int(env.get("LLM_MAX_CONCURRENCY", "16")),
+            default_timeout=float(env.get("LLM_TIMEOUT_SECONDS", "30"))
+        )
+
+    # ------------------------------------------------------------------ clients
+
+    def _build_client(self, profile: ProfileKey, system_message: str, session_id: str, api_key: Optional[str]):
+        provider, model, max_tokens = profile
+        client = LlmChat(api_key=api_key, session_id=session_id, system_message=system_message).with_model(provider, model)
+        if max_tokens:
+            client = client.with_max_tokens(max_tokens)
+        self.stats["clients_created"] += 1
+        return client
+
+    def open_conversation(self, system_message: str, model: str = DEFAULT_MODEL, max_tokens: Optional[int] = None,
+                          session_id: Optional[str] = None, timeout: Optional[float] = None,
+                          api_key: Optional[str] = None, provider: str = DEFAULT_PROVIDER) -> LLMConversation:
+        """Start a conversation for one or more related sends; close() it when done (or use conversation())"""
+        profile = (provider, model, max_tokens)
+        system_message = system_message or ""
+        api_key = api_key or self.api_key
+        client = self._build_client(profile, system_message, session_id or f"gateway_{uuid.uuid4().hex[:12]}", api_key)
+        return LLMConversation(self, client, profile, system_message, api_key,
+                               self.default_timeout if timeout is None else timeout)
+
+    @asynccontextmanager
+    async def conversation(self, system_message: str, **options) -> AsyncIterator[LLMConversation]:
+        """`async with gateway.conversation(...) as chat` - options as for open_conversation()"""
+        chat = self.open_conversation(system_message, **options)
+        try:
+            yield chat
+        finally:
+            chat.close()
+
+    async def complete(self, system_message: str, text: str, **options) -> str:
+        """One-shot reply; `options` as for open_conversation()"""
+        async with self.conversation(system_message, **options) as chat:
+            return await chat.send(text)
+
+    # ------------------------------------------------------------------ calls
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)  # Created inside the running loop
+        return self._slots
+
+    async def _acquire(self) -> None:
+        queued = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore().acquire()
+        finally:
+            self.waiting -= 1
+        self.stats["queue_wait_total"] += time.monotonic() - queued
+        self.in_flight += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], self.in_flight)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        self._semaphore().release()
+
+    @asynccontextmanager
+    async def _slot(self):
+        await self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _profile_stats(self, profile: ProfileKey) -> _ProfileStats:
+        stats = self._profiles.get(profile)
+        if stats is None:
+            stats = self._profiles[profile] = _ProfileStats()
+        return stats
+
+    async def _send(self, chat: LLMConversation, text: str, timeout: float) -> str:
+        stats = self._profile_stats(chat.profile)
+        stats.calls += 1
+        stats.prompt_tokens += estimate_tokens(chat.system_message) + estimate_tokens(text)
+        started = time.monotonic()
+
+        if chat.native is None:
+            chat.native = False  # Sent first - LlmChat owns the history from here on
+
+        async def call() -> str:
+            async with self._slot():
+                if chat.native:
+                    return "".join([delta async for delta in self._native_deltas(chat, text)])
+                return await chat.client.send_message(UserMessage(text=text))
+
+        try:
+            reply = await asyncio.wait_for(call(), timeout=timeout)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"⏱️ LLM GATEWAY: {chat.profile[1]} call timed out after {timeout:g}s ({self.waiting} waiting for a slot)")
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+
+        stats.latencies.append(time.monotonic() - started)
+        stats.completion_tokens += estimate_tokens(reply)
+        return reply
+
+    async def _stream(self, chat: LLMConversation, text: str, timeout: float) -> AsyncIterator[str]:
+        stats = self._profile_stats(chat.profile)
+        stats.calls += 1
+        stats.prompt_tokens += estimate_tokens(chat.system_message) + estimate_tokens(text)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + timeout
+
+        def remaining() -> float:
+            return max(deadline - loop.time(), 0.01)
+
+        try:
+            await asyncio.wait_for(self._acquire(), timeout=remaining())
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"⏱️ LLM GATEWAY: no slot for {chat.profile[1]} stream within {timeout:g}s ({self.waiting} waiting)")
+            raise
+
+        if chat.native is None:
+            chat.native = GeminiStreamClient.supports(chat.profile[0], chat.api_key)
+            if chat.native:
+                self.stats["native_streams"] += 1
+        if chat.native:
+            stream = self._native_deltas_or_fallback(chat, text)
+        else:
+            stream = stream_message(chat.client, UserMessage(text=text))
+        first = True
+        try:
+            while True:
+                try:
+                    delta = await asyncio.wait_for(stream.__anext__(), timeout=remaining())
+                except StopAsyncIteration:
+                    break
+                if first and delta:
+                    stats.first_token.append(loop.time() - started)
+                    first = False
+                stats.completion_tokens += estimate_tokens(delta)
+                yield delta
+            stats.latencies.append(loop.time() - started)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            logger.warning(f"⏱️ LLM GATEWAY: {chat.profile[1]} stream timed out after {timeout:g}s")
+            raise
+        except GeneratorExit:
+            raise
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            await stream.aclose()
+            self._release()
+
+    async def _native_deltas(self, chat: LLMConversation, text: str) -> AsyncIterator[str]:
+        """Stream from Gemini directly; the exchange joins the history only once complete"""
+        _, model, max_tokens = chat.profile
+        produced = []
+        async for delta in self.native_client.stream(chat.api_key, model, chat.system_message, chat.history,
+                                                     text, max_tokens):
+            produced.append(delta)
+            yield delta
+        chat.history.extend([("user", text), ("model", "".join(produced))])
+
+    async def _native_deltas_or_fallback(self, chat: LLMConversation, text: str) -> AsyncIterator[str]:
+        """Native deltas; a conversation's first stream that fails before any delta goes through LlmChat.
+
+        Nothing has been said yet and the history is empty, so switching the whole
+        conversation to LlmChat loses nothing. Later failures propagate as usual.
+        """
+        stream = self._native_deltas(chat, text)
+        try:
+            first = await stream.__anext__()
+        except StopAsyncIteration:
+            return
+        except Exception as e:
+            if chat.history:
+                raise
+            self.stats["native_fallbacks"] += 1
+            logger.warning(f"⚠️ LLM GATEWAY: native {chat.profile[1]} stream failed ({str(e)[:120]}), using LlmChat")
+            chat.native = False
+            async for delta in stream_message(chat.client, UserMessage(text=text)):
+                yield delta
+            return
+
+        try:
+            yield first
+            async for delta in stream:
+                yield delta
+        finally:
+            await stream.aclose()
+
+    async def close(self) -> None:
+        """Close the streaming client's sockets (application shutdown)"""
+        await self.native_client.close()
+
+    # ------------------------------------------------------------------ metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = sum(stats.calls for stats in self._profiles.values())
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "peak_in_flight": self.stats["peak_in_flight"],
+            "clients_created": self.stats["clients_created"],
+            "native_streams": self.stats["native_streams"],
+            "native_fallbacks": self.stats["native_fallbacks"],
+            "avg_queue_wait": round(self.stats["queue_wait_total"] / calls, 4) if calls else 0.0,
+            "profiles": {
+                f"{model}/{max_tokens or 'default'}": stats.as_dict()
+                for (_, model, max_tokens), stats in self._profiles.items()
+            }
+        }
+
+
+# Process-wide gateway shared by every agent
+_shared_gateway: Optional[LLMGateway] = None
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Return the process-wide LLM gateway"""
+    global _shared_gateway
+    if _shared_gateway is None:
+        _shared_gateway = LLMGateway.from_env()
+    return _shared_gateway
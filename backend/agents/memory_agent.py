@@ -5,7 +5,7 @@ import asyncio
 import logging
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+from .llm_gateway import get_llm_gateway
 import json
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,7 @@ class MemoryAgent:
     def __init__(self, db, gemini_api_key: str):
         self.db = db
         self.gemini_api_key = gemini_api_key
+        self.llm_gateway = get_llm_gateway()
         self.session_memories = {}  # session_id -> memory_data
         
         # Memory categories
@@ -272,13 +273,9 @@ class MemoryAgent:
             Write in a friendly, parent-appropriate tone. Keep it concise but informative.
             """
             
-            chat = LlmChat(
-                api_key=self.gemini_api_key,
-                system_message=system_prompt
-            ).with_model("gemini", "gemini-2.0-flash").with_max_tokens(300)
-            
-            user_message = UserMessage(text=f"Today's conversations:\n\n{conversation_text}")
-            response = await chat.send_message(user_message)
+            response = await self.llm_gateway.complete(
+                system_prompt, f"Today's conversations:\n\n{conversation_text}", max_tokens=300, api_key=self.gemini_api_key
+            )
             
             return response
             
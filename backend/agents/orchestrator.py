@@ -4,11 +4,18 @@ Main Orchestrator Agent - Central coordinator for all sub-agents with enhanced e
 import asyncio
 import logging
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, AsyncIterator
 from datetime import datetime, timedelta
 import uuid
 
-from .voice_agent import VoiceAgent
+from .voice_agent import VoiceAgent, NO_SPEECH
+from .http_client_pool import get_deepgram_pool
+from .llm_gateway import get_llm_gateway
+from .rate_limiter import TTSPriority
+from .cancellation import SessionCancellationRegistry, CancellationScope
+from .speculative_tts import SpeculativeSpeech
+from .chunk_audio_store import StoryChunkAudioStore
+from .prefetch_scheduler import StoryPrefetchScheduler, audio_duration_seconds
 from .conversation_agent import ConversationAgent  
 from .content_agent import ContentAgent
 from .enhanced_content_agent import EnhancedContentAgent
@@ -25,6 +32,17 @@ logger = logging.getLogger(__name__)
 class OrchestratorAgent:
     """Main orchestrator that coordinates all sub-agents with emotional intelligence"""
     
+    # Fixed replies - pre-rendered into the audio bank (python -m agents.audio_bank)
+    CANNED_REPLIES = {
+        "wake_ack": "Hi there! How can I help you today?",
+        "mic_locked": "Let me listen for a moment... 🤫",
+        "rate_limited": "You're so chatty today! Let's take a little pause and then keep talking. 😊",
+        "break_suggestion": "We've been chatting for a while! How about taking a little break? You could stretch, drink some water, or play outside for a bit. I'll be here when you come back! 🌟",
+        "trouble": "I'm having trouble understanding right now. Can you try again?",
+        "no_speech": "I didn't catch that. Could you please repeat?",
+        "safety_redirect": "Let's talk about something else! What would you like to know?"
+    }
+    
     def __init__(self, db, gemini_api_key: str, deepgram_api_key: str):
         self.db = db
         self.session_store = {}
@@ -34,14 +52,23 @@ class OrchestratorAgent:
         self.audio_interrupt_flags = {}  # Track interrupt requests per session
         
         # Task management for background operations
-        self.background_tasks = {}  # Track background TTS tasks for cancellation
+        self.cancellation = SessionCancellationRegistry()  # Per-session turn scopes, cancelled on barge-in
         self.active_sessions = {}   # Track active sessions and their operations
-        self.chunk_requests = {}    # Deduplicate chunk TTS requests
+        self.chunk_audio = StoryChunkAudioStore()  # Story chunk audio shared by prefetch and /stories/chunk-tts
+        self.story_prefetch: Dict[str, StoryPrefetchScheduler] = {}  # Playback-paced story prefetch per session
+        self.story_texts: Dict[str, Dict[str, Any]] = {}  # Current story per session - chunks still being written after the response
+        
+        # Shared keep-alive connection pool for all Deepgram TTS/STT traffic (opened in initialize)
+        self.http_pool = get_deepgram_pool()
+        
+        # LLM gateway: the global LLM concurrency budget, timeouts and metrics, shared by every sub-agent
+        self.llm_gateway = get_llm_gateway()
         
         # Initialize all sub-agents
-        self.voice_agent = VoiceAgent(deepgram_api_key)  # Simplified - no MongoDB dependency
+        self.voice_agent = VoiceAgent(deepgram_api_key, http_pool=self.http_pool)  # Simplified - no MongoDB dependency
         self.conversation_agent = ConversationAgent(gemini_api_key)
         self.conversation_agent.set_database(db)  # Set database reference for story sessions
+        self.conversation_agent.chunk_policy = self.voice_agent.chunk_policy  # Story chunks sized against TTS headroom
         self.content_agent = ContentAgent(db)
         self.enhanced_content_agent = EnhancedContentAgent(db, gemini_api_key)
         self.safety_agent = SafetyAgent()
@@ -62,12 +89,24 @@ class OrchestratorAgent:
     async def initialize(self):
         """Initialize all agents"""
         try:
+            # Open and pre-warm the shared Deepgram connection pool
+            await self.http_pool.start()
+            
             # Initialize voice agent (simplified - no complex setup needed)
             await self.voice_agent.initialize()
             logger.info("✅ Orchestrator initialization completed")
         except Exception as e:
             logger.error(f"❌ Orchestrator initialization error: {str(e)}")
     
+    async def shutdown(self):
+        """Release shared resources on application shutdown"""
+        try:
+            await self.http_pool.close()
+            await self.llm_gateway.close()
+            logger.info("✅ Orchestrator shutdown completed")
+        except Exception as e:
+            logger.error(f"❌ Orchestrator shutdown error: {str(e)}")
+    
     def _is_mic_locked(self, session_id: str) -> bool:
         """Check if microphone is currently locked for this session"""
         if session_id not in self.session_store:
@@ -113,14 +152,8 @@ class OrchestratorAgent:
             # Enhanced: Also set speaking to false immediately to stop audio processing
             self.is_speaking[session_id] = False
             
-            # CRITICAL: Cancel any background TTS tasks for this session
-            if session_id in self.background_tasks:
-                for task in self.background_tasks[session_id]:
-                    if not task.done():
-                        task.cancel()
-                        logger.info(f"🎤 BARGE-IN: Cancelled background task for session {session_id}")
-                # Clear the cancelled tasks
-                self.background_tasks[session_id] = []
+            # CRITICAL: Cancel in-flight LLM/TTS tasks for this session (frees their rate-limit slots)
+            self.cancellation.cancel(session_id, reason="barge-in")
             
             # Clear active session operations
             if session_id in self.active_sessions:
@@ -141,6 +174,54 @@ class OrchestratorAgent:
         self.is_speaking[session_id] = False
         logger.info(f"🎤 BARGE-IN: Interrupt flag cleared for session {session_id} - ready for new audio")
     
+    def _begin_turn(self, session_id: str) -> CancellationScope:
+        """BARGE-IN: a new utterance supersedes everything still running for the session"""
+        if self._is_session_speaking(session_id):
+            logger.info(f"🎤 BARGE-IN DETECTED: Interrupting current audio for session {session_id}")
+            self._request_audio_interrupt(session_id)
+            self._clear_interrupt_flag(session_id)
+        return self.cancellation.begin_turn(session_id)
+    
+    async def _run_turn(self, session_id: str, pipeline, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Run a pipeline coroutine as the session's current turn so the next utterance can cancel it"""
+        if user_profile:
+            self.voice_agent.set_listener_name(user_profile.get('name'))
+        scope = self._begin_turn(session_id)
+        try:
+            return await scope.run(pipeline)
+        except asyncio.CancelledError:
+            if not scope.cancelled:
+                raise  # The request itself was cancelled, not superseded
+            logger.info(f"🛑 Turn {scope.turn} for session {session_id} superseded by newer input")
+            return {"status": "interrupted", "interrupted": True, "error": "Interrupted by newer input"}
+    
+    async def _canned_reply(self, key: str, user_profile: Dict[str, Any], **fields) -> Dict[str, Any]:
+        """A fixed reply with its pre-rendered audio (None when the audio bank does not have it)"""
+        text = self.CANNED_REPLIES[key]
+        audio = await self.voice_agent.banked_audio(text, user_profile.get('voice_personality', 'friendly_companion'))
+        return {"response_text": text, "response_audio": audio, **fields}
+    
+    @staticmethod
+    def _unpack_reply(conversation_result) -> Tuple[str, str]:
+        """(text, content_type) from a conversation agent reply - a bare string or {"text", "content_type"}"""
+        if isinstance(conversation_result, dict):
+            return conversation_result.get("text", str(conversation_result)), conversation_result.get("content_type", "conversation")
+        return str(conversation_result), "conversation"
+    
+    async def _voice_reply(self, text: str, content_type: str, user_profile: Dict[str, Any]) -> Optional[str]:
+        """TTS stage - the one place a generated reply is voiced (shared TTS queue, cache and audio bank)"""
+        personality = user_profile.get('voice_personality', 'friendly_companion')
+        if content_type == "story" or len(text) > 1500:
+            logger.info(f"🎭 Using chunked TTS for {content_type} content")
+            return await self.voice_agent.text_to_speech_chunked(text, personality)
+        return await self.voice_agent.text_to_speech(text, personality)
+    
+    async def interrupt_session(self, session_id: str) -> int:
+        """Explicit barge-in (e.g. speech detected on the streaming channel) - cancel without starting a turn"""
+        self._request_audio_interrupt(session_id)
+        self._clear_interrupt_flag(session_id)
+        return self.cancellation.cancel(session_id, reason="barge-in")
+    
     
     async def _get_conversation_context(self, session_id: str) -> List[Dict[str, Any]]:
         """Get recent conversation context for a session"""
@@ -305,10 +386,7 @@ class OrchestratorAgent:
                 else:
                     # Just acknowledge wake word
                     voice_result.update({
-                        "conversation_response": {
-                            "response_text": "Hi there! How can I help you today?",
-                            "response_audio": None
-                        },
+                        "conversation_response": await self._canned_reply("wake_ack", user_profile),
                         "has_response": True
                     })
                 
@@ -336,14 +414,15 @@ class OrchestratorAgent:
         try:
             user_id = user_profile.get('user_id', 'unknown')
             
+            self.voice_agent.set_listener_name(user_profile.get('name'))
+            
             # Step -1: Check mic lock and interaction limits
             if self._is_mic_locked(session_id):
-                return {
-                    "response_text": "Let me listen for a moment... 🤫",
-                    "response_audio": None,
-                    "content_type": "mic_locked",
-                    "metadata": {"mic_locked": True}
-                }
+                return await self._canned_reply(
+                    "mic_locked", user_profile,
+                    content_type="mic_locked",
+                    metadata={"mic_locked": True}
+                )
             
             # Check interaction limits
             limit_check = self._check_interaction_limits(session_id)
@@ -362,12 +441,11 @@ class OrchestratorAgent:
                     }
                 )
                 
-                return {
-                    "response_text": "You're so chatty today! Let's take a little pause and then keep talking. 😊",
-                    "response_audio": None,
-                    "content_type": "rate_limit",
-                    "metadata": {"rate_limited": True}
-                }
+                return await self._canned_reply(
+                    "rate_limited", user_profile,
+                    content_type="rate_limit",
+                    metadata={"rate_limited": True}
+                )
             
             # Check if we should suggest a break
             if self._should_suggest_break(session_id):
@@ -382,12 +460,11 @@ class OrchestratorAgent:
                     }
                 )
                 
-                return {
-                    "response_text": "We've been chatting for a while! How about taking a little break? You could stretch, drink some water, or play outside for a bit. I'll be here when you come back! 🌟",
-                    "response_audio": None,
-                    "content_type": "break_suggestion",
-                    "metadata": {"break_suggested": True}
-                }
+                return await self._canned_reply(
+                    "break_suggestion", user_profile,
+                    content_type="break_suggestion",
+                    metadata={"break_suggested": True}
+                )
             
             # Increment interaction count
             self._increment_interaction_count(session_id)
@@ -554,23 +631,22 @@ class OrchestratorAgent:
                     }
                 )
                 
-                safety_response = "Let's talk about something else! What would you like to know?"
+                safety_reply = await self._canned_reply(
+                    "safety_redirect", user_profile,
+                    content_type="safety_response",
+                    metadata={"safety_result": safety_result}
+                )
                 
                 # Update memory with safety interaction
                 await self.memory_agent.update_session_memory(session_id, {
                     "user_input": user_input,
-                    "ai_response": safety_response,
+                    "ai_response": safety_reply["response_text"],
                     "emotional_state": emotional_state,
                     "dialogue_mode": "safety",
                     "content_type": "safety_response"
                 })
                 
-                return {
-                    "response_text": safety_response,
-                    "response_audio": None,
-                    "content_type": "safety_response",
-                    "metadata": {"safety_result": safety_result}
-                }
+                return safety_reply
             
             # Step 8: Generate response with dialogue plan and memory context
             conversation_result = await self.conversation_agent.generate_response_with_dialogue_plan(
@@ -578,12 +654,7 @@ class OrchestratorAgent:
             )
             
             # Extract response text and content type
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             logger.info(f"🎯 Content type detected by conversation agent: {detected_content_type}")
             
@@ -664,12 +735,11 @@ class OrchestratorAgent:
             except:
                 pass  # Don't let telemetry errors crash the system
             
-            return {
-                "response_text": "I'm having trouble understanding right now. Can you try again?",
-                "response_audio": None,
-                "content_type": "error_response",
-                "metadata": {"error": str(e)}
-            }
+            return await self._canned_reply(
+                "trouble", user_profile,
+                content_type="error_response",
+                metadata={"error": str(e)}
+            )
     
     async def process_game_interaction(self, session_id: str, user_response: str, user_profile: Dict[str, Any]) -> Dict[str, Any]:
         """Process game interaction"""
@@ -774,7 +844,17 @@ class OrchestratorAgent:
             "active_games": len(self.micro_game_agent.active_games),
             "session_count": len(self.session_store),
             "memory_statistics": self.memory_agent.get_memory_statistics(),
-            "telemetry_statistics": self.telemetry_agent.get_telemetry_statistics()
+            "telemetry_statistics": self.telemetry_agent.get_telemetry_statistics(),
+            "connection_pool": self.http_pool.get_stats(),
+            "llm_gateway": self.llm_gateway.get_stats(),
+            "stt_metrics": self.voice_agent.get_stt_metrics(),
+            "ambient_listening": self.voice_agent.ambient.get_stats(),
+            "cancellation": self.cancellation.get_stats(),
+            "chunk_audio": self.chunk_audio.get_stats(),
+            "response_cache": self.conversation_agent.response_cache.get_stats(),
+            "audio_bank": self.voice_agent.audio_bank.get_stats(),
+            "story_prefetch": {session: scheduler.get_stats() for session, scheduler in self.story_prefetch.items()},
+            "tts_rate_limiter": self.voice_agent.tts_queue.get_stats()
         }
     
     async def start_ambient_listening(self, session_id: str, user_profile: Dict[str, Any]) -> Dict[str, Any]:
@@ -807,6 +887,14 @@ class OrchestratorAgent:
             self.session_store[session_id]["ambient_listening"] = True
             self.session_store[session_id]["user_profile"] = user_profile
             
+            # Banked template replies splice in the child's name - get that clip cached now
+            if user_profile.get('name'):
+                asyncio.create_task(self.voice_agent.text_to_speech(
+                    user_profile['name'],
+                    user_profile.get('voice_personality', 'friendly_companion'),
+                    priority=TTSPriority.PREFETCH
+                ))
+            
             logger.info(f"Ambient listening started for session: {session_id}")
             return result
             
@@ -833,7 +921,7 @@ class OrchestratorAgent:
     async def stop_ambient_listening(self, session_id: str) -> Dict[str, Any]:
         """Stop ambient listening"""
         try:
-            result = await self.voice_agent.stop_ambient_listening()
+            result = await self.voice_agent.stop_ambient_listening(session_id)
             
             # Update session state
             if session_id in self.session_store:
@@ -885,10 +973,7 @@ class OrchestratorAgent:
                 else:
                     # Just acknowledge wake word
                     result.update({
-                        "conversation_response": {
-                            "response_text": "Hi there! How can I help you today?",
-                            "response_audio": None
-                        },
+                        "conversation_response": await self._canned_reply("wake_ack", user_profile),
                         "has_response": True
                     })
                 
@@ -935,11 +1020,7 @@ class OrchestratorAgent:
             safety_result = await self.safety_agent.check_content_safety(command, user_profile.get('age', 5))
             
             if not safety_result.get('is_safe', False):
-                return {
-                    "response_text": "Let's talk about something else! What would you like to know?",
-                    "response_audio": None,
-                    "content_type": "safety_response"
-                }
+                return await self._canned_reply("safety_redirect", user_profile, content_type="safety_response")
             
             # Generate response with context
             response = await self.conversation_agent.generate_response_with_context(
@@ -967,35 +1048,26 @@ class OrchestratorAgent:
             
         except Exception as e:
             logger.error(f"Error processing conversation command: {str(e)}")
-            return {
-                "response_text": "I'm having trouble understanding right now. Can you try again?",
-                "response_audio": None,
-                "content_type": "error_response"
-            }
+            return await self._canned_reply("trouble", user_profile, content_type="error_response")
     
     async def check_conversation_timeout(self, session_id: str) -> Dict[str, Any]:
         """Check and handle conversation timeout"""
         try:
-            result = await self.voice_agent.handle_conversation_timeout()
+            result = await self.voice_agent.handle_conversation_timeout(session_id)
             return result
             
         except Exception as e:
             logger.error(f"Error checking conversation timeout: {str(e)}")
             return {"status": "error", "message": str(e)}
     
-    async def process_voice_input_enhanced(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_voice_input_enhanced(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None) -> Dict[str, Any]:
         """RESTORED: Process voice input through the agent pipeline with enhanced context and memory"""
+        return await self._run_turn(session_id, self._process_voice_input_enhanced(session_id, audio_data, user_profile, transcript), user_profile)
+    
+    async def _process_voice_input_enhanced(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None) -> Dict[str, Any]:
         try:
-            # BARGE-IN DETECTION: Check if we need to interrupt current audio
-            if self._is_session_speaking(session_id):
-                logger.info(f"🎤 BARGE-IN DETECTED: Interrupting current audio for session {session_id}")
-                self._request_audio_interrupt(session_id)
-                # Give a small delay to allow audio to stop
-                await asyncio.sleep(0.1)
-                self._clear_interrupt_flag(session_id)
-            
-            # Step 1: Voice processing (STT)
-            transcript = await self.voice_agent.speech_to_text(audio_data)
+            # Step 1: Voice processing (STT) - skipped when the caller already transcribed this audio
+            transcript = transcript or await self.voice_agent.speech_to_text(audio_data)
             
             if not transcript:
                 return {"error": "Could not understand audio"}
@@ -1022,43 +1094,15 @@ class OrchestratorAgent:
                 memory_context=memory_context
             )
             
-            # Extract response text, content type, and audio
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-                # Check if audio was already generated by conversation agent
-                pre_generated_audio = conversation_result.get("audio_base64", None)
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
-                pre_generated_audio = None
+            # Extract response text and content type
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             # Step 5: Content enhancement
             enhanced_response = await self.content_agent.enhance_response(response, user_profile)
             
-            # Step 6: Use pre-generated audio or generate TTS as fallback
-            if pre_generated_audio and len(pre_generated_audio) > 0:
-                logger.info(f"🎵 Using pre-generated audio from conversation agent - size: {len(pre_generated_audio)}")
-                audio_response = pre_generated_audio
-                # Mark session as speaking for barge-in functionality
-                self._set_speaking_state(session_id, True)
-            else:
-                logger.info(f"🎵 No pre-generated audio, generating TTS for {detected_content_type} content")
-                # Mark session as speaking before TTS generation
-                self._set_speaking_state(session_id, True)
-                
-                # Convert to speech - Use chunked TTS for stories
-                if detected_content_type == "story" or len(enhanced_response['text']) > 1500:
-                    logger.info(f"🎭 Using chunked TTS for {detected_content_type} content")
-                    audio_response = await self.voice_agent.text_to_speech_chunked(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
-                else:
-                    audio_response = await self.voice_agent.text_to_speech(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
+            # Step 6: TTS stage - mark session as speaking for barge-in functionality
+            self._set_speaking_state(session_id, True)
+            audio_response = await self._voice_reply(enhanced_response['text'], detected_content_type, user_profile)
             
             # Log final audio status
             if audio_response and len(audio_response) > 0:
@@ -1114,28 +1158,13 @@ class OrchestratorAgent:
             )
             
             # Extract response text and content type
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             # Step 5: Content enhancement
             enhanced_response = await self.content_agent.enhance_response(response, user_profile)
             
-            # Step 6: Convert to speech - Use chunked TTS for stories
-            if detected_content_type == "story" or len(enhanced_response['text']) > 1500:
-                logger.info(f"🎭 Using chunked TTS for {detected_content_type} content")
-                audio_response = await self.voice_agent.text_to_speech_chunked(
-                    enhanced_response['text'], 
-                    user_profile.get('voice_personality', 'friendly_companion')
-                )
-            else:
-                audio_response = await self.voice_agent.text_to_speech(
-                    enhanced_response['text'], 
-                    user_profile.get('voice_personality', 'friendly_companion')
-                )
+            # Step 6: Convert to speech - chunked TTS for stories
+            audio_response = await self._voice_reply(enhanced_response['text'], detected_content_type, user_profile)
             
             # Step 7: Store conversation and update memory
             await self._store_conversation(session_id, transcript, enhanced_response['text'], user_profile)
@@ -1168,7 +1197,7 @@ class OrchestratorAgent:
             # Wait for STT to complete (needed for next steps)
             transcript = await stt_task
             stt_time = time.time() - start_time
-            logger.info(f"⚡ STT completed in {stt_time:.2f}s: '{transcript[:50]}...'")
+            logger.info(f"⚡ STT completed in {stt_time:.2f}s: '{(transcript or '')[:50]}...'")
             
             if not transcript:
                 return {"error": "Could not understand audio"}
@@ -1201,16 +1230,8 @@ class OrchestratorAgent:
             llm_time = time.time() - llm_start
             logger.info(f"⚡ LLM generation completed in {llm_time:.2f}s")
             
-            # Extract response text, content type, and audio
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-                # Check if audio was already generated by conversation agent
-                pre_generated_audio = conversation_result.get("audio_base64", None)
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
-                pre_generated_audio = None
+            # Extract response text and content type
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             # PARALLEL STAGE 4: Content enhancement + TTS preparation
             tts_start = time.time()
@@ -1219,24 +1240,8 @@ class OrchestratorAgent:
             # Wait for enhancement to complete
             enhanced_response = await enhance_task
             
-            # Use pre-generated audio or generate TTS as fallback
-            if pre_generated_audio and len(pre_generated_audio) > 0:
-                logger.info(f"⚡ Using pre-generated audio from conversation agent - size: {len(pre_generated_audio)}")
-                audio_response = pre_generated_audio
-            else:
-                logger.info(f"⚡ No pre-generated audio, generating OPTIMIZED TTS for {detected_content_type} content")
-                # OPTIMIZED TTS: Use the already-optimized chunked TTS for all long content
-                if detected_content_type == "story" or len(enhanced_response['text']) > 1500:
-                    logger.info(f"🎭 Using OPTIMIZED chunked TTS for {detected_content_type} content")
-                    audio_response = await self.voice_agent.text_to_speech_chunked(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
-                else:
-                    audio_response = await self.voice_agent.text_to_speech(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
+            # TTS stage - chunked TTS for all long content
+            audio_response = await self._voice_reply(enhanced_response['text'], detected_content_type, user_profile)
             
             tts_time = time.time() - tts_start
             logger.info(f"⚡ TTS completed in {tts_time:.2f}s")
@@ -1272,22 +1277,25 @@ class OrchestratorAgent:
             # Auto-fallback to original method
             raise e
 
-    async def process_voice_streaming(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_voice_streaming(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None) -> Dict[str, Any]:
         """ULTRA-LOW LATENCY: Parallel streaming voice processing pipeline"""
+        return await self._run_turn(session_id, self._process_voice_streaming(session_id, audio_data, user_profile, transcript), user_profile)
+    
+    async def _process_voice_streaming(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None) -> Dict[str, Any]:
         try:
             import asyncio
             import time
             start_time = time.time()
             
-            # PARALLEL TASK 1: Start STT with interim results
-            stt_task = asyncio.create_task(self._streaming_stt(audio_data))
+            # PARALLEL TASK 1: Start STT with interim results (unless the caller already transcribed)
+            stt_task = None if transcript else asyncio.create_task(self._streaming_stt(audio_data))
             
             # PARALLEL TASK 2: Prepare context while STT is running
             context_task = asyncio.create_task(self._get_conversation_context(session_id))
             memory_task = asyncio.create_task(self._get_memory_context(user_profile.get('user_id', 'unknown')))
             
             # Get interim STT results for immediate processing
-            partial_transcript = await stt_task
+            partial_transcript = transcript or await stt_task
             
             if not partial_transcript:
                 return {"error": "Could not understand audio"}
@@ -1295,46 +1303,30 @@ class OrchestratorAgent:
             # PARALLEL TASK 3: Start LLM processing with partial transcript
             context, memory_context = await asyncio.gather(context_task, memory_task)
             
-            # Use Gemini 2.0 Flash-Lite for ultra-low latency (<1s)
-            llm_task = asyncio.create_task(self._streaming_llm_response(
-                partial_transcript, user_profile, session_id, context, memory_context
-            ))
-            
-            # PARALLEL TASK 4: Stream response to TTS in chunks
-            response_stream = await llm_task
-            
-            # Start TTS streaming immediately as tokens arrive
-            audio_chunks = []
-            tts_tasks = []
-            
-            async for response_chunk in response_stream:
-                if len(response_chunk.strip()) > 10:  # Meaningful chunk
-                    tts_task = asyncio.create_task(
-                        self.voice_agent.text_to_speech_chunk(response_chunk, user_profile.get('voice_personality', 'friendly_companion'))
-                    )
-                    tts_tasks.append(tts_task)
-            
-            # Gather all TTS chunks
-            audio_chunks = await asyncio.gather(*tts_tasks)
-            
-            # Combine and return
-            combined_audio = self._combine_audio_chunks(audio_chunks)
+            # PARALLEL TASK 4: Sentences go to TTS as the LLM produces them
+            async with self._speculative_speech(user_profile) as speech:
+                speech.start(self.conversation_agent.generate_response_streaming(
+                    partial_transcript, user_profile, session_id, context, memory_context
+                ))
+                response_text = await speech.wait_text()
+                combined_audio = await speech.collect_audio()
             
             total_time = time.time() - start_time
-            logger.info(f"🚀 ULTRA-FAST PIPELINE: {total_time:.2f}s total latency")
+            logger.info(f"🚀 ULTRA-FAST PIPELINE: {total_time:.2f}s total latency (first audio {speech.first_audio_latency or 0:.2f}s)")
             
             return {
                 "transcript": partial_transcript,
-                "response_text": "".join([chunk async for chunk in response_stream]),
+                "response_text": response_text,
                 "response_audio": combined_audio,
                 "latency": f"{total_time:.2f}s",
+                "first_audio_latency": f"{speech.first_audio_latency or 0:.2f}s",
                 "pipeline": "streaming"
             }
             
         except Exception as e:
             logger.error(f"Streaming pipeline error: {str(e)}")
-            # Fallback to regular processing
-            return await self.process_voice_input_enhanced(session_id, audio_data, user_profile)
+            # Fallback to regular processing (same turn - do not cancel ourselves)
+            return await self._process_voice_input_enhanced(session_id, audio_data, user_profile, transcript=transcript)
     
     async def _streaming_stt(self, audio_data: bytes) -> str:
         """Enhanced STT with interim results"""
@@ -1345,28 +1337,21 @@ class OrchestratorAgent:
             logger.error(f"Streaming STT error: {str(e)}")
             return await self.voice_agent.speech_to_text(audio_data)
     
-    async def _streaming_llm_response(self, text: str, user_profile: Dict[str, Any], session_id: str, context: List, memory_context: Dict):
-        """Stream LLM response with Gemini 2.0 Flash-Lite"""
-        try:
-            # Use the fastest model variant
-            response = await self.conversation_agent.generate_response_streaming(
-                text, user_profile, session_id, context, memory_context
-            )
-            return response
-        except Exception as e:
-            logger.error(f"Streaming LLM error: {str(e)}")
-            # Fallback to regular response
-            fallback_result = await self.conversation_agent.generate_response_with_dialogue_plan(
-                text, user_profile, session_id, context, {}, memory_context
-            )
-            # Handle new return format
-            if isinstance(fallback_result, dict):
-                return fallback_result.get("text", str(fallback_result))
-            return str(fallback_result)
+    def _speculative_speech(self, user_profile: Dict[str, Any], on_text: Callable[[int, str], None] = None) -> SpeculativeSpeech:
+        """Sentence-level TTS pipeline with the conversation agent's age filter applied per sentence"""
+        age = user_profile.get('age', 7)
+        return SpeculativeSpeech(
+            self.voice_agent,
+            user_profile.get('voice_personality', 'friendly_companion'),
+            transform=lambda sentence: self.conversation_agent.enforce_age_appropriate_language(sentence, age, "conversation"),
+            on_text=on_text
+        )
     
-    async def process_text_input(self, session_id: str, text: str, user_profile: Dict[str, Any], content_type: str = None) -> Dict[str, Any]:
-        """Process text input through the agent pipeline with enhanced context and memory"""
+    async def process_text_input(self, session_id: str, text: str, user_profile: Dict[str, Any], content_type: str = None, text_only: bool = False) -> Dict[str, Any]:
+        """Process text input through the agent pipeline with enhanced context and memory (text_only skips the TTS stage)"""
         try:
+            self.voice_agent.set_listener_name(user_profile.get('name'))
+            
             # Step 1: Safety check with empathetic guidance
             safety_result = await self.safety_agent.check_content_safety(text, user_profile.get('age', 5))
             
@@ -1377,6 +1362,9 @@ class OrchestratorAgent:
                     logger.info(f"🛡️ Providing empathetic guidance for inappropriate language")
                     return {
                         "response_text": educational_response,
+                        "response_audio": await self.voice_agent.banked_audio(
+                            educational_response, user_profile.get('voice_personality', 'friendly_companion')
+                        ),
                         "content_type": "guidance",
                         "metadata": {"safety_guidance": True, "empathetic_response": True}
                     }
@@ -1393,7 +1381,12 @@ class OrchestratorAgent:
             context = await self._get_conversation_context(session_id)
             memory_context = await self._get_memory_context(user_profile.get('user_id', 'unknown'))
             
+            # Plain conversation turns stream into sentence-level TTS like the voice pipeline
+            if not text_only and self.conversation_agent.streams_as_conversation(text, session_id, context):
+                return await self._stream_text_reply(session_id, text, user_profile, context, memory_context)
+            
             # Step 3: Generate response with full context - WITH TIMEOUT PROTECTION
+            generation_start = time.time()
             try:
                 conversation_result = await asyncio.wait_for(
                     self.conversation_agent.generate_response_with_dialogue_plan(
@@ -1413,44 +1406,31 @@ class OrchestratorAgent:
                     "content_type": "timeout_response",
                     "metadata": {"timeout_occurred": True}
                 }
+            generation_time = time.time() - generation_start
             
-            # Extract response text, content type, and audio
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-                # Check if audio was already generated by conversation agent
-                pre_generated_audio = conversation_result.get("audio_base64", None)
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
-                pre_generated_audio = None
+            # Extract response text and content type
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
-            # Step 4: Content enhancement
-            enhanced_response = await self.content_agent.enhance_response(response, user_profile)
+            # Step 4: TTS stage starts right away - content enhancement never rewrites the text,
+            # so synthesis does not wait for it
+            tts_start = time.time()
+            tts_task = None
+            if not text_only:
+                tts_task = asyncio.create_task(self._voice_reply(response, detected_content_type, user_profile))
             
-            # Step 5: Use pre-generated audio or generate TTS as fallback
-            if pre_generated_audio and len(pre_generated_audio) > 0:
-                logger.info(f"🎵 Using pre-generated audio from conversation agent - size: {len(pre_generated_audio)}")
-                audio_response = pre_generated_audio
-            else:
-                logger.info(f"🎵 No pre-generated audio, generating TTS for {detected_content_type} content")
-                # Use chunked TTS for story narrations or long content
-                if detected_content_type == "story" or len(enhanced_response['text']) > 1500:
-                    logger.info(f"🎭 Using chunked TTS for {detected_content_type} content")
-                    audio_response = await self.voice_agent.text_to_speech_chunked(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
-                else:
-                    audio_response = await self.voice_agent.text_to_speech(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
+            # Step 5: Content enhancement while the audio is synthesizing
+            try:
+                enhanced_response = await self.content_agent.enhance_response(response, user_profile)
+                audio_response = await tts_task if tts_task else None
+            finally:
+                if tts_task and not tts_task.done():
+                    tts_task.cancel()
+            tts_time = time.time() - tts_start if tts_task else 0.0
             
             # Log final audio status
             if audio_response and len(audio_response) > 0:
                 logger.info(f"🎵 Final audio ready - size: {len(audio_response)}")
-            else:
+            elif not text_only:
                 logger.error("🎵 CRITICAL: No audio response generated!")
             
             # Step 6: Store conversation and update memory
@@ -1461,7 +1441,12 @@ class OrchestratorAgent:
                 "response_text": enhanced_response['text'],
                 "response_audio": audio_response,
                 "content_type": detected_content_type,  # Use the properly detected content type
-                "metadata": enhanced_response.get('metadata', {})
+                "metadata": {
+                    **enhanced_response.get('metadata', {}),
+                    "text_only": text_only,
+                    "generation_time": round(generation_time, 3),
+                    "tts_time": round(tts_time, 3)
+                }
             }
             
         except Exception as e:
@@ -1471,6 +1456,48 @@ class OrchestratorAgent:
                 "response_text": "Sorry, I had trouble understanding that. Can you try again? 😊"
             }
 
+    async def _stream_text_reply(self, session_id: str, text: str, user_profile: Dict[str, Any], context: List[Dict[str, Any]],
+                                 memory_context: Dict[str, Any]) -> Dict[str, Any]:
+        """process_text_input for a plain conversation turn: the first sentence is
+        synthesizing while the model is still writing the rest"""
+        generation_start = time.time()
+        async with self._speculative_speech(user_profile) as speech:
+            speech.start(self.conversation_agent.generate_response_streaming(
+                text, user_profile, session_id, context, memory_context
+            ))
+            response = await speech.wait_text()
+            generation_time = time.time() - generation_start
+            
+            # Content enhancement never rewrites the text - it runs while the last sentences synthesize
+            tts_start = time.time()
+            enhanced_response, audio_response = await asyncio.gather(
+                self.content_agent.enhance_response(response, user_profile),
+                speech.collect_audio()
+            )
+        tts_time = time.time() - tts_start  # TTS left over after generation finished
+        
+        if audio_response:
+            logger.info(f"🎵 Final audio ready - size: {len(audio_response)}, first audio {speech.first_audio_latency or 0:.2f}s")
+        else:
+            logger.error("🎵 CRITICAL: No audio response generated!")
+        
+        await self._store_conversation(session_id, text, enhanced_response['text'], user_profile)
+        await self._update_memory(session_id, text, enhanced_response['text'], user_profile)
+        
+        return {
+            "response_text": enhanced_response['text'],
+            "response_audio": audio_response,
+            "content_type": "conversation",
+            "metadata": {
+                **enhanced_response.get('metadata', {}),
+                "text_only": False,
+                "generation_time": round(generation_time, 3),
+                "tts_time": round(tts_time, 3),
+                "first_audio_latency": round(speech.first_audio_latency or 0.0, 3),
+                "pipeline": "speculative_text"
+            }
+        }
+
     async def _process_text_input_original(self, session_id: str, text: str, user_profile: Dict[str, Any], content_type: str = None) -> Dict[str, Any]:
         """ORIGINAL METHOD: Preserved as fallback - exactly as it was"""
         try:
@@ -1498,12 +1525,7 @@ class OrchestratorAgent:
             )
             
             # Extract response text and content type
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             # Step 4: Content enhancement
             enhanced_response = await self.content_agent.enhance_response(response, user_profile)
@@ -1578,16 +1600,8 @@ class OrchestratorAgent:
             llm_time = time.time() - llm_start
             logger.info(f"⚡ LLM generation completed in {llm_time:.2f}s")
             
-            # Extract response text, content type, and audio
-            if isinstance(conversation_result, dict):
-                response = conversation_result.get("text", str(conversation_result))
-                detected_content_type = conversation_result.get("content_type", "conversation")
-                # Check if audio was already generated by conversation agent
-                pre_generated_audio = conversation_result.get("audio_base64", None)
-            else:
-                response = str(conversation_result)
-                detected_content_type = "conversation"
-                pre_generated_audio = None
+            # Extract response text and content type
+            response, detected_content_type = self._unpack_reply(conversation_result)
             
             # PARALLEL STAGE 3: Content enhancement + TTS processing
             tts_start = time.time()
@@ -1596,24 +1610,8 @@ class OrchestratorAgent:
             # Wait for enhancement
             enhanced_response = await enhance_task
             
-            # Use pre-generated audio or generate TTS as fallback
-            if pre_generated_audio and len(pre_generated_audio) > 0:
-                logger.info(f"⚡ Using pre-generated audio from conversation agent - size: {len(pre_generated_audio)}")
-                audio_response = pre_generated_audio
-            else:
-                logger.info(f"⚡ No pre-generated audio, generating OPTIMIZED TTS for {detected_content_type} content")
-                # OPTIMIZED TTS: Use the already-optimized chunked TTS for all long content
-                if detected_content_type == "story" or len(enhanced_response['text']) > 1500:
-                    logger.info(f"🎭 Using OPTIMIZED chunked TTS for {detected_content_type} content")
-                    audio_response = await self.voice_agent.text_to_speech_chunked(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
-                else:
-                    audio_response = await self.voice_agent.text_to_speech(
-                        enhanced_response['text'], 
-                        user_profile.get('voice_personality', 'friendly_companion')
-                    )
+            # TTS stage - chunked TTS for all long content
+            audio_response = await self._voice_reply(enhanced_response['text'], detected_content_type, user_profile)
             
             tts_time = time.time() - tts_start
             logger.info(f"⚡ Enhancement + TTS completed in {tts_time:.2f}s")
@@ -1722,7 +1720,13 @@ class OrchestratorAgent:
             telemetry_summary = await self.telemetry_agent.end_session(session_id)
             
             # Stop ambient listening
-            await self.voice_agent.stop_ambient_listening()
+            await self.voice_agent.stop_ambient_listening(session_id)
+            
+            # Cancel anything still running for the session
+            self.cancellation.discard(session_id)
+            self.chunk_audio.discard(session_id)
+            self.story_prefetch.pop(session_id, None)
+            self.story_texts.pop(session_id, None)
             
             # Remove from session store
             if session_id in self.session_store:
@@ -1758,8 +1762,16 @@ class OrchestratorAgent:
     # NEW ULTRA-LOW LATENCY PIPELINE METHODS (ADDED - NO EXISTING METHODS MODIFIED)
     # ========================================================================
     
-    async def process_story_streaming(self, session_id: str, user_input: str, user_profile: Dict[str, Any], context: List[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """NEW: Process story requests with chunked streaming for progressive display and audio"""
+    async def process_story_streaming(self, session_id: str, user_input: str, user_profile: Dict[str, Any], context: List[Dict[str, Any]] = None,
+                                      emit: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
+        """NEW: Process story requests with chunked streaming for progressive display and audio.
+
+        emit(event) receives the pipeline events stream_story_events() delivers.
+        """
+        return await self._run_turn(session_id, self._process_story_streaming(session_id, user_input, user_profile, context, emit), user_profile)
+    
+    async def _process_story_streaming(self, session_id: str, user_input: str, user_profile: Dict[str, Any], context: List[Dict[str, Any]] = None,
+                                       emit: Callable[[Dict[str, Any]], None] = None) -> Dict[str, Any]:
         try:
             import time
             start_time = time.time()
@@ -1775,47 +1787,93 @@ class OrchestratorAgent:
                     "message": "Let's talk about something else!"
                 }
             
-            # STAGE 2: Generate story with streaming chunks
-            story_result = await self.conversation_agent.generate_story_with_streaming(
-                user_input, user_profile, session_id, context
-            )
-            
-            if story_result.get("status") == "error":
-                return story_result
-            
-            chunks = story_result.get("chunks", [])
-            if not chunks:
+            # STAGE 2: Story chunks stream in - the instant opening first, the LLM continuation behind it
+            story_stream = self.conversation_agent.stream_story(user_input, user_profile, session_id, context)
+            try:
+                first_chunk = await story_stream.__anext__()
+            except StopAsyncIteration:
                 return {"status": "error", "error": "No story chunks generated"}
             
-            # STAGE 3: Get first chunk for immediate response (<5s target)
-            first_chunk = chunks[0]
-            
             logger.info(f"🚀 FIRST CHUNK READY: {first_chunk['word_count']} words in {time.time() - start_time:.2f}s")
+            emit = emit or (lambda event: None)
+            emit(self._story_segment_event(first_chunk))
+            
+            # STAGE 3: The rest of the story keeps streaming while the first chunk is voiced;
+            # every later chunk goes to the background prefetch as soon as it is segmented
+            scope = self.cancellation.current(session_id)
+            remaining_chunks = []
+            scheduler = None
+            first_chunk_time = None
+            
+            async def collect_story() -> None:
+                try:
+                    async for chunk in story_stream:
+                        remaining_chunks.append(chunk)
+                        emit(self._story_segment_event(chunk))
+                        if scheduler is not None:
+                            scheduler.add_chunks([chunk])
+                    chunks = [first_chunk] + remaining_chunks
+                    emit({
+                        "type": "text_complete",
+                        "total_chunks": len(chunks),
+                        "total_words": sum(chunk["word_count"] for chunk in chunks),
+                        "story_session_id": first_chunk.get("story_session_id"),
+                        "first_chunk_latency": round(first_chunk_time, 3) if first_chunk_time is not None else None,
+                        "total_latency": round(time.time() - start_time, 3)
+                    })
+                finally:
+                    await story_stream.aclose()
+                    if scheduler is not None:
+                        scheduler.no_more_chunks()
+            
+            def store_story(task: asyncio.Task) -> None:
+                # Only a story that finished writing goes into the conversation history
+                if task.cancelled() or task.exception() is not None:
+                    return
+                full_story_text = " ".join(chunk["text"] for chunk in [first_chunk] + remaining_chunks)
+                asyncio.create_task(self._store_conversation(session_id, user_input, full_story_text, user_profile))
+            
+            story_task = scope.spawn(collect_story(), name=f"story-text-{session_id}")
+            story_task.add_done_callback(store_story)
+            self.story_texts[session_id] = {"first_chunk": first_chunk, "remaining_chunks": remaining_chunks, "task": story_task}
             
             # STAGE 4: Generate TTS for first chunk immediately
             tts_start = time.time()
             
-            first_chunk_tts = await self.voice_agent.text_to_speech(
-                first_chunk["text"],
-                user_profile.get('voice_personality', 'friendly_companion')
+            # Through the chunk audio store, so the event stream can hand out a URL for it
+            first_synthesis, _ = self.chunk_audio.get_or_start(
+                self._chunk_audio_owners(session_id, user_profile), first_chunk["chunk_id"], first_chunk["text"],
+                lambda: scope.spawn(self.voice_agent.text_to_speech(
+                    first_chunk["text"],
+                    user_profile.get('voice_personality', 'friendly_companion')
+                ), name=f"story-chunk-{first_chunk['chunk_id']}")
             )
+            first_chunk_tts = await first_synthesis
             
             tts_time = time.time() - tts_start
-            total_time = time.time() - start_time
-            
-            logger.info(f"✅ FIRST CHUNK TTS: {tts_time:.2f}s, total: {total_time:.2f}s")
+            first_chunk_time = time.time() - start_time
             
-            # STAGE 5: Start background parallel processing for remaining chunks (LATENCY OPTIMIZATION)
-            remaining_chunks = chunks[1:] if len(chunks) > 1 else []
+            logger.info(f"✅ FIRST CHUNK TTS: {tts_time:.2f}s, total: {first_chunk_time:.2f}s")
+            emit(self._story_audio_event(session_id, first_chunk["chunk_id"], first_chunk_tts))
             
-            # Start background TTS generation for remaining chunks in parallel
-            if remaining_chunks:
-                logger.info(f"🚀 PARALLEL TTS: Starting background processing for {len(remaining_chunks)} remaining chunks")
-                asyncio.create_task(self._preprocess_remaining_chunks_tts(remaining_chunks, user_profile, session_id))
+            # STAGE 5: Background prefetch paced by playback - takes the chunks written so far
+            # and the rest as they arrive
+            scheduler = self._new_story_prefetch(
+                list(remaining_chunks), user_profile, session_id,
+                playing_chunk_id=first_chunk["chunk_id"], first_chunk_audio=first_chunk_tts,
+                more_chunks=not story_task.done(), emit=emit
+            )
+            logger.info(f"🚀 PARALLEL TTS: Starting background processing ({len(remaining_chunks)} chunks written so far)")
+            prefetch = scope.spawn(
+                self._preprocess_remaining_chunks_tts(remaining_chunks, user_profile, session_id, scheduler=scheduler),
+                name=f"story-prefetch-{session_id}"
+            )
+            # The event stream ends with the prefetch - also when a barge-in cancels it before it starts
+            prefetch.add_done_callback(lambda task: emit(self._story_done_event(task)))
             
-            # Store conversation in background
-            full_story_text = " ".join(chunk["text"] for chunk in chunks)
-            asyncio.create_task(self._store_conversation(session_id, user_input, full_story_text, user_profile))
+            # Answer with what is written so far; the rest arrives as segment events, through
+            # get_story_chunks() and as chunk audio from the store
+            written = [first_chunk] + remaining_chunks
             
             return {
                 "status": "streaming",
@@ -1823,23 +1881,19 @@ class OrchestratorAgent:
                 "first_chunk": {
                     "text": first_chunk["text"],
                     "audio_base64": first_chunk_tts,
-                    "chunk_id": 0,
+                    "chunk_id": first_chunk["chunk_id"],
                     "word_count": first_chunk["word_count"]
                 },
-                "remaining_chunks": [
-                    {
-                        "text": chunk["text"],
-                        "chunk_id": chunk["chunk_id"],
-                        "word_count": chunk["word_count"]
-                    } for chunk in remaining_chunks
-                ],
-                "total_chunks": len(chunks),
-                "total_words": story_result.get("total_words", 0),
+                "remaining_chunks": [self._story_chunk_summary(chunk) for chunk in remaining_chunks],
+                "total_chunks": len(written),
+                "total_words": sum(chunk["word_count"] for chunk in written),
+                "more_chunks": not story_task.done(),
+                "text_complete": self._story_text_complete(story_task),
                 "content_type": "story",
                 "metadata": {
-                    "total_latency": f"{total_time:.2f}s",
+                    "total_latency": f"{time.time() - start_time:.2f}s",
                     "pipeline": "story_streaming",
-                    "first_chunk_latency": f"{total_time:.2f}s"
+                    "first_chunk_latency": f"{first_chunk_time:.2f}s"
                 }
             }
             
@@ -1848,45 +1902,48 @@ class OrchestratorAgent:
             return {"status": "error", "error": "Story streaming failed"}
 
     async def process_story_chunk_tts(self, chunk_text: str, chunk_id: int, user_profile: Dict[str, Any], session_id: str = None) -> Dict[str, Any]:
-        """Generate TTS for individual story chunk with deduplication and interruption support"""
+        """TTS for an individual story chunk - served from the chunk audio store, synthesized at most once per chunk"""
         try:
-            # Create deduplication key
-            user_id = user_profile.get('id', user_profile.get('user_id', 'unknown'))
-            dedup_key = f"{user_id}_{chunk_id}_{hash(chunk_text) % 10000}"
-            
-            # Check if this chunk is already being processed or session is interrupted
+            # Check if the session is interrupted
             if session_id and self._should_interrupt_audio(session_id):
                 logger.info(f"🎤 CHUNK TTS: Session {session_id} interrupted, skipping chunk {chunk_id}")
                 return {"status": "interrupted", "chunk_id": chunk_id, "message": "Session interrupted"}
             
-            # Check for duplicate request
-            if dedup_key in self.chunk_requests:
-                request_time = self.chunk_requests[dedup_key]
-                # If recent request (within 10 seconds), return cached or skip
-                if time.time() - request_time < 10:
-                    logger.info(f"🔄 CHUNK TTS: Duplicate request detected for chunk {chunk_id}, skipping")
-                    return {"status": "duplicate", "chunk_id": chunk_id, "message": "Duplicate request skipped"}
-            
-            # Mark this request as being processed
-            self.chunk_requests[dedup_key] = time.time()
+            if session_id:
+                # The client asks for a chunk as the one before it starts playing
+                self.report_story_playback(session_id, chunk_id - 1)
             
-            logger.info(f"🎵 CHUNK TTS: Processing chunk {chunk_id}")
-            
-            audio_base64 = await self.voice_agent.text_to_speech(
-                chunk_text,
-                user_profile.get('voice_personality', 'friendly_companion')
+            def start_synthesis() -> asyncio.Future:
+                chunk_synthesis = self.voice_agent.text_to_speech(
+                    chunk_text,
+                    user_profile.get('voice_personality', 'friendly_companion')
+                )
+                if session_id:
+                    # Part of the session's current turn - a barge-in cancels it and frees the TTS slot
+                    return self.cancellation.current(session_id).spawn(chunk_synthesis, name=f"story-chunk-{chunk_id}")
+                return asyncio.ensure_future(chunk_synthesis)
+            
+            # Background prefetch (or an earlier duplicate request) may already own this chunk
+            synthesis, source = self.chunk_audio.get_or_start(
+                self._chunk_audio_owners(session_id, user_profile), chunk_id, chunk_text, start_synthesis
             )
+            logger.info(f"🎵 CHUNK TTS: Chunk {chunk_id} {source}")
             
-            # Clean up old requests (keep only last 5 minutes)
-            current_time = time.time()
-            self.chunk_requests = {k: v for k, v in self.chunk_requests.items() if current_time - v < 300}
+            try:
+                # Shielded: a dropped HTTP request must not cancel synthesis other requests share
+                audio_base64 = await asyncio.shield(synthesis)
+            except asyncio.CancelledError:
+                if not synthesis.cancelled():
+                    raise
+                return {"status": "interrupted", "chunk_id": chunk_id, "message": "Session interrupted"}
             
             if audio_base64:
                 return {
                     "status": "success",
                     "chunk_id": chunk_id,
                     "audio_base64": audio_base64,
-                    "audio_length": len(audio_base64)
+                    "audio_length": len(audio_base64),
+                    "source": source
                 }
             else:
                 return {"status": "error", "chunk_id": chunk_id, "error": "TTS generation failed"}
@@ -1895,104 +1952,285 @@ class OrchestratorAgent:
             logger.error(f"❌ Chunk TTS error: {str(e)}")
             return {"status": "error", "chunk_id": chunk_id, "error": str(e)}
 
-    async def _preprocess_remaining_chunks_tts(self, remaining_chunks: List[Dict], user_profile: Dict[str, Any], session_id: str):
-        """Background parallel TTS generation for remaining story chunks with interruption support"""
+    def _chunk_audio_owners(self, session_id: Optional[str], user_profile: Dict[str, Any]) -> List[str]:
+        """Store owners for story chunk audio - the chunk endpoint may identify by session or only by user"""
+        user_id = user_profile.get('id', user_profile.get('user_id'))
+        return [owner for owner in (session_id, f"user:{user_id}" if user_id else None) if owner]
+
+    def _new_story_prefetch(self, remaining_chunks: List[Dict], user_profile: Dict[str, Any], session_id: str,
+                            playing_chunk_id: int = 0, first_chunk_audio: Optional[str] = None,
+                            more_chunks: bool = False, emit: Callable[[Dict[str, Any]], None] = None) -> StoryPrefetchScheduler:
+        """Playback-paced prefetch for a story's remaining chunks, registered for playback reports"""
+        scope = self.cancellation.current(session_id)
+        owners = self._chunk_audio_owners(session_id, user_profile)
+        
+        async def synthesize(chunk: Dict[str, Any]) -> Optional[str]:
+            chunk_id = chunk.get("chunk_id", 0)
+            chunk_text = chunk.get("text", "")
+            
+            # Prefetch lane (never starves first audio) into the chunk audio store, unless
+            # the chunk endpoint already asked for this chunk
+            synthesis, source = self.chunk_audio.get_or_start(
+                owners, chunk_id, chunk_text,
+                lambda: scope.spawn(self.voice_agent.text_to_speech(
+                    chunk_text,
+                    user_profile.get('voice_personality', 'friendly_companion'),
+                    priority=TTSPriority.PREFETCH
+                ), name=f"story-chunk-{chunk_id}")
+            )
+            if source != "started":
+                logger.info(f"🔄 BACKGROUND TTS: Chunk {chunk_id} already {source} via chunk endpoint")
+            # Shielded: stopping the scheduler must not cancel a synthesis the chunk endpoint shares
+            audio_base64 = await asyncio.shield(synthesis)
+            if emit:
+                emit(self._story_audio_event(session_id, chunk_id, audio_base64))
+            return audio_base64
+        
+        scheduler = StoryPrefetchScheduler(
+            session_id, remaining_chunks, synthesize,
+            playing_chunk_id=playing_chunk_id,
+            playing_duration=audio_duration_seconds(first_chunk_audio),
+            more_chunks=more_chunks
+        )
+        self.story_prefetch[session_id] = scheduler
+        return scheduler
+
+    async def _preprocess_remaining_chunks_tts(self, remaining_chunks: List[Dict], user_profile: Dict[str, Any], session_id: str,
+                                               playing_chunk_id: int = 0, first_chunk_audio: Optional[str] = None,
+                                               scheduler: Optional[StoryPrefetchScheduler] = None):
+        """Background TTS for the remaining story chunks, paced by the client's playback position"""
         try:
-            logger.info(f"🚀 BACKGROUND TTS: Starting parallel processing for {len(remaining_chunks)} chunks")
-            
-            # Initialize task tracking for this session
-            if session_id not in self.background_tasks:
-                self.background_tasks[session_id] = []
-            
-            # Process up to 3 chunks in parallel to avoid overwhelming the TTS API
-            semaphore = asyncio.Semaphore(3)
-            
-            async def process_single_chunk(chunk):
-                async with semaphore:
-                    try:
-                        # Check if session has been interrupted
-                        if self._should_interrupt_audio(session_id):
-                            logger.info(f"🎤 BACKGROUND TTS: Session {session_id} interrupted, skipping chunk {chunk.get('chunk_id', '?')}")
-                            return {"chunk_id": chunk.get("chunk_id", 0), "success": False, "interrupted": True}
-                        
-                        chunk_id = chunk.get("chunk_id", 0)
-                        chunk_text = chunk.get("text", "")
-                        
-                        logger.info(f"🎵 BACKGROUND TTS: Processing chunk {chunk_id}")
-                        
-                        # Generate TTS in background
-                        audio_base64 = await self.voice_agent.text_to_speech(
-                            chunk_text,
-                            user_profile.get('voice_personality', 'friendly_companion')
-                        )
-                        
-                        # Check again after TTS generation
-                        if self._should_interrupt_audio(session_id):
-                            logger.info(f"🎤 BACKGROUND TTS: Session {session_id} interrupted after TTS, discarding chunk {chunk_id}")
-                            return {"chunk_id": chunk_id, "success": False, "interrupted": True}
-                        
-                        if audio_base64:
-                            logger.info(f"✅ BACKGROUND TTS: Chunk {chunk_id} ready ({len(audio_base64)} chars)")
-                            return {"chunk_id": chunk_id, "audio_base64": audio_base64, "success": True}
-                        else:
-                            logger.warning(f"⚠️ BACKGROUND TTS: Chunk {chunk_id} failed")
-                            return {"chunk_id": chunk_id, "success": False}
-                            
-                    except asyncio.CancelledError:
-                        logger.info(f"🎤 BACKGROUND TTS: Chunk {chunk.get('chunk_id', '?')} cancelled due to interruption")
-                        return {"chunk_id": chunk.get("chunk_id", 0), "success": False, "cancelled": True}
-                    except Exception as chunk_error:
-                        logger.error(f"❌ BACKGROUND TTS: Error processing chunk {chunk.get('chunk_id', '?')}: {str(chunk_error)}")
-                        return {"chunk_id": chunk.get("chunk_id", 0), "success": False}
-            
-            # Process all remaining chunks in parallel (with semaphore limiting)
-            tasks = [asyncio.create_task(process_single_chunk(chunk)) for chunk in remaining_chunks]
-            
-            # Track tasks for potential cancellation
-            self.background_tasks[session_id].extend(tasks)
+            if scheduler is None:
+                scheduler = self._new_story_prefetch(remaining_chunks, user_profile, session_id, playing_chunk_id, first_chunk_audio)
+            logger.info(f"🚀 BACKGROUND TTS: Scheduling {len(scheduler.chunks)} chunks against playback")
             
             try:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                stats = await scheduler.run()
             except asyncio.CancelledError:
-                logger.info(f"🎤 BACKGROUND TTS: All tasks cancelled for session {session_id}")
-                return {"status": "cancelled", "completed_chunks": 0}
-            
-            # Remove completed tasks from tracking
-            self.background_tasks[session_id] = [t for t in self.background_tasks[session_id] if not t.done()]
-            
-            successful_chunks = sum(1 for result in results if isinstance(result, dict) and result.get("success", False))
-            interrupted_chunks = sum(1 for result in results if isinstance(result, dict) and (result.get("interrupted", False) or result.get("cancelled", False)))
-            
-            if interrupted_chunks > 0:
-                logger.info(f"🎤 BACKGROUND TTS: {interrupted_chunks} chunks interrupted/cancelled for session {session_id}")
-                return {"status": "interrupted", "completed_chunks": successful_chunks}
+                logger.info(f"🎤 BACKGROUND TTS: Story prefetch cancelled for session {session_id}")
+                return {"status": "cancelled", "completed_chunks": scheduler.stats["completed"]}
+            finally:
+                if self.story_prefetch.get(session_id) is scheduler:
+                    del self.story_prefetch[session_id]
             
-            logger.info(f"🎉 BACKGROUND TTS COMPLETE: {successful_chunks}/{len(remaining_chunks)} chunks processed successfully")
-            return {"status": "success", "completed_chunks": successful_chunks, "results": results}
+            logger.info(f"🎉 BACKGROUND TTS DONE ({stats['stopped']}): {stats['completed']}/{len(scheduler.chunks)} chunks synthesized")
+            return {"status": "success", "completed_chunks": stats["completed"], "scheduler": stats}
             
         except Exception as e:
             logger.error(f"❌ Background TTS processing error: {str(e)}")
             return {"status": "error", "error": str(e)}
 
-    async def process_voice_input_fast(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any]) -> Dict[str, Any]:
-        """NEW FAST PIPELINE: Ultra-low latency voice processing (< 3 seconds target)"""
+    async def get_story_chunks(self, session_id: str, after_chunk_id: int = -1, wait_seconds: float = 0.0) -> Dict[str, Any]:
+        """Chunks of the session's current story after `after_chunk_id` - the text written since the
+        story response. With wait_seconds, waits up to that long for the story to finish writing."""
+        story = self.story_texts.get(session_id)
+        if story is None:
+            return {"status": "idle", "session_id": session_id}
+        story_task = story["task"]
+        if wait_seconds and not story_task.done():
+            await asyncio.wait({story_task}, timeout=wait_seconds)
+        chunks = [story["first_chunk"]] + story["remaining_chunks"]
+        return {
+            "status": "success",
+            "session_id": session_id,
+            "story_session_id": story["first_chunk"].get("story_session_id"),
+            "chunks": [self._story_chunk_summary(chunk) for chunk in chunks if chunk["chunk_id"] > after_chunk_id],
+            "more_chunks": not story_task.done(),
+            "text_complete": self._story_text_complete(story_task)
+        }
+
+    def report_story_playback(self, session_id: str, chunk_id: int, position_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Client playback heartbeat - moves the session's story prefetch window"""
+        scheduler = self.story_prefetch.get(session_id)
+        if scheduler is None:
+            return {"status": "idle", "session_id": session_id}
+        scheduler.report_playback(chunk_id, position_seconds)
+        return {"status": "success", "session_id": session_id, **scheduler.get_stats()}
+
+    # ------------------------------------------------------------------ event streams (SSE / NDJSON)
+
+    @staticmethod
+    def _story_chunk_summary(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        return {"text": chunk["text"], "chunk_id": chunk["chunk_id"], "word_count": chunk["word_count"]}
+
+    @staticmethod
+    def _story_text_complete(story_task: asyncio.Task) -> bool:
+        return story_task.done() and not story_task.cancelled() and story_task.exception() is None
+
+    @staticmethod
+    def _story_segment_event(chunk: Dict[str, Any]) -> Dict[str, Any]:
+        return {"type": "segment", "chunk_id": chunk["chunk_id"], "text": chunk["text"], "word_count": chunk.get("word_count")}
+
+    @staticmethod
+    def _story_audio_event(session_id: str, chunk_id: int, audio_base64: Optional[str]) -> Dict[str, Any]:
+        """Chunk audio is ready - the server turns it into a chunk-audio URL unless inline audio was asked for"""
+        return {
+            "type": "audio",
+            "chunk_id": chunk_id,
+            "ready": bool(audio_base64),
+            "duration_seconds": round(audio_duration_seconds(audio_base64), 2),
+            "audio_base64": audio_base64
+        }
+
+    @staticmethod
+    def _story_done_event(prefetch: asyncio.Task) -> Dict[str, Any]:
+        if prefetch.cancelled():
+            return {"type": "done", "status": "cancelled"}
+        result = prefetch.result()
+        return {"type": "done", "status": result.get("status"), "prefetch": result.get("scheduler"), "error": result.get("error")}
+
+    @staticmethod
+    async def _next_event(events: asyncio.Queue, turn: asyncio.Future) -> Optional[Dict[str, Any]]:
+        """Next queued event, or None once the turn has finished first"""
+        getter = asyncio.ensure_future(events.get())
+        try:
+            await asyncio.wait({getter, turn}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not getter.done():
+                getter.cancel()
+        return None if getter.cancelled() else getter.result()
+
+    async def _drain_events(self, session_id: str, events: asyncio.Queue, turn: asyncio.Future,
+                            closing: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]) -> AsyncIterator[Dict[str, Any]]:
+        """Yield pipeline events until a done/error event; closing(result) gives the last event once
+        the turn has returned, or None when a background stage still sends the final "done".
+        Closing the iterator before the last event (client went away) cancels the turn and the
+        background tasks it left running - the turn's own scope, never a newer turn's."""
+        scope = None
+        finished = False
+        try:
+            while True:
+                if turn.done() and events.empty():
+                    last = closing(turn.result())
+                    if last is not None:
+                        finished = True
+                        yield last
+                        return
+                    event = await events.get()
+                else:
+                    event = await self._next_event(events, turn)
+                    if event is None:
+                        continue
+                if scope is None:
+                    scope = self.cancellation.current(session_id)  # Events only come once the turn has begun
+                finished = event["type"] in ("done", "error")
+                yield event
+                if finished:
+                    return
+        finally:
+            if not finished:
+                if scope is None:
+                    if not turn.done():
+                        self.cancellation.cancel(session_id, reason="event stream closed")
+                elif not scope.cancelled:
+                    if self.cancellation.current(session_id) is scope:
+                        self.cancellation.cancel(session_id, reason="event stream closed")
+                    else:
+                        scope.cancel(reason="event stream closed")  # A newer turn owns the session
+            if not turn.done():
+                turn.cancel()
+
+    @staticmethod
+    def _turn_end_event(result: Dict[str, Any]) -> Dict[str, Any]:
+        if result.get("interrupted"):
+            return {"type": "error", "status": "interrupted", "error": result.get("error")}
+        return {"type": "error", "error": result.get("error", "Processing failed"), "message": result.get("message")}
+
+    def stream_story_events(self, session_id: str, user_input: str, user_profile: Dict[str, Any],
+                            context: List[Dict[str, Any]] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Story pipeline as events, each sent the moment its stage produces it:
+
+        segment (chunk text, as the LLM writes it), audio (chunk synthesized - paced by
+        playback reports like the chunk endpoint prefetch), text_complete (the whole
+        story is written) and done (every chunk synthesized, or prefetch stopped); error
+        instead when the story cannot be told.
+        """
+        events: asyncio.Queue = asyncio.Queue()
+        turn = asyncio.ensure_future(self.process_story_streaming(session_id, user_input, user_profile, context, emit=events.put_nowait))
+        # A streaming story ends with the prefetch's "done" event, anything else right away
+        return self._drain_events(session_id, events, turn, lambda result: None if result.get("status") == "streaming" else self._turn_end_event(result))
+
+    async def stream_turn_events(self, session_id: str, user_profile: Dict[str, Any], text: Optional[str] = None,
+                                 audio_data: Optional[bytes] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Conversation turn (fast pipeline) as events: transcript (voice input), segment (a reply
+        sentence handed to TTS), audio (that sentence voiced, inline base64) and done with the
+        turn result minus the full reply audio; error instead when the turn fails.
+        """
+        if audio_data:
+            text = await self.voice_agent.speech_to_text(audio_data)
+            if text == NO_SPEECH:
+                # Nothing was said - the fixed reply is spoken at once, no turn runs
+                reply = await self._canned_reply("no_speech", user_profile, transcript=NO_SPEECH, content_type="conversation")
+                audio_base64 = reply.pop("response_audio")
+                yield {"type": "segment", "index": 0, "text": reply["response_text"]}
+                yield {"type": "audio", "index": 0, "ready": bool(audio_base64),
+                       "duration_seconds": round(audio_duration_seconds(audio_base64), 2), "audio_base64": audio_base64}
+                yield {"type": "done", **reply}
+                return
+            if not text:
+                yield {"type": "error", "error": "Could not understand audio"}
+                return
+            yield {"type": "transcript", "text": text}
+
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def on_audio(index: int, sentence: str, audio_base64: Optional[str]) -> None:
+            events.put_nowait({
+                "type": "audio",
+                "index": index,
+                "ready": bool(audio_base64),
+                "duration_seconds": round(audio_duration_seconds(audio_base64), 2),
+                "audio_base64": audio_base64
+            })
+
+        def finished(result: Dict[str, Any]) -> Dict[str, Any]:
+            if result.get("error"):
+                return self._turn_end_event(result)
+            return {"type": "done", **{key: value for key, value in result.items() if key != "response_audio"}}
+
+        turn = asyncio.ensure_future(self.process_voice_input_fast(
+            session_id, b"", user_profile, transcript=text, on_audio=on_audio,
+            on_text=lambda index, sentence: events.put_nowait({"type": "segment", "index": index, "text": sentence})
+        ))
+        drain = self._drain_events(session_id, events, turn, finished)
+        try:
+            async for event in drain:
+                yield event
+        finally:
+            await drain.aclose()
+
+    async def process_streaming_utterance(self, session_id: str, transcript: str, user_profile: Dict[str, Any], on_audio: Callable[[int, str, Optional[str]], Awaitable[None]] = None,
+                                          on_text: Callable[[int, str], None] = None) -> Dict[str, Any]:
+        """Endpointed utterance from the streaming STT channel - straight into safety + LLM + TTS"""
+        enhanced_transcript = await self.voice_agent.enhance_indian_kids_speech(transcript)
+        if not enhanced_transcript:
+            return {"error": "Could not understand audio"}
+        return await self.process_voice_input_fast(session_id, b"", user_profile, transcript=enhanced_transcript, on_audio=on_audio, on_text=on_text)
+
+    async def process_voice_input_fast(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None, on_audio: Callable[[int, str, Optional[str]], Awaitable[None]] = None,
+                                       on_text: Callable[[int, str], None] = None) -> Dict[str, Any]:
+        """NEW FAST PIPELINE: Ultra-low latency voice processing (< 3 seconds target).
+
+        on_audio(index, sentence, audio_base64) is awaited for each sentence as soon as
+        its audio is ready, for callers that can play the reply before it is complete;
+        on_text(index, sentence) fires earlier, when the sentence is handed to TTS.
+        """
+        return await self._run_turn(session_id, self._process_voice_input_fast(session_id, audio_data, user_profile, transcript, on_audio, on_text), user_profile)
+    
+    async def _process_voice_input_fast(self, session_id: str, audio_data: bytes, user_profile: Dict[str, Any], transcript: Optional[str] = None, on_audio: Callable[[int, str, Optional[str]], Awaitable[None]] = None,
+                                        on_text: Callable[[int, str], None] = None) -> Dict[str, Any]:
         try:
             import time
             start_time = time.time()
             logger.info("🚀 FAST PIPELINE: Starting ultra-low latency voice processing")
             
-            # BARGE-IN DETECTION: Check if we need to interrupt current audio
-            if self._is_session_speaking(session_id):
-                logger.info(f"🎤 BARGE-IN DETECTED (Fast): Interrupting current audio for session {session_id}")
-                self._request_audio_interrupt(session_id)
-                await asyncio.sleep(0.1)
-                self._clear_interrupt_flag(session_id)
-            
-            # STAGE 1: STT with minimal processing
-            transcript = await self.voice_agent.speech_to_text(audio_data)
+            # STAGE 1: STT with minimal processing (reuse the router's transcript when given)
+            transcript = transcript or await self.voice_agent.speech_to_text(audio_data)
             stt_time = time.time() - start_time
-            logger.info(f"⚡ FAST STT: {stt_time:.2f}s - '{transcript[:50]}...'")
+            logger.info(f"⚡ FAST STT: {stt_time:.2f}s - '{(transcript or '')[:50]}...'")
             
+            if transcript == NO_SPEECH:
+                return await self._canned_reply("no_speech", user_profile, transcript=NO_SPEECH, content_type="conversation")
             if not transcript:
                 return {"error": "Could not understand audio"}
             
@@ -2005,32 +2243,31 @@ class OrchestratorAgent:
                     "message": "Let's talk about something else!"
                 }
             
-            # STAGE 3: Dynamic LLM response (MIKO AI APPROACH - Perfect response length for query type)
+            # STAGE 3+4: Dynamic LLM response (MIKO AI APPROACH) streamed into sentence-level TTS -
+            # the first sentence is synthesizing while the model is still writing the rest
             llm_start = time.time()
-            
-            # Use dynamic response method that determines optimal length and style
-            response = await self.conversation_agent.generate_dynamic_response(transcript, user_profile)
             detected_content_type = "conversation"  # Dynamic responses are always conversation
             
-            llm_time = time.time() - llm_start
-            logger.info(f"⚡ FAST LLM: {llm_time:.2f}s - Generated {len(response)} chars")
-            
-            # STAGE 4: Ultra-fast TTS (use streaming TTS method)
-            tts_start = time.time()
-            
             # Mark session as speaking before TTS generation
             self._set_speaking_state(session_id, True)
             
-            # Use ultra-fast TTS for all responses (use existing fastest method)
-            audio_response = await self.voice_agent.text_to_speech(
-                response, 
-                user_profile.get('voice_personality', 'friendly_companion')
-            )
+            async with self._speculative_speech(user_profile, on_text) as speech:
+                speech.start(self.conversation_agent.generate_response_streaming(transcript, user_profile))
+                if on_audio:
+                    async for index, sentence, audio in speech.segments():
+                        await on_audio(index, sentence, audio)
+                response = await speech.wait_text()
+                llm_time = time.time() - llm_start
+                logger.info(f"⚡ FAST LLM: {llm_time:.2f}s - Generated {len(response)} chars")
+                
+                tts_start = time.time()
+                audio_response = await speech.collect_audio()
             
-            tts_time = time.time() - tts_start
+            tts_time = time.time() - tts_start  # TTS left over after generation finished
             total_time = time.time() - start_time
+            first_audio_time = (speech.started_at - start_time + speech.first_audio_latency) if speech.first_audio_latency else total_time
             
-            logger.info(f"🏆 FAST PIPELINE COMPLETE: {total_time:.2f}s total (STT: {stt_time:.2f}s, LLM: {llm_time:.2f}s, TTS: {tts_time:.2f}s)")
+            logger.info(f"🏆 FAST PIPELINE COMPLETE: {total_time:.2f}s total, first audio {first_audio_time:.2f}s (STT: {stt_time:.2f}s, LLM: {llm_time:.2f}s, TTS tail: {tts_time:.2f}s)")
             
             # Skip storage for speed (fire and forget)
             asyncio.create_task(self._store_conversation(session_id, transcript, response, user_profile))
@@ -2040,7 +2277,7 @@ class OrchestratorAgent:
                 "response_text": response,
                 "response_audio": audio_response,
                 "content_type": detected_content_type,
-                "metadata": {"total_latency": f"{total_time:.2f}s", "pipeline": "fast"}
+                "metadata": {"total_latency": f"{total_time:.2f}s", "first_audio_latency": f"{first_audio_time:.2f}s", "pipeline": "fast"}
             }
             
         except Exception as e:
@@ -2131,7 +2368,7 @@ class OrchestratorAgent:
             # Wait for STT with ultra-fast timeout
             transcript = await asyncio.wait_for(stt_task, timeout=0.4)  # 400ms STT limit
             stt_time = time.time() - stt_start
-            logger.info(f"⚡ ULTRA-STT: {stt_time:.3f}s - '{transcript[:50]}...'")
+            logger.info(f"⚡ ULTRA-STT: {stt_time:.3f}s - '{(transcript or '')[:50]}...'")
             
             if not transcript or transcript.strip() == "":
                 return {
@@ -0,0 +1,185 @@
+"""
+Prefetch Scheduler - Playback-aware story chunk synthesis that keeps N seconds of audio buffered ahead
+"""
+import asyncio
+import base64
+import binascii
+import logging
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable
+
+from .audio_assembly import wav_duration_seconds
+from .chunk_policy import NARRATION_WORDS_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+
+def audio_duration_seconds(audio_base64: Optional[str]) -> float:
+    """Playback length of a base64 WAV clip (0.0 if unreadable)"""
+    if not audio_base64:
+        return 0.0
+    try:
+        return wav_duration_seconds(base64.b64decode(audio_base64))
+    except (binascii.Error, ValueError):
+        return 0.0
+
+
+class StoryPrefetchScheduler:
+    """Synthesizes a story's chunks just ahead of where the client is listening.
+
+    Playback position comes from report_playback() (chunk requests and heartbeats);
+    between reports it is extrapolated at real time through the chunks whose durations
+    are known. A chunk is started only while less than `buffer_seconds` of audio is
+    buffered ahead of that position - except the very next chunk, which is always
+    started - and at most `max_inflight` run at once, lowest chunk_id first. With no
+    report for `idle_timeout` seconds the child has walked away and scheduling stops;
+    any chunk requested later is synthesized on demand.
+
+    With `more_chunks` the story is still being written: add_chunks() hands over new
+    chunks as they are segmented and no_more_chunks() marks the end of the story.
+    """
+
+    def __init__(self, session_id: str, chunks: List[Dict[str, Any]],
+                 synthesize: Callable[[Dict[str, Any]], Awaitable[Optional[str]]],
+                 playing_chunk_id: int = 0, playing_duration: Optional[float] = None,
+                 buffer_seconds: float = 20.0, max_inflight: int = 2, idle_timeout: float = 90.0,
+                 more_chunks: bool = False):
+        self.session_id = session_id
+        self.chunks = sorted(chunks, key=lambda chunk: chunk["chunk_id"])
+        self.synthesize = synthesize
+        self.buffer_seconds = buffer_seconds
+        self.max_inflight = max_inflight
+        self.idle_timeout = idle_timeout
+        self.more_chunks = more_chunks
+
+        self.durations: Dict[int, float] = {}   # chunk_id -> seconds, once synthesized
+        self.tasks: Dict[int, asyncio.Task] = {}
+        self.failed = set()                     # Left to the chunk endpoint to retry on demand
+        if playing_duration:
+            self.durations[playing_chunk_id] = playing_duration
+
+        # The response carrying the playing chunk has just gone out - playback starts about now
+        self.playing_chunk_id = playing_chunk_id
+        self.playing_since = time.monotonic()
+        self.last_report = self.playing_since
+        self._wakeup = asyncio.Event()
+        self.stats = {"started": 0, "completed": 0, "failed": 0, "reports": 0, "stopped": None}
+
+    # ------------------------------------------------------------------ playback
+
+    def report_playback(self, chunk_id: int, position_seconds: Optional[float] = None) -> None:
+        """Client is playing `chunk_id`, `position_seconds` into it (None = keep the estimate if already there)"""
+        now = time.monotonic()
+        self.stats["reports"] += 1
+        self.last_report = now
+        if position_seconds is not None:
+            self.playing_chunk_id, self.playing_since = chunk_id, now - max(position_seconds, 0.0)
+        elif chunk_id != self.playing_chunk_id:
+            self.playing_chunk_id, self.playing_since = chunk_id, now
+        self._wakeup.set()
+
+    def _estimate(self, chunk: Dict[str, Any]) -> float:
+        return self.durations.get(chunk["chunk_id"]) or max(len(chunk["text"].split()), 1) / NARRATION_WORDS_PER_SECOND
+
+    def _advance_playback(self) -> None:
+        """Roll the position forward through chunks whose length is known"""
+        now = time.monotonic()
+        while True:
+            duration = self.durations.get(self.playing_chunk_id)
+            following = self.playing_chunk_id + 1
+            if duration is None or now - self.playing_since < duration or following not in self.durations:
+                return
+            self.playing_since += duration
+            self.playing_chunk_id = following
+
+    def buffered_seconds(self) -> float:
+        """Audio synthesized (or being synthesized) ahead of the playback position"""
+        self._advance_playback()
+        playing = self.durations.get(self.playing_chunk_id)
+        ahead = max(playing - (time.monotonic() - self.playing_since), 0.0) if playing else 0.0
+        for chunk in self.chunks:
+            if chunk["chunk_id"] > self.playing_chunk_id and chunk["chunk_id"] in self.tasks and chunk["chunk_id"] not in self.failed:
+                ahead += self._estimate(chunk)
+        return ahead
+
+    # ------------------------------------------------------------------ scheduling
+
+    def add_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+        """Chunks segmented after scheduling started"""
+        self.chunks = sorted(self.chunks + list(chunks), key=lambda chunk: chunk["chunk_id"])
+        self._wakeup.set()
+
+    def no_more_chunks(self) -> None:
+        self.more_chunks = False
+        self._wakeup.set()
+
+    def _next_chunk(self) -> Optional[Dict[str, Any]]:
+        for chunk in self.chunks:
+            if chunk["chunk_id"] > self.playing_chunk_id and chunk["chunk_id"] not in self.tasks:
+                return chunk
+        return None
+
+    def _inflight(self) -> int:
+        return sum(1 for task in self.tasks.values() if not task.done())
+
+    async def _run_chunk(self, chunk: Dict[str, Any]) -> None:
+        chunk_id = chunk["chunk_id"]
+        try:
+            audio_base64 = await self.synthesize(chunk)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ PREFETCH: chunk {chunk_id} failed: {str(e)}")
+            audio_base64 = None
+
+        if audio_base64:
+            self.durations[chunk_id] = audio_duration_seconds(audio_base64) or self._estimate(chunk)
+            self.stats["completed"] += 1
+        else:
+            self.stats["failed"] += 1
+            self.failed.add(chunk_id)
+        self._wakeup.set()
+
+    async def run(self) -> Dict[str, Any]:
+        """Schedule until every chunk is synthesized, the client goes idle or the task is cancelled"""
+        try:
+            while True:
+                if time.monotonic() - self.last_report > self.idle_timeout:
+                    self.stats["stopped"] = "idle"
+                    logger.info(f"💤 PREFETCH: no playback reports for {self.idle_timeout:.0f}s, stopping story prefetch for {self.session_id}")
+                    break
+
+                chunk = self._next_chunk()
+                if chunk is None and not self._inflight() and not self.more_chunks:
+                    self.stats["stopped"] = "complete"
+                    break
+
+                if chunk is not None and self._inflight() < self.max_inflight:
+                    immediately_next = chunk["chunk_id"] == self.playing_chunk_id + 1
+                    buffered = self.buffered_seconds()
+                    if immediately_next or buffered < self.buffer_seconds:
+                        logger.info(f"🎯 PREFETCH: chunk {chunk['chunk_id']} (playing {self.playing_chunk_id}, {buffered:.1f}s buffered)")
+                        self.stats["started"] += 1
+                        self.tasks[chunk["chunk_id"]] = asyncio.create_task(self._run_chunk(chunk))
+                        continue
+
+                self._wakeup.clear()
+                try:
+                    # Playback keeps moving without reports - re-check about once a second
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            for task in self.tasks.values():
+                if not task.done():
+                    task.cancel()
+
+        return self.get_stats()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "playing_chunk_id": self.playing_chunk_id,
+            "buffered_seconds": round(self.buffered_seconds(), 2),
+            "synthesized_chunks": len(self.durations)
+        }
@@ -0,0 +1,168 @@
+"""
+Rate Limiter - Event-driven token bucket + concurrency scheduler with priority lanes
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TTSPriority:
+    """Priority lanes, lower value is served first"""
+    INTERACTIVE = 0  # First audio a child is actively waiting for
+    PREFETCH = 1     # In-story chunks synthesized ahead of playback
+    BATCH = 2        # Admin/batch work such as pre_generate_story_audio
+
+    NAMES = {0: "interactive", 1: "prefetch", 2: "batch"}
+
+
+class PriorityRateLimiter:
+    """Token bucket (requests/minute) plus concurrency cap with FIFO lanes per priority.
+
+    Waiters park on futures instead of polling; a grant happens only when a slot is
+    released or the single pending refill timer fires. Non-interactive lanes cannot
+    spend the last `interactive_reserve` tokens, so background synthesis never drains
+    the budget that first-audio requests need.
+    """
+
+    def __init__(self, max_concurrent: int = 3, requests_per_minute: int = 25, burst: int = None,
+                 interactive_reserve: int = 2):
+        self.max_concurrent = max_concurrent
+        self.requests_per_minute = requests_per_minute
+        self.capacity = float(burst or requests_per_minute)
+        self.refill_rate = requests_per_minute / 60.0  # tokens per second
+        self.interactive_reserve = interactive_reserve
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._active = 0
+        self._lanes = {priority: deque() for priority in TTSPriority.NAMES}
+        self._lane_order = sorted(self._lanes)
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_deadline = 0.0
+
+        self.stats = {
+            name: {"granted": 0, "cancelled": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in TTSPriority.NAMES.values()
+        }
+        self.stats_rate_limited = 0
+
+    @property
+    def active_requests(self) -> int:
+        return self._active
+
+    @asynccontextmanager
+    async def slot(self, priority: int = TTSPriority.INTERACTIVE):
+        """Hold one request slot (token + concurrency) for the duration of the block"""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int = TTSPriority.INTERACTIVE) -> None:
+        """Wait for admission in the given lane"""
+        lane = priority if priority in self._lanes else TTSPriority.BATCH
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.monotonic()
+        self._lanes[lane].append((future, enqueued_at))
+        self._dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before cancellation - give the slot straight back
+                self.release()
+            self.stats[TTSPriority.NAMES[lane]]["cancelled"] += 1
+            raise
+
+    def headroom(self) -> float:
+        """Fraction of the request bucket currently available (0.0 - 1.0)"""
+        self._refill()
+        return self._tokens / self.capacity if self.capacity else 0.0
+
+    def release(self) -> None:
+        """Free a concurrency slot and admit the next waiter"""
+        self._active = max(0, self._active - 1)
+        self._dispatch()
+
+    def on_rate_limited(self) -> None:
+        """Upstream returned 429 - drain the bucket so everyone backs off together"""
+        self.stats_rate_limited += 1
+        self._refill()
+        self._tokens = 0.0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.refill_rate)
+        self._last_refill = now
+
+    def _head(self, lane: int):
+        """First live waiter of a lane (cancelled waiters are dropped lazily)"""
+        queue = self._lanes[lane]
+        while queue and queue[0][0].done():
+            queue.popleft()
+        return queue[0] if queue else None
+
+    def _dispatch(self) -> None:
+        self._refill()
+
+        while self._active < self.max_concurrent:
+            lane = next((p for p in self._lane_order if self._head(p) is not None), None)
+            if lane is None:
+                return
+
+            needed = 1.0 if lane == TTSPriority.INTERACTIVE else 1.0 + self.interactive_reserve
+            if self._tokens < needed:
+                self._schedule_wakeup((needed - self._tokens) / self.refill_rate)
+                return
+
+            future, enqueued_at = self._lanes[lane].popleft()
+            self._tokens -= 1.0
+            self._active += 1
+            future.set_result(None)
+
+            waited = time.monotonic() - enqueued_at
+            lane_stats = self.stats[TTSPriority.NAMES[lane]]
+            lane_stats["granted"] += 1
+            lane_stats["total_wait"] += waited
+            lane_stats["max_wait"] = max(lane_stats["max_wait"], waited)
+            if waited > 1.0:
+                logger.info(f"⏳ Rate limit: {TTSPriority.NAMES[lane]} request admitted after {waited:.2f}s")
+
+    def _schedule_wakeup(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max(delay, 0.01)
+        if self._timer is not None:
+            if self._timer_deadline <= deadline:
+                return
+            self._timer.cancel()  # A higher-priority waiter needs an earlier wake-up
+        self._timer_deadline = deadline
+        self._timer = loop.call_at(deadline, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-lane admission counters and current bucket state"""
+        self._refill()
+        lanes = {}
+        for priority, name in TTSPriority.NAMES.items():
+            lane_stats = dict(self.stats[name])
+            lane_stats["waiting"] = sum(1 for future, _ in self._lanes[priority] if not future.done())
+            lane_stats["avg_wait"] = lane_stats["total_wait"] / lane_stats["granted"] if lane_stats["granted"] else 0.0
+            lanes[name] = lane_stats
+        return {
+            "tokens_available": round(self._tokens, 2),
+            "capacity": self.capacity,
+            "active_requests": self._active,
+            "max_concurrent": self.max_concurrent,
+            "rate_limited_responses": self.stats_rate_limited,
+            "lanes": lanes
+        }
@@ -0,0 +1,274 @@
+"""
+Response Cache - Semantic cache of interchangeable LLM answers keyed by normalized intent, age group and content type
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from .audio_bank import NAME_SLOT
+
+logger = logging.getLogger(__name__)
+
+# Dropped from the intent - filler, articles, auxiliaries, politeness and wake words.
+# Question words stay: "why" and "how" ask different things about the same topic.
+STOPWORDS = frozenset("""
+a an the and or but so of to in on at for with about from by into onto over under
+be is are was were am been being do does did done have has had can could would will shall should may might must
+me you your yours u please pls tell say give show let lets let's know wanna want gonna going
+hey hi hello buddy okay well just really very actually some any thing things something kind sort
+""".split())
+
+# Turns that only make sense after what was said before, or that are about the child - never cached
+CONTEXT_WORDS = frozenset("""
+it it's that that's this these those they them he she him her hers there
+more again another else next continue also too same other one ones
+yes no yeah yep nope ok okay sure maybe
+i i'm im i've ive i'd id i'll ill my mine myself we we're our ours us
+today tonight tomorrow yesterday now time weather
+""".split())
+
+# Content types whose answers are interchangeable; stories are written fresh and riddles keep per-session answers
+CACHEABLE_CONTENT_TYPES = frozenset({"conversation", "joke", "song", "rhyme"})
+
+_IRREGULAR = {
+    "children": "child", "kids": "kid", "mice": "mouse", "geese": "goose", "teeth": "tooth", "feet": "foot",
+    "people": "person", "men": "man", "women": "woman", "leaves": "leaf", "wolves": "wolf", "knives": "knife",
+    "lives": "life", "wives": "wife", "calves": "calf", "halves": "half", "octopi": "octopus", "cacti": "cactus",
+    "fungi": "fungus", "dice": "die", "oxen": "ox",
+    "flew": "fly", "flies": "fly", "ate": "eat", "ran": "run", "swam": "swim", "sang": "sing", "grew": "grow",
+    "made": "make", "making": "make", "came": "come", "went": "go", "goes": "go", "saw": "see", "seen": "see",
+    "lived": "live", "living": "live", "died": "die", "dying": "die", "born": "bear", "slept": "sleep",
+    "caught": "catch", "thought": "think", "bought": "buy", "taught": "teach", "built": "build", "fell": "fall",
+    "bigger": "big", "biggest": "big", "better": "good", "best": "good", "worse": "bad", "worst": "bad",
+}
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+_DOUBLED = re.compile(r"([bdgkmnprtz])\1$")
+
+
+def lemmatize(word: str) -> str:
+    """Light rule-based lemma (irregular forms, plurals, -ing/-ed, silent -e) - a lookup key, not a word.
+
+    Base and inflected forms meet at the same stem: "breathe"/"breathing" -> "breath",
+    "fishes"/"fish" -> "fish", "swimming"/"swims" -> "swim".
+    """
+    word = _IRREGULAR.get(word, word)
+    if len(word) <= 3 or word.isdigit():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "y"
+    elif word.endswith(("sses", "shes", "ches", "xes", "zes")):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    else:
+        for suffix in ("ing", "ed"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+                word = word[:-len(suffix)]
+                if _DOUBLED.search(word):
+                    word = word[:-1]  # swimming -> swim
+                break
+    return word[:-1] if len(word) > 3 and word.endswith("e") else word
+
+
+def normalize_intent(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """(intent, None) for a self-contained request, or (None, reason) when the turn must not be cached"""
+    words = _TOKEN.findall((text or "").lower().replace("’", "'"))
+    if not words:
+        return None, "empty"
+    context_word = next((word for word in words if word in CONTEXT_WORDS), None)
+    if context_word:
+        return None, f"depends on context ('{context_word}')"
+
+    terms = [lemmatize(word.replace("'", "")) for word in words if word not in STOPWORDS]
+    terms = list(dict.fromkeys(term for term in terms if term))
+    if len(terms) < 2:
+        return None, "too little intent"
+    if len(terms) > 10:
+        return None, "too specific"
+    return " ".join(terms), None
+
+
+class SemanticResponseCache:
+    """In-process cache of LLM answers to general questions ("why is the sky blue").
+
+    An entry is keyed by (pipeline, content type, age group, normalized intent) and
+    holds a pool of up to `max_variants` answers. A session is never served the same
+    variant twice: once it has heard every variant in the pool the lookup misses, the
+    LLM answers and that answer joins the pool (the oldest variant makes room). The
+    child's name, in any letter case, is stored as a slot and filled in per listener;
+    answers for a question that contains the name as a word are not stored at all.
+
+    Only self-contained turns take part - see normalize_intent() - and an answer that
+    mentions the child's interests or remembered topics is never stored.
+    """
+
+    def __init__(self, ttl_seconds: float = 86400.0, max_entries: int = 2000, max_variants: int = 4,
+                 enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_variants = max_variants
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str, str, str], List[Dict[str, Any]]]" = OrderedDict()
+        self._heard: "OrderedDict[Tuple[str, Tuple], set]" = OrderedDict()   # (session, key) -> variant ids served
+        self.stats = {"hits": 0, "misses": 0, "exhausted": 0, "excluded": 0, "stored": 0, "rejected": 0, "expired": 0}
+
+    @classmethod
+    def from_env(cls) -> "SemanticResponseCache":
+        """RESPONSE_CACHE_TTL_SECONDS, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_VARIANTS; RESPONSE_CACHE_ENABLED=0 turns it off"""
+        env = os.environ
+        return cls(
+            ttl_seconds=float(env.get("RESPONSE_CACHE_TTL_SECONDS", "86400")),
+            max_entries=int(env.get("RESPONSE_CACHE_MAX_ENTRIES", "2000")),
+            max_variants=int(env.get("RESPONSE_CACHE_VARIANTS", "4")),
+            enabled=env.get("RESPONSE_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+        )
+
+    @staticmethod
+    def age_group(age: int) -> str:
+        # Same bands as ConversationAgent._get_age_group
+        if age <= 5:
+            return "toddler"
+        elif age <= 9:
+            return "child"
+        return "preteen"
+
+    def cache_key(self, user_input: str, user_profile: Dict[str, Any], content_type: str,
+                  pipeline: str = "full") -> Tuple[Optional[Tuple[str, str, str, str]], Optional[str]]:
+        """(key, None), or (None, reason) when this turn is not cacheable"""
+        if not self.enabled:
+            return None, "disabled"
+        if content_type not in CACHEABLE_CONTENT_TYPES:
+            return None, f"{content_type} is not cacheable"
+        intent, reason = normalize_intent(user_input)
+        if intent is None:
+            return None, reason
+        return (pipeline, content_type, self.age_group(user_profile.get('age', 7)), intent), None
+
+    # ------------------------------------------------------------------ lookup
+
+    def lookup(self, key: Tuple[str, str, str, str], user_profile: Dict[str, Any], session_id: Optional[str] = None) -> Optional[str]:
+        """A variant this session has not heard yet, personalized - or None"""
+        variants = self._live_variants(key)
+        if not variants:
+            self.stats["misses"] += 1
+            return None
+
+        heard = self._heard.get((session_id, key), set()) if session_id else set()
+        fresh = [variant for variant in variants if variant["id"] not in heard]
+        if not fresh:
+            self.stats["exhausted"] += 1  # Heard them all - let the LLM add a new one
+            return None
+
+        variant = min(fresh, key=lambda variant: variant["served"])  # Spread hits across the pool
+        variant["served"] += 1
+        if session_id:
+            self._remember_heard(session_id, key, variant["id"])
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return self.personalize(variant["text"], user_profile.get('name'))
+
+    def _live_variants(self, key) -> List[Dict[str, Any]]:
+        variants = self._entries.get(key)
+        if not variants:
+            return []
+        cutoff = time.monotonic() - self.ttl_seconds
+        live = [variant for variant in variants if variant["stored_at"] >= cutoff]
+        if len(live) != len(variants):
+            self.stats["expired"] += len(variants) - len(live)
+            if live:
+                self._entries[key] = live
+            else:
+                del self._entries[key]
+        return live
+
+    def _remember_heard(self, session_id: str, key, variant_id: str) -> None:
+        heard_key = (session_id, key)
+        self._heard.setdefault(heard_key, set()).add(variant_id)
+        self._heard.move_to_end(heard_key)
+        while len(self._heard) > self.max_entries * 4:
+            self._heard.popitem(last=False)
+
+    @staticmethod
+    def personalize(text: str, name: Optional[str]) -> str:
+        return text.replace(NAME_SLOT, name or "friend")
+
+    # ------------------------------------------------------------------ store
+
+    @staticmethod
+    def personal_terms(user_profile: Dict[str, Any], memory_context: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Words that make an answer about this child: profile interests and remembered topics/preferences"""
+        terms = list(user_profile.get('interests') or [])
+        if memory_context and memory_context.get("user_id") != "unknown":
+            terms.extend(topic[0] if isinstance(topic, (tuple, list)) else topic for topic in memory_context.get("favorite_topics", []) or [])
+            terms.extend((memory_context.get("recent_preferences") or {}).values())
+        return [str(term) for term in terms if term and str(term).strip()]
+
+    def store(self, key: Tuple[str, str, str, str], text: str, user_profile: Dict[str, Any],
+              session_id: Optional[str] = None, personal_terms: Iterable[str] = ()) -> bool:
+        """Add an LLM answer to the key's variant pool; False when it is too personal to share"""
+        if not text or not text.strip():
+            return False
+        lowered = text.lower()
+        for term in personal_terms:
+            if re.search(rf"(?<!\w){re.escape(term.lower())}(?!\w)", lowered):
+                self.stats["rejected"] += 1
+                logger.info(f"🗃️ RESPONSE CACHE: not storing answer for '{key[3]}' - mentions '{term}'")
+                return False
+
+        name = (user_profile.get('name') or "").strip()
+        if name:
+            # A child called "Sky" asking why the sky is blue: the name is part of the answer's
+            # subject, and slotting it would turn every "sky" into the next listener's name
+            intent_terms = set(key[3].split())
+            if any(lemmatize(word) in intent_terms for word in _TOKEN.findall(name.lower())):
+                self.stats["rejected"] += 1
+                logger.info(f"🗃️ RESPONSE CACHE: not storing answer for '{key[3]}' - the child's name is in the question")
+                return False
+            template = re.sub(rf"(?<!\w){re.escape(name)}(?!\w)", NAME_SLOT, text, flags=re.IGNORECASE)
+        else:
+            template = text
+        variant_id = hashlib.sha1(" ".join(template.split()).encode("utf-8")).hexdigest()[:16]
+
+        variants = self._live_variants(key)
+        if any(variant["id"] == variant_id for variant in variants):
+            return True
+        variants.append({"id": variant_id, "text": template, "stored_at": time.monotonic(), "served": 0})
+        self._entries[key] = variants[-self.max_variants:]
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        if session_id:
+            self._remember_heard(session_id, key, variant_id)  # The asker just heard it
+        self.stats["stored"] += 1
+        return True
+
+    def note_excluded(self, reason: Optional[str]) -> None:
+        self.stats["excluded"] += 1
+        logger.debug(f"RESPONSE CACHE: turn excluded ({reason})")
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"] + self.stats["exhausted"]
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "variants": sum(len(variants) for variants in self._entries.values()),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0
+        }
+
+
+# Process-wide cache shared by every ConversationAgent instance
+_shared_cache: Optional[SemanticResponseCache] = None
+
+
+def get_response_cache() -> SemanticResponseCache:
+    """Return the process-wide response cache"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = SemanticResponseCache.from_env()
+    return _shared_cache
@@ -253,6 +253,16 @@ class SafetyAgent:
         
         return safe_responses.get(age_group, "Let's talk about something fun and interesting!")
     
+    def bank_phrases(self) -> List[str]:
+        """Every fixed guidance / redirect line, for the pre-rendered audio bank"""
+        phrases = []
+        for age in (4, 7, 11):
+            for trigger in ("stupid", "hate", "gross", ""):
+                phrases.append(self._generate_empathetic_guidance(trigger, age))
+            phrases.append(self._get_alternative_topic(age))
+            phrases.append(self._generate_safe_response(age))
+        return list(dict.fromkeys(phrases))
+    
     async def get_safety_report(self, session_id: str) -> Dict[str, Any]:
         """Get safety report for a session"""
         # This would typically query the database for safety incidents
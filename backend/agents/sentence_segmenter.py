@@ -0,0 +1,181 @@
+"""
+Sentence Segmenter - Incremental text-delta to speech-ready segment splitting shared by every chunking path
+"""
+import re
+from typing import Iterator, List, Optional
+
+# Terminator, closing quotes/brackets, whitespace and (when it has arrived) the next visible character
+_BOUNDARY = re.compile(r'(\.\.\.|…|[.!?]+)(["\'”’)\]]*)(\s+)(\S?)|\n[ \t]*\n\s*')
+_TRAILING_WORD = re.compile(r'([A-Za-z][A-Za-z.]*)$')
+
+# Lower-case, without the final dot
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "st", "sr", "jr", "mt", "vs", "e.g", "i.e", "a.m", "p.m", "u.s", "approx"
+})
+
+_COMPACT_AFTER = 4096  # Drop consumed text from the buffer once this much has piled up
+
+
+class SentenceSegmenter:
+    """Feed text deltas, get speech-ready segments back as soon as they are complete.
+
+    Sentence boundaries respect abbreviations ("Dr. Lee"), initials ("J. K."), dialogue
+    tags ('"Run!" shouted Tom.'), quotes closing after the terminator and ellipses that
+    trail into lower-case text. A boundary is only decided once the next visible
+    character has arrived, so streamed text is never split early.
+
+    Sentences are packed into segments:
+      target_chars / target_words - emit once a segment reaches this size (0 = every sentence)
+      min_chars                   - never emit a shorter segment (merged with the next sentence)
+      max_chars                   - never grow a segment past this; over-long sentences are cut
+                                    at the last comma or space (0 = no limit)
+
+    The targets are plain attributes and may be changed between feed() calls. Each call
+    only scans text that has not been scanned before, so feeding token-sized deltas is linear.
+    """
+
+    def __init__(self, min_chars: int = 0, max_chars: int = 0, target_chars: int = 0, target_words: int = 0):
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self.target_chars = target_chars
+        self.target_words = target_words
+
+        self._buffer = ""
+        self._start = 0      # Start of the sentence currently being assembled
+        self._scan_from = 0  # Boundaries before this offset have already been decided
+        self._group: List[str] = []
+        self._group_chars = 0
+        self._group_words = 0
+
+    def feed(self, delta: str) -> Iterator[str]:
+        """Add a delta; the returned generator yields every segment it completes"""
+        if delta:
+            self._buffer += delta
+        return self._scan(final=False)
+
+    def flush(self) -> Iterator[str]:
+        """Yield whatever is left once the stream has ended"""
+        yield from self._scan(final=True)
+        tail = self._buffer[self._start:].strip()
+        self._buffer, self._start, self._scan_from = "", 0, 0
+        if tail:
+            yield from self._add_sentence(tail)
+        if self._group:
+            yield self._emit_group()
+
+    def _scan(self, final: bool) -> Iterator[str]:
+        buffer = self._buffer
+        position = self._scan_from
+        pending = None  # End of a sentence that more text could still confirm
+
+        while True:
+            match = _BOUNDARY.search(buffer, position)
+            if match is None:
+                position = max(position, len(buffer) - 3)  # A terminator may still be arriving
+                break
+
+            if match.group(1) is None:
+                # Blank line - paragraph break is always a boundary
+                end, position = match.start(), match.end()
+            else:
+                next_char = match.group(4)
+                if not next_char and not final:
+                    position, pending = match.start(), match.end(2)  # Wait for the next word before deciding
+                    break
+                if not self._is_boundary(buffer, match, next_char):
+                    position = match.end(3)
+                    continue
+                end, position = match.end(2), match.end(3)
+
+            sentence = buffer[self._start:end].strip()
+            self._start = position
+            if sentence:
+                yield from self._add_sentence(sentence)
+
+        self._scan_from = max(position, self._start)
+        if pending is None and not final:
+            # Trailing whitespace may still become a paragraph break
+            text_end = len(buffer)
+            while text_end > self._start and buffer[text_end - 1].isspace():
+                text_end -= 1
+            if self._start < text_end < len(buffer):
+                pending = text_end
+
+        # A run with no boundary in sight - cut it so TTS never gets an oversized request.
+        # A sentence that may still end inside the window, as it would in one-shot
+        # splitting, is not cut until its boundary is decided.
+        while (self.max_chars and len(buffer) - self._start > self.max_chars
+               and (pending is None or pending > self._start + self.max_chars)):
+            if buffer[self._start].isspace():
+                # The window starts at the next word, as it does for a stripped sentence
+                self._start += 1
+                self._scan_from = max(self._scan_from, self._start)
+                continue
+            window_end = self._start + self.max_chars
+            cut = max(buffer.rfind(",", self._start, window_end), buffer.rfind(" ", self._start, window_end))
+            if cut <= self._start:
+                cut = window_end - 1
+            sentence = buffer[self._start:cut + 1].strip()
+            self._start = cut + 1
+            self._scan_from = max(self._scan_from, self._start)
+            if sentence:
+                yield from self._add_sentence(sentence)
+
+        if self._start > _COMPACT_AFTER:
+            self._buffer = buffer[self._start:]
+            self._scan_from -= self._start
+            self._start = 0
+
+    def _is_boundary(self, buffer: str, match: "re.Match", next_char: Optional[str]) -> bool:
+        terminator = match.group(1)
+        if next_char and next_char.islower():
+            return False  # Dialogue tag or a sentence that simply carries on
+
+        if terminator in ("...", "…"):
+            # Trailing off mid-thought unless a new sentence clearly starts
+            return not next_char or next_char.isupper() or next_char in "\"'“‘"
+
+        if terminator == ".":
+            word = _TRAILING_WORD.search(buffer, max(self._start, match.start() - 12), match.start())
+            if word:
+                token = word.group(1)
+                if token.lower() in ABBREVIATIONS:
+                    return False
+                if len(token) == 1 and token.isupper() and token != "I":
+                    return False  # Initial
+        return True
+
+    def _add_sentence(self, sentence: str) -> Iterator[str]:
+        length = len(sentence)
+        if self.max_chars and length > self.max_chars:
+            # One sentence longer than the limit - cut at commas/spaces
+            while length > self.max_chars:
+                cut = max(sentence.rfind(",", 0, self.max_chars), sentence.rfind(" ", 0, self.max_chars))
+                cut = cut if cut > 0 else self.max_chars - 1
+                yield from self._add_sentence(sentence[:cut + 1].strip())
+                sentence = sentence[cut + 1:].strip()
+                length = len(sentence)
+            if not sentence:
+                return
+
+        if self._group and self.max_chars and self._group_chars + 1 + length > self.max_chars and self._group_chars >= self.min_chars:
+            yield self._emit_group()
+
+        self._group.append(sentence)
+        self._group_chars += length + (1 if len(self._group) > 1 else 0)
+        self._group_words += len(sentence.split())
+
+        if (self._group_chars >= max(self.min_chars, self.target_chars)
+                and self._group_words >= self.target_words):
+            yield self._emit_group()
+
+    def _emit_group(self) -> str:
+        segment = " ".join(self._group)
+        self._group, self._group_chars, self._group_words = [], 0, 0
+        return segment
+
+
+def split_sentences(text: str, min_chars: int = 0, max_chars: int = 0, target_chars: int = 0, target_words: int = 0) -> List[str]:
+    """Segment a complete text in one call"""
+    segmenter = SentenceSegmenter(min_chars, max_chars, target_chars, target_words)
+    return list(segmenter.feed(text)) + list(segmenter.flush())
@@ -0,0 +1,414 @@
+"""
+Service Stub - Local stand-in for Deepgram (/v1/listen, /v1/speak) and the LlmChat contract
+
+Run as a separate server from backend/:
+    python -m agents.service_stub --port 8787
+then point the backend at it:
+    DEEPGRAM_BASE_URL=http://127.0.0.1:8787 LLM_BACKEND=stub uvicorn server:app
+or start it in-process with `async with ServiceStubServer() as stub: ...`.
+
+Latency, error and 429 injection are configured through STUB_* environment variables
+(see StubConfig.from_env). Payloads are deterministic for a given input and STUB_SEED.
+StubLlmChat only has send_message, like LlmChat; STUB_LLM_STREAMING=1 adds token streaming.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+from aiohttp import web
+
+from .audio_assembly import build_wav_header
+
+logger = logging.getLogger(__name__)
+
+STT_PHRASES = [
+    "Tell me a story about a brave little elephant",
+    "What is the biggest animal in the ocean",
+    "Can you tell me a joke",
+    "Hello Buddy how are you today",
+    "Why is the sky blue",
+    "Let's play a riddle game"
+]
+
+LLM_SENTENCES = [
+    "That is a wonderful question!",
+    "Once upon a time, in a forest full of tall green trees, there lived a curious little rabbit.",
+    "Every morning the rabbit hopped down to the river to say hello to the fish.",
+    "One day a friendly owl asked if the rabbit wanted to go on an adventure.",
+    "Did you know that blue whales are the biggest animals that have ever lived?",
+    "They laughed together and decided to be best friends forever.",
+    "What do you think happened next?",
+    "The sun was setting and the sky turned pink and orange."
+]
+
+
+class LatencyModel:
+    """Latency distribution in milliseconds: fixed, uniform (mean +/- jitter) or lognormal"""
+
+    def __init__(self, mean_ms: float = 0.0, jitter_ms: float = 0.0, distribution: str = "uniform"):
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency sample in seconds"""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == "fixed" or self.jitter_ms <= 0:
+            value = self.mean_ms
+        elif self.distribution == "lognormal":
+            # Long-tailed like real upstream APIs; jitter acts as the standard deviation
+            sigma = math.sqrt(math.log1p((self.jitter_ms / self.mean_ms) ** 2))
+            mu = math.log(self.mean_ms) - sigma ** 2 / 2
+            value = rng.lognormvariate(mu, sigma)
+        else:
+            value = rng.uniform(self.mean_ms - self.jitter_ms, self.mean_ms + self.jitter_ms)
+        return max(value, 0.0) / 1000.0
+
+
+class StubConfig:
+    """Fault and latency injection settings shared by the HTTP stub and StubLlmChat"""
+
+    def __init__(self, stt_latency: LatencyModel = None, tts_latency: LatencyModel = None,
+                 llm_latency: LatencyModel = None, llm_ms_per_token: float = 0.0, tts_ms_per_char: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, tts_requests_per_minute: int = 0, seed: int = 0):
+        self.stt_latency = stt_latency or LatencyModel()
+        self.tts_latency = tts_latency or LatencyModel()
+        self.llm_latency = llm_latency or LatencyModel()
+        self.llm_ms_per_token = llm_ms_per_token
+        self.tts_ms_per_char = tts_ms_per_char
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.tts_requests_per_minute = tts_requests_per_minute
+        self.seed = seed
+
+    @classmethod
+    def from_env(cls) -> "StubConfig":
+        """Build from STUB_* variables; per-service latency falls back to STUB_LATENCY_MS"""
+        env = os.environ
+        distribution = env.get("STUB_LATENCY_DIST", "uniform")
+        jitter = float(env.get("STUB_LATENCY_JITTER_MS", "0"))
+        default_latency = env.get("STUB_LATENCY_MS", "0")
+
+        def latency(service: str) -> LatencyModel:
+            return LatencyModel(float(env.get(f"STUB_{service}_LATENCY_MS", default_latency)), jitter, distribution)
+
+        return cls(
+            stt_latency=latency("STT"),
+            tts_latency=latency("TTS"),
+            llm_latency=latency("LLM"),
+            llm_ms_per_token=float(env.get("STUB_LLM_MS_PER_TOKEN", "0")),
+            tts_ms_per_char=float(env.get("STUB_TTS_MS_PER_CHAR", "0")),
+            error_rate=float(env.get("STUB_ERROR_RATE", "0")),
+            rate_limit_rate=float(env.get("STUB_429_RATE", "0")),
+            tts_requests_per_minute=int(env.get("STUB_TTS_RPM", "0")),
+            seed=int(env.get("STUB_SEED", "0"))
+        )
+
+
+def _digest(*parts: Any) -> int:
+    material = "\x1f".join(str(part) for part in parts).encode("utf-8", "surrogatepass")
+    return int.from_bytes(hashlib.sha256(material).digest()[:8], "big")
+
+
+def stub_transcript(audio_data: bytes, seed: int = 0) -> str:
+    """Deterministic transcript for an audio clip (STUB_TRANSCRIPT overrides)"""
+    override = os.environ.get("STUB_TRANSCRIPT")
+    if override:
+        return override
+    if not audio_data:
+        return ""
+    return STT_PHRASES[_digest(hashlib.sha1(audio_data).hexdigest(), seed) % len(STT_PHRASES)]
+
+
+def stub_speech_wav(text: str, sample_rate: int = 24000, words_per_minute: int = 150) -> bytes:
+    """Silent 16-bit mono WAV as long as `text` would take to speak"""
+    duration = max(len(text.split()), 1) * 60.0 / words_per_minute
+    data_length = int(duration * sample_rate) * 2
+    return build_wav_header(data_length, sample_rate) + bytes(data_length)
+
+
+def stub_llm_text(prompt: str, max_tokens: int = 200, seed: int = 0) -> str:
+    """Deterministic reply sized to roughly `max_tokens` for story prompts, short otherwise"""
+    rng = random.Random(_digest(prompt, seed))
+    target_words = int(max_tokens * 0.75) if "story" in prompt.lower() else min(40, int(max_tokens * 0.75))
+    sentences = []
+    words = 0
+    while words < target_words:
+        sentence = rng.choice(LLM_SENTENCES)
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+class _FaultInjector:
+    """Shared latency / error / 429 decisions with per-endpoint counters"""
+
+    def __init__(self, config: StubConfig):
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self._tts_window = deque()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def count(self, endpoint: str, outcome: str) -> None:
+        endpoint_stats = self.stats.setdefault(endpoint, {"requests": 0, "ok": 0, "errors": 0, "rate_limited": 0})
+        endpoint_stats["requests"] += 1
+        endpoint_stats[outcome] += 1
+
+    def fault(self, endpoint: str) -> Optional[int]:
+        """HTTP status to fail with (429 / 500) or None to serve normally"""
+        if endpoint == "speak" and self.config.tts_requests_per_minute:
+            now = time.monotonic()
+            while self._tts_window and now - self._tts_window[0] > 60.0:
+                self._tts_window.popleft()
+            if len(self._tts_window) >= self.config.tts_requests_per_minute:
+                return 429
+            self._tts_window.append(now)
+
+        roll = self.rng.random()
+        if roll < self.config.rate_limit_rate:
+            return 429
+        if roll < self.config.rate_limit_rate + self.config.error_rate:
+            return 500
+        return None
+
+
+class ServiceStubServer:
+    """aiohttp app serving the Deepgram endpoints the backend uses"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8787, config: StubConfig = None):
+        self.host = host
+        self.port = port
+        self.config = config or StubConfig.from_env()
+        self.faults = _FaultInjector(self.config)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def build_app(self) -> web.Application:
+        app = web.Application(client_max_size=32 * 1024 * 1024)
+        app.router.add_post("/v1/listen", self.handle_listen)
+        app.router.add_get("/v1/listen", self.handle_listen_stream)
+        app.router.add_post("/v1/speak", self.handle_speak)
+        app.router.add_get("/v1/projects", self.handle_projects)
+        app.router.add_get("/stub/stats", self.handle_stats)
+        return app
+
+    async def start(self) -> "ServiceStubServer":
+        self._runner = web.AppRunner(self.build_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            # Ephemeral port requested - report the one the OS picked
+            self.port = site._server.sockets[0].getsockname()[1]
+        logger.info(f"🧪 Service stub listening on {self.base_url}")
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "ServiceStubServer":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _inject(self, endpoint: str, latency: float) -> Optional[web.Response]:
+        await asyncio.sleep(latency)
+        status = self.faults.fault(endpoint)
+        if status == 429:
+            self.faults.count(endpoint, "rate_limited")
+            return web.json_response({"err_code": "TOO_MANY_REQUESTS", "err_msg": "Too Many Requests"}, status=429)
+        if status:
+            self.faults.count(endpoint, "errors")
+            return web.json_response({"err_code": "INTERNAL", "err_msg": "Injected stub failure"}, status=status)
+        self.faults.count(endpoint, "ok")
+        return None
+
+    async def handle_listen(self, request: web.Request) -> web.Response:
+        audio_data = await request.read()
+        failure = await self._inject("listen", self.config.stt_latency.sample(self.faults.rng))
+        if failure is not None:
+            return failure
+
+        transcript = request.headers.get("X-Stub-Transcript") or stub_transcript(audio_data, self.config.seed)
+        words = [
+            {"word": word.lower(), "punctuated_word": word, "start": index * 0.4, "end": index * 0.4 + 0.35, "confidence": 0.98}
+            for index, word in enumerate(transcript.split())
+        ]
+        return web.json_response({
+            "metadata": {"request_id": f"stub-{_digest(transcript, len(audio_data)):x}", "duration": len(words) * 0.4},
+            "results": {"channels": [{"alternatives": [{"transcript": transcript, "confidence": 0.98, "words": words}]}]}
+        })
+
+    async def handle_listen_stream(self, request: web.Request) -> web.WebSocketResponse:
+        """Live /listen: interim words revealed as audio arrives, final + UtteranceEnd on Finalize/CloseStream"""
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        transcript_words = []
+        received = 0
+
+        def results(words, is_final: bool) -> Dict[str, Any]:
+            return {
+                "type": "Results",
+                "is_final": is_final,
+                "speech_final": is_final,
+                "channel": {"alternatives": [{"transcript": " ".join(words), "confidence": 0.98}]}
+            }
+
+        async def flush_final():
+            nonlocal received, transcript_words
+            failure = self.faults.fault("listen")
+            self.faults.count("listen", "ok" if failure is None else "errors")
+            await asyncio.sleep(self.config.stt_latency.sample(self.faults.rng))
+            if transcript_words and failure is None:
+                await ws.send_json(results(transcript_words, True))
+                await ws.send_json({"type": "UtteranceEnd"})
+            transcript_words = []
+            received = 0
+
+        async for message in ws:
+            if message.type == web.WSMsgType.BINARY:
+                if not transcript_words:
+                    transcript_words = (stub_transcript(message.data, self.config.seed) or "").split()
+                    await ws.send_json({"type": "SpeechStarted"})
+                received += len(message.data)
+                revealed = min(len(transcript_words), received // 8000 + 1)  # ~1 word per 0.25s of 16kHz PCM
+                await ws.send_json(results(transcript_words[:revealed], False))
+            elif message.type == web.WSMsgType.TEXT:
+                control = json.loads(message.data).get("type")
+                if control == "Finalize":
+                    await flush_final()
+                elif control == "CloseStream":
+                    await flush_final()
+                    break
+        await ws.close()
+        return ws
+
+    async def handle_speak(self, request: web.Request) -> web.Response:
+        try:
+            payload = await request.json()
+        except json.JSONDecodeError:
+            return web.json_response({"err_msg": "Invalid JSON body"}, status=400)
+        text = payload.get("text", "")
+        sample_rate = int(request.query.get("sample_rate", "24000"))
+
+        latency = self.config.tts_latency.sample(self.faults.rng) + len(text) * self.config.tts_ms_per_char / 1000.0
+        failure = await self._inject("speak", latency)
+        if failure is not None:
+            return failure
+
+        return web.Response(body=stub_speech_wav(text, sample_rate), content_type="audio/wav")
+
+    async def handle_projects(self, request: web.Request) -> web.Response:
+        return web.json_response({"projects": [{"project_id": "stub", "name": "Local stub"}]})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.faults.stats)
+
+
+class StubUserMessage:
+    """Mirror of emergentintegrations UserMessage"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubLlmChat:
+    """Drop-in for emergentintegrations LlmChat: same builder methods and async send_message"""
+
+    config: StubConfig = None  # Shared, lazily read from env
+    _rng: random.Random = None
+
+    def __init__(self, api_key: str = None, session_id: str = None, system_message: str = None):
+        self.api_key = api_key
+        self.session_id = session_id
+        self.system_message = system_message or ""
+        self.provider = "gemini"
+        self.model = "gemini-2.0-flash"
+        self.max_tokens = 200
+
+        if StubLlmChat.config is None:
+            StubLlmChat.config = StubConfig.from_env()
+            StubLlmChat._rng = random.Random(StubLlmChat.config.seed)
+
+    def with_model(self, provider: str, model: str) -> "StubLlmChat":
+        self.provider = provider
+        self.model = model
+        return self
+
+    def with_max_tokens(self, max_tokens: int) -> "StubLlmChat":
+        self.max_tokens = max_tokens
+        return self
+
+    async def send_message(self, user_message: StubUserMessage) -> str:
+        """Deterministic reply after injected latency; raises like the real client on faults.
+
+        Like LlmChat this only returns once the whole reply is written: STUB_LLM_LATENCY_MS
+        plus STUB_LLM_MS_PER_TOKEN for every word after the first.
+        """
+        words = await self._generate(user_message)
+        if len(words) > 1 and StubLlmChat.config.llm_ms_per_token:
+            await asyncio.sleep((len(words) - 1) * StubLlmChat.config.llm_ms_per_token / 1000.0)
+        return " ".join(words)
+
+    async def _generate(self, user_message: StubUserMessage) -> List[str]:
+        """Reply words once the time-to-first-token has passed"""
+        config = StubLlmChat.config
+        await asyncio.sleep(config.llm_latency.sample(StubLlmChat._rng))
+
+        roll = StubLlmChat._rng.random()
+        if roll < config.rate_limit_rate:
+            raise Exception("429 Too Many Requests: stub rate limit")
+        if roll < config.rate_limit_rate + config.error_rate:
+            raise Exception("500 Internal Server Error: injected stub failure")
+
+        text = getattr(user_message, "text", str(user_message))
+        return stub_llm_text(f"{self.system_message}\n{text}", self.max_tokens, config.seed).split(" ")
+
+
+class StubStreamingLlmChat(StubLlmChat):
+    """StubLlmChat plus token streaming - opt in with STUB_LLM_STREAMING=1 to model a streaming client.
+
+    LlmChat itself has no stream_message, so the default stub does not either.
+    """
+
+    async def stream_message(self, user_message: StubUserMessage):
+        """Same reply word by word: STUB_LLM_LATENCY_MS to the first token, STUB_LLM_MS_PER_TOKEN after that"""
+        words = await self._generate(user_message)
+        for index, word in enumerate(words):
+            if index and StubLlmChat.config.llm_ms_per_token:
+                await asyncio.sleep(StubLlmChat.config.llm_ms_per_token / 1000.0)
+            yield word if index == 0 else " " + word
+
+
+async def _serve_forever(host: str, port: int) -> None:
+    async with ServiceStubServer(host, port):
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Deepgram stand-in for offline performance testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
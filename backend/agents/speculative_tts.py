@@ -0,0 +1,134 @@
+"""
+Speculative TTS - LLM token stream -> sentence segmenter -> TTS, first sentence synthesized while the rest is generated
+"""
+import asyncio
+import logging
+import time
+from typing import List, Optional, Tuple, AsyncIterator, Callable
+
+from .rate_limiter import TTSPriority
+from .sentence_segmenter import SentenceSegmenter
+
+logger = logging.getLogger(__name__)
+
+
+class SpeculativeSpeech:
+    """One spoken reply built from a stream of text deltas.
+
+    Every completed sentence is handed to TTS the moment the segmenter emits it, so
+    sentence 1 is synthesizing while the LLM is still writing sentence 2. Audio is
+    consumed strictly in order through segments(), or stitched with collect_audio().
+
+    Use as an async context manager: leaving it cancels generation and any
+    synthesis still pending (barge-in, errors).
+
+    on_text(index, sentence) is called as each sentence is dispatched, before its audio exists.
+    """
+
+    def __init__(self, voice_agent, personality: str = "friendly_companion",
+                 transform: Callable[[str], str] = None, segmenter: SentenceSegmenter = None,
+                 on_text: Callable[[int, str], None] = None):
+        self.voice_agent = voice_agent
+        self.personality = personality
+        self.transform = transform
+        self.on_text = on_text
+        self.segmenter = segmenter or SentenceSegmenter(min_chars=20, max_chars=300)
+
+        self._segments: List[Tuple[str, asyncio.Task]] = []
+        self._changed = asyncio.Event()
+        self._finished = False
+        self._producer: Optional[asyncio.Task] = None
+
+        self.started_at = time.time()
+        self.first_audio_latency: Optional[float] = None
+
+    @property
+    def text(self) -> str:
+        """Reply text dispatched so far (post-transform)"""
+        return " ".join(text for text, _ in self._segments)
+
+    def start(self, deltas: AsyncIterator[str]) -> "SpeculativeSpeech":
+        """Begin consuming the delta stream in the background"""
+        self._producer = asyncio.create_task(self._consume(deltas))
+        return self
+
+    async def wait_text(self) -> str:
+        """Full reply text once generation has finished (re-raises generation errors)"""
+        await self._producer
+        return self.text
+
+    async def _consume(self, deltas: AsyncIterator[str]) -> None:
+        try:
+            async for delta in deltas:
+                for segment in self.segmenter.feed(delta):
+                    self._dispatch(segment)
+            for segment in self.segmenter.flush():
+                self._dispatch(segment)
+        finally:
+            self._finished = True
+            self._changed.set()
+
+    def _dispatch(self, segment: str) -> None:
+        if self.transform:
+            segment = self.transform(segment)
+        if not segment or not segment.strip():
+            return
+
+        index = len(self._segments)
+        # The first sentence is what the child is waiting on; the rest have playback time to spare
+        priority = TTSPriority.INTERACTIVE if index == 0 else TTSPriority.PREFETCH
+        task = asyncio.create_task(self.voice_agent.generate_chunk_audio(segment, self.personality, priority=priority))
+        if index == 0:
+            task.add_done_callback(self._mark_first_audio)
+
+        self._segments.append((segment, task))
+        self._changed.set()
+        if self.on_text:
+            self.on_text(index, segment)
+        logger.info(f"🗣️ SPECULATIVE TTS: sentence {index + 1} dispatched after {time.time() - self.started_at:.2f}s ({len(segment)} chars)")
+
+    def _mark_first_audio(self, task: asyncio.Task) -> None:
+        self.first_audio_latency = time.time() - self.started_at
+
+    async def segments(self) -> AsyncIterator[Tuple[int, str, Optional[str]]]:
+        """Yield (index, text, audio_base64) in speaking order as each sentence's audio is ready"""
+        index = 0
+        while True:
+            while index >= len(self._segments):
+                if self._finished:
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+
+            text, task = self._segments[index]
+            try:
+                audio = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Speculative TTS sentence {index + 1} failed: {str(e)}")
+                audio = None
+            yield index, text, audio
+            index += 1
+
+    async def collect_audio(self) -> Optional[str]:
+        """Wait for every sentence and stitch them into one base64 WAV"""
+        chunks = [audio async for _, _, audio in self.segments() if audio]
+        if not chunks:
+            return None
+        if len(chunks) == 1:
+            return chunks[0]
+        return self.voice_agent.stitch_audio_chunks(chunks)
+
+    def cancel(self) -> None:
+        if self._producer is not None and not self._producer.done():
+            self._producer.cancel()
+        for _, task in self._segments:
+            if not task.done():
+                task.cancel()
+
+    async def __aenter__(self) -> "SpeculativeSpeech":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.cancel()
@@ -0,0 +1,168 @@
+"""
+Streaming STT - Deepgram live transcription over WebSocket with interim results and endpointing
+"""
+import asyncio
+import json
+import logging
+from typing import Dict, Any, Optional, AsyncIterator
+
+import aiohttp
+
+from .http_client_pool import DeepgramConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Same recognizer settings as the batch /listen request, plus the streaming-only knobs
+STREAMING_STT_PARAMS = {
+    "model": "nova-2",
+    "language": "en-IN",
+    "smart_format": "true",
+    "punctuate": "true",
+    "numerals": "true",
+    "profanity_filter": "true",
+    "interim_results": "true",
+    "endpointing": "300",        # ms of silence that marks speech_final
+    "utterance_end_ms": "1000",  # backstop when background noise defeats endpointing
+    "vad_events": "true"
+}
+
+
+class DeepgramStreamingSession:
+    """One live recognizer connection: push audio frames in, iterate transcript events out.
+
+    Events are dicts with a "type" of:
+      "interim"    - partial hypothesis for the words currently being spoken
+      "final"      - a finalized segment (more may follow in the same utterance)
+      "utterance"  - endpoint reached; "text" is the whole utterance, ready for the LLM
+      "speech_started", "closed"
+    """
+
+    KEEPALIVE_INTERVAL = 8.0  # Deepgram closes idle streams after ~10s without audio
+
+    def __init__(self, http_pool: DeepgramConnectionPool, api_key: str, encoding: Optional[str] = None,
+                 sample_rate: Optional[int] = None, channels: int = 1):
+        self.http_pool = http_pool
+        self.api_key = api_key
+
+        self.params = dict(STREAMING_STT_PARAMS)
+        if encoding:
+            # Raw PCM needs explicit format; containerized audio (webm/ogg) is auto-detected
+            self.params["encoding"] = encoding
+            self.params["sample_rate"] = str(sample_rate or 16000)
+            self.params["channels"] = str(channels)
+
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._last_send = 0.0
+        self._segments = []  # finalized segments of the current utterance
+        self.bytes_sent = 0
+
+    @property
+    def url(self) -> str:
+        return self.http_pool.base_url.replace("https://", "wss://", 1).replace("http://", "ws://", 1) + "/v1/listen"
+
+    async def start(self) -> "DeepgramStreamingSession":
+        session = await self.http_pool.get_session()
+        self._ws = await session.ws_connect(
+            self.url,
+            params=self.params,
+            headers={"Authorization": f"Token {self.api_key}"},
+            heartbeat=None
+        )
+        self._last_send = asyncio.get_running_loop().time()
+        self._keepalive_task = asyncio.create_task(self._keep_alive())
+        logger.info("🎙️ Streaming STT connected")
+        return self
+
+    async def send_audio(self, frame: bytes) -> None:
+        """Forward one captured audio frame to the recognizer"""
+        if not frame or self._ws is None or self._ws.closed:
+            return
+        await self._ws.send_bytes(frame)
+        self.bytes_sent += len(frame)
+        self._last_send = asyncio.get_running_loop().time()
+
+    async def finalize(self) -> None:
+        """Flush whatever audio is buffered into a final result without closing"""
+        await self._send_control({"type": "Finalize"})
+
+    async def finish(self) -> None:
+        """Signal end of audio; Deepgram flushes remaining results and closes the stream"""
+        await self._send_control({"type": "CloseStream"})
+
+    async def _send_control(self, message: Dict[str, Any]) -> None:
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.send_str(json.dumps(message))
+            self._last_send = asyncio.get_running_loop().time()
+
+    async def _keep_alive(self) -> None:
+        try:
+            while self._ws is not None and not self._ws.closed:
+                await asyncio.sleep(1.0)
+                if asyncio.get_running_loop().time() - self._last_send >= self.KEEPALIVE_INTERVAL:
+                    await self._send_control({"type": "KeepAlive"})
+        except (asyncio.CancelledError, ConnectionResetError):
+            pass
+
+    async def events(self) -> AsyncIterator[Dict[str, Any]]:
+        """Transcript events until the recognizer closes the stream"""
+        async for message in self._ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                if message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                    break
+                continue
+
+            try:
+                payload = json.loads(message.data)
+            except ValueError:
+                logger.warning(f"⚠️ Streaming STT: skipping non-JSON message {message.data[:80]!r}")
+                continue
+            if isinstance(payload, dict):
+                for event in self._parse(payload):
+                    yield event
+
+        # Stream ended mid-utterance - whatever was finalized is still a usable utterance
+        if self._segments:
+            yield self._utterance()
+        yield {"type": "closed"}
+
+    def _parse(self, payload: Dict[str, Any]):
+        message_type = payload.get("type")
+
+        if message_type == "Results":
+            alternatives = (payload.get("channel") or {}).get("alternatives") or [{}]
+            transcript = (alternatives[0].get("transcript") or "").strip()
+
+            if payload.get("is_final"):
+                if transcript:
+                    self._segments.append(transcript)
+                    yield {"type": "final", "text": transcript, "confidence": alternatives[0].get("confidence")}
+                if payload.get("speech_final") and self._segments:
+                    yield self._utterance()
+            elif transcript:
+                yield {"type": "interim", "text": " ".join(self._segments + [transcript])}
+
+        elif message_type == "UtteranceEnd" and self._segments:
+            yield self._utterance()
+
+        elif message_type == "SpeechStarted":
+            yield {"type": "speech_started"}
+
+    def _utterance(self) -> Dict[str, Any]:
+        text = " ".join(self._segments)
+        self._segments = []
+        return {"type": "utterance", "text": text}
+
+    async def close(self) -> None:
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        logger.info(f"🎙️ Streaming STT closed ({self.bytes_sent} bytes streamed)")
+
+    async def __aenter__(self) -> "DeepgramStreamingSession":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
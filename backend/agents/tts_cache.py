@@ -0,0 +1,221 @@
+"""
+TTS Audio Cache - Content-addressed synthesized audio (memory LRU + on-disk tier)
+"""
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "tts_cache"
+
+
+class TTSAudioCache:
+    """Byte-bounded in-memory LRU in front of a persistent local-disk tier"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_memory_bytes: int = None, max_disk_bytes: int = None):
+        self.cache_dir = Path(cache_dir or os.environ.get("TTS_CACHE_DIR") or DEFAULT_CACHE_DIR)
+        self.max_memory_bytes = max_memory_bytes or int(os.environ.get("TTS_CACHE_MEMORY_MB", "64")) * 1024 * 1024
+        self.max_disk_bytes = max_disk_bytes or int(os.environ.get("TTS_CACHE_DISK_MB", "512")) * 1024 * 1024
+
+        # key -> base64 audio (what every caller returns), most recently used last
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+
+        self._disk_enabled = True
+        self._disk_bytes = 0
+        self._disk_entries = 0
+        self._disk_lock = threading.Lock()  # Disk writes and eviction run in to_thread workers
+
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+            "bytes_served": 0
+        }
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for entry in self.cache_dir.glob("*.wav"):
+                self._disk_bytes += entry.stat().st_size
+                self._disk_entries += 1
+        except Exception as e:
+            logger.warning(f"TTS disk cache disabled ({self.cache_dir}): {str(e)}")
+            self._disk_enabled = False
+
+        logger.info(f"✅ TTS audio cache ready: {self._disk_entries} clips on disk, memory budget {self.max_memory_bytes // (1024 * 1024)}MB")
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Canonical form used for hashing - unicode NFC with collapsed whitespace"""
+        return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text or "")).strip()
+
+    def make_key(self, text: str, model: str, encoding: str, sample_rate: int) -> str:
+        """Content address for (normalized text, voice model, encoding, sample rate)"""
+        material = "\x1f".join([self.normalize_text(text), model, encoding, str(sample_rate)])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return base64 audio for key from memory, then disk; None on miss"""
+        audio_base64 = self._memory.get(key)
+        if audio_base64 is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            self.stats["bytes_served"] += len(audio_base64)
+            return audio_base64
+
+        if self._disk_enabled:
+            audio_bytes = await asyncio.to_thread(self._read_disk, key)
+            if audio_bytes:
+                audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
+                self._remember(key, audio_base64)
+                self.stats["disk_hits"] += 1
+                self.stats["bytes_served"] += len(audio_base64)
+                return audio_base64
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, audio_base64: str) -> None:
+        """Store base64 audio in memory and persist the raw clip to disk"""
+        if not audio_base64:
+            return
+        self._remember(key, audio_base64)
+        self.stats["stores"] += 1
+
+        if self._disk_enabled:
+            try:
+                audio_bytes = base64.b64decode(audio_base64)
+                await asyncio.to_thread(self._write_disk, key, audio_bytes)
+            except Exception as e:
+                logger.warning(f"TTS disk cache write failed: {str(e)}")
+
+    def _remember(self, key: str, audio_base64: str) -> None:
+        """Insert into the memory LRU, evicting least recently used clips over budget"""
+        size = len(audio_base64)
+        if size > self.max_memory_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = audio_base64
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.stats["memory_evictions"] += 1
+
+    def _path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path_for(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # Refresh mtime so disk eviction stays LRU-ish
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"TTS disk cache read failed for {key[:12]}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, audio_bytes: bytes) -> None:
+        path = self._path_for(key)
+        if path.exists():
+            return
+
+        # Write-then-rename so concurrent readers never see a partial clip; each writer
+        # gets its own temp file so two writes of one key cannot interleave
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f"{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(audio_bytes)
+            with self._disk_lock:
+                # Another writer may have stored this key since the exists() check - count only the difference
+                try:
+                    replaced = path.stat().st_size
+                except FileNotFoundError:
+                    replaced = None
+                os.replace(tmp_name, path)
+                self._disk_bytes += len(audio_bytes) - (replaced or 0)
+                if replaced is None:
+                    self._disk_entries += 1
+
+                if self._disk_bytes > self.max_disk_bytes:
+                    self._evict_disk()
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+    def _evict_disk(self) -> None:
+        """Drop the oldest clips until the disk tier is back under 90% of budget (caller holds _disk_lock)"""
+        entries = sorted(self.cache_dir.glob("*.wav"), key=lambda p: p.stat().st_mtime)
+        target = int(self.max_disk_bytes * 0.9)
+        for entry in entries:
+            if self._disk_bytes <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                entry.unlink()
+                self._disk_bytes -= size
+                self._disk_entries -= 1
+                self.stats["disk_evictions"] += 1
+            except FileNotFoundError:
+                continue
+
+    async def clear(self, include_disk: bool = True) -> None:
+        """Empty the memory tier and optionally the disk tier"""
+        self._memory.clear()
+        self._memory_bytes = 0
+        if include_disk and self._disk_enabled:
+            def _wipe():
+                with self._disk_lock:
+                    for entry in self.cache_dir.glob("*.wav"):
+                        entry.unlink(missing_ok=True)
+                    self._disk_bytes = 0
+                    self._disk_entries = 0
+            await asyncio.to_thread(_wipe)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes for /api/admin/cache-stats"""
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "memory_budget_bytes": self.max_memory_bytes,
+            "disk_enabled": self._disk_enabled,
+            "disk_entries": self._disk_entries,
+            "disk_bytes": self._disk_bytes,
+            "disk_budget_bytes": self.max_disk_bytes
+        }
+
+
+# Process-wide cache shared by every VoiceAgent instance
+_shared_cache: Optional[TTSAudioCache] = None
+
+
+def get_tts_cache() -> TTSAudioCache:
+    """Return the process-wide TTS audio cache"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TTSAudioCache()
+    return _shared_cache
@@ -8,45 +8,87 @@ import time
 import json
 import base64
 import aiohttp
-import requests
 import os
-from typing import Dict, List, Optional, Any
+import hashlib
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 import re
-from datetime import datetime, timedelta
+
+from .http_client_pool import DeepgramConnectionPool, get_deepgram_pool
+from .tts_cache import TTSAudioCache, get_tts_cache
+from .audio_bank import AudioBank, get_audio_bank, MAX_BANKED_TEXT_CHARS
+from .rate_limiter import PriorityRateLimiter, TTSPriority
+from .audio_assembly import stitch_wavs, parse_wav, streaming_wav_header, build_wav_header, WavFormatError
+from .streaming_stt import DeepgramStreamingSession
+from .audio_preprocessing import preprocess_for_stt
+from .ambient_listener import AmbientListeningEngine
+from .sentence_segmenter import split_sentences
+from .chunk_policy import AdaptiveChunkPolicy
 
 logger = logging.getLogger(__name__)
 
+# STT result for a clip with no words in it (VAD rejection, empty transcript) - falsy like a
+# failure (None) for older callers, but a caller can answer it at once instead of retrying
+NO_SPEECH = ""
+
+# Transcript memo for the current request (audio hash -> transcript); None outside a request scope
+_transcript_memo: ContextVar[Optional[Dict[str, str]]] = ContextVar("transcript_memo", default=None)
+
+# Name of the child being spoken to in the current request - spliced into banked template audio
+_listener_name: ContextVar[Optional[str]] = ContextVar("listener_name", default=None)
+
 class RateLimitedTTSQueue:
     """Production-ready TTS request queue with rate limiting and retry logic"""
     
-    def __init__(self, max_concurrent=3, requests_per_minute=30):
+    # Voice personality mapping
+    VOICE_MODELS = {
+        "friendly_companion": "aura-2-thalia-en",
+        "story_narrator": "aura-2-luna-en", 
+        "learning_buddy": "aura-2-stella-en"
+    }
+    DEFAULT_MODEL = "aura-2-thalia-en"
+    ENCODING = "linear16"
+    CONTAINER = "wav"
+    SAMPLE_RATE = 24000
+    
+    def __init__(self, max_concurrent=3, requests_per_minute=30, http_pool: DeepgramConnectionPool = None):
         self.max_concurrent = max_concurrent
         self.requests_per_minute = requests_per_minute
-        self.queue = asyncio.Queue()
-        self.active_requests = 0
-        self.request_times = []
+        # Event-driven token bucket with interactive / prefetch / batch lanes
+        self.limiter = PriorityRateLimiter(max_concurrent=max_concurrent, requests_per_minute=requests_per_minute)
         self.retry_delays = [1, 2, 4, 8]  # Exponential backoff
+        self.http_pool = http_pool or get_deepgram_pool()  # Shared keep-alive connections
         
-    async def add_request(self, text: str, voice_personality: str = "friendly_companion", max_retries: int = 4):
+    @property
+    def active_requests(self) -> int:
+        return self.limiter.active_requests
+    
+    @classmethod
+    def resolve_model(cls, voice_personality: str) -> str:
+        """Deepgram voice model used for a personality"""
+        return cls.VOICE_MODELS.get(voice_personality, cls.DEFAULT_MODEL)
+    
+    async def add_request(self, text: str, voice_personality: str = "friendly_companion", max_retries: int = 4, priority: int = TTSPriority.INTERACTIVE):
         """Add TTS request to rate-limited queue"""
-        return await self._process_with_rate_limiting(text, voice_personality, max_retries)
+        return await self._process_with_rate_limiting(text, voice_personality, max_retries, priority)
     
-    async def _process_with_rate_limiting(self, text: str, voice_personality: str, max_retries: int):
+    async def _process_with_rate_limiting(self, text: str, voice_personality: str, max_retries: int, priority: int = TTSPriority.INTERACTIVE):
         """Process TTS request with proper rate limiting and retries"""
         for attempt in range(max_retries + 1):
             try:
-                # Wait for rate limit availability
-                await self._wait_for_rate_limit()
-                
-                # Make TTS request
-                result = await self._make_tts_request(text, voice_personality)
+                # Wait for a token + concurrency slot in this request's priority lane
+                async with self.limiter.slot(priority):
+                    result = await self._call_deepgram_tts(text, voice_personality)
                 
                 if result:
                     logger.info(f"✅ TTS request successful on attempt {attempt + 1}")
                     return result
                     
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 if "429" in str(e) or "Too Many Requests" in str(e):
+                    self.limiter.on_rate_limited()
                     if attempt < max_retries:
                         delay = self.retry_delays[min(attempt, len(self.retry_delays) - 1)]
                         logger.warning(f"⚠️ TTS rate limited, retrying in {delay}s (attempt {attempt + 1}/{max_retries + 1})")
@@ -64,33 +106,9 @@ class RateLimitedTTSQueue:
         
         return None
     
-    async def _wait_for_rate_limit(self):
-        """Wait until we can make a request without exceeding rate limits"""
-        # Clean old request times (older than 1 minute)
-        current_time = datetime.now()
-        self.request_times = [t for t in self.request_times if (current_time - t).seconds < 60]
-        
-        # Wait for concurrent request limit
-        while self.active_requests >= self.max_concurrent:
-            await asyncio.sleep(0.1)
-            
-        # Wait for per-minute rate limit
-        if len(self.request_times) >= self.requests_per_minute:
-            oldest_request = min(self.request_times)
-            wait_time = 60 - (current_time - oldest_request).seconds
-            if wait_time > 0:
-                logger.info(f"⏳ Rate limit: waiting {wait_time}s")
-                await asyncio.sleep(wait_time)
-    
-    async def _make_tts_request(self, text: str, voice_personality: str):
-        """Make actual TTS API request with proper error handling"""
-        self.active_requests += 1
-        self.request_times.append(datetime.now())
-        
-        try:
-            return await self._call_deepgram_tts(text, voice_personality)
-        finally:
-            self.active_requests -= 1
+    def get_stats(self) -> Dict[str, Any]:
+        """Rate limiter state for monitoring"""
+        return self.limiter.get_stats()
     
     async def _call_deepgram_tts(self, text: str, voice_personality: str):
         """Call Deepgram TTS API with proper error handling"""
@@ -100,55 +118,48 @@ class RateLimitedTTSQueue:
                 logger.error("Missing DEEPGRAM_API_KEY")
                 return None
                 
-            # Voice personality mapping
-            voice_models = {
-                "friendly_companion": "aura-2-thalia-en",
-                "story_narrator": "aura-2-luna-en", 
-                "learning_buddy": "aura-2-stella-en"
+            model = self.resolve_model(voice_personality)
+            
+            headers = {
+                'Authorization': f'Token {deepgram_key}',
+                'Content-Type': 'application/json'
             }
             
-            model = voice_models.get(voice_personality, "aura-2-thalia-en")
+            # FIXED: JSON payload should ONLY contain text
+            payload = {
+                'text': text
+            }
             
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    'Authorization': f'Token {deepgram_key}',
-                    'Content-Type': 'application/json'
-                }
-                
-                # FIXED: JSON payload should ONLY contain text
-                payload = {
-                    'text': text
-                }
-                
-                # FIXED: All other parameters go as query parameters
-                params = {
-                    'model': model,
-                    'encoding': 'linear16',
-                    'container': 'wav',
-                    'sample_rate': 24000
-                }
-                
-                timeout = aiohttp.ClientTimeout(total=30)  # 30s timeout
+            # FIXED: All other parameters go as query parameters
+            params = {
+                'model': model,
+                'encoding': self.ENCODING,
+                'container': self.CONTAINER,
+                'sample_rate': self.SAMPLE_RATE
+            }
+            
+            timeout = aiohttp.ClientTimeout(total=30)  # 30s timeout
+            
+            # Reuse pooled keep-alive connections instead of a new handshake per utterance
+            async with self.http_pool.post(
+                '/v1/speak',
+                headers=headers,
+                json=payload,
+                params=params,  # Parameters as query string
+                timeout=timeout
+            ) as response:
                 
-                async with session.post(
-                    'https://api.deepgram.com/v1/speak',
-                    headers=headers,
-                    json=payload,
-                    params=params,  # Parameters as query string
-                    timeout=timeout
-                ) as response:
+                if response.status == 200:
+                    audio_data = await response.read()
+                    audio_base64 = base64.b64encode(audio_data).decode('utf-8')
+                    logger.info(f"✅ TTS generated: {len(audio_data)} bytes")
+                    return audio_base64
+                elif response.status == 429:
+                    raise Exception("429 Too Many Requests")
+                else:
+                    error_text = await response.text()
+                    raise Exception(f"TTS API error {response.status}: {error_text}")
                     
-                    if response.status == 200:
-                        audio_data = await response.read()
-                        audio_base64 = base64.b64encode(audio_data).decode('utf-8')
-                        logger.info(f"✅ TTS generated: {len(audio_data)} bytes")
-                        return audio_base64
-                    elif response.status == 429:
-                        raise Exception("429 Too Many Requests")
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"TTS API error {response.status}: {error_text}")
-                        
         except asyncio.TimeoutError:
             raise Exception("TTS request timeout")
         except Exception as e:
@@ -157,10 +168,38 @@ class RateLimitedTTSQueue:
 class VoiceAgent:
     """Ultra-low latency voice processing with production-ready reliability"""
     
-    def __init__(self, deepgram_api_key: str, mongo_client=None):
+    def __init__(self, deepgram_api_key: str, mongo_client=None, http_pool: DeepgramConnectionPool = None, tts_cache: TTSAudioCache = None, audio_bank: AudioBank = None):
         self.deepgram_api_key = deepgram_api_key
-        self.tts_queue = RateLimitedTTSQueue(max_concurrent=3, requests_per_minute=25)  # Conservative limits
-        self.base_url = "https://api.deepgram.com/v1"
+        self.http_pool = http_pool or get_deepgram_pool()  # Shared by TTS queue and STT
+        self.tts_cache = tts_cache or get_tts_cache()  # Content-addressed synthesized audio
+        self.audio_bank = audio_bank or get_audio_bank()  # Pre-rendered fixed replies, memory-mapped
+        self._inflight_tts = {}  # cache key -> Future, coalesces identical concurrent requests
+        self.tts_queue = RateLimitedTTSQueue(max_concurrent=3, requests_per_minute=25, http_pool=self.http_pool)  # Conservative limits
+        self.base_url = f"{self.http_pool.base_url}/v1"
+        self.chunk_policy = AdaptiveChunkPolicy(limiter=self.tts_queue.limiter)  # Narration segment sizing
+        
+        # STT transport policy - async on the shared pool so one slow clip never blocks the loop
+        self.stt_timeout = 8.0  # seconds per attempt
+        self.stt_max_retries = 2  # retries on 429 / 5xx / timeout
+        self.stt_retry_delays = [0.25, 0.75]
+        self.stt_preprocess = os.environ.get("STT_PREPROCESS", "true").lower() != "false"  # VAD trim + 16 kHz mono
+        self.ambient = AmbientListeningEngine(self._transcribe_ambient_segment)  # Wake-word listening for /api/ambient/*
+        self.stt_metrics = {
+            "requests": 0,
+            "successes": 0,
+            "empty_transcripts": 0,
+            "failures": 0,
+            "retries": 0,
+            "timeouts": 0,
+            "rate_limited": 0,
+            "memo_hits": 0,
+            "vad_rejected": 0,
+            "bytes_in": 0,
+            "bytes_sent": 0,
+            "total_latency": 0.0,
+            "max_latency": 0.0,
+            "last_latency": 0.0
+        }
         
         # Ultra-fast voice personalities optimized for low latency
         self.voice_personalities = {
@@ -192,8 +231,8 @@ class VoiceAgent:
         """Pre-warm TTS connection for ultra-low latency"""
         try:
             logger.info(f"🔥 PRE-WARMING TTS connection for {voice_personality}")
-            # Simple warmup request with minimal text
-            await self.text_to_speech(".", voice_personality)
+            # Open pooled sockets that stay alive for the real request (no synthesis quota used)
+            await self.http_pool.warm_up()
             logger.info("✅ TTS connection pre-warmed")
         except Exception as e:
             logger.warning(f"TTS pre-warm failed: {str(e)}")
@@ -228,18 +267,105 @@ class VoiceAgent:
             logger.error(f"Streaming response error: {str(e)}")
             return "I'm processing your request..."
 
-    async def text_to_speech(self, text: str, personality: str = "friendly_companion", language: str = "en") -> Optional[str]:
+    async def text_to_speech(self, text: str, personality: str = "friendly_companion", language: str = "en", priority: int = TTSPriority.INTERACTIVE) -> Optional[str]:
         """Production-ready TTS using Deepgram with rate limiting and reliability"""
         try:
-            # Use the rate-limited queue for all TTS requests
-            return await self.tts_queue.add_request(text, personality, max_retries=4)
+            # Cache first, then the rate-limited queue for all TTS requests
+            return await self._synthesize(text, personality, max_retries=4, priority=priority)
             
         except Exception as e:
             logger.error(f"❌ TTS error: {str(e)}")
             return None
 
-    async def text_to_speech_chunked(self, text: str, personality: str = "friendly_companion", language: str = "en-US") -> Optional[str]:
-        """PRODUCTION-READY Chunked TTS with proper rate limiting and sequential processing"""
+    async def generate_chunk_audio(self, text: str, personality: str = "friendly_companion", priority: int = TTSPriority.INTERACTIVE) -> Optional[str]:
+        """Audio for a single pre-chunked piece of text (cache-aware)"""
+        try:
+            return await self._synthesize(text, personality, max_retries=4, priority=priority)
+        except Exception as e:
+            logger.error(f"❌ Chunk audio error: {str(e)}")
+            return None
+
+    def _tts_cache_key(self, text: str, personality: str) -> str:
+        """Cache key matching exactly what the TTS queue would request"""
+        return self.tts_cache.make_key(
+            text,
+            RateLimitedTTSQueue.resolve_model(personality),
+            RateLimitedTTSQueue.ENCODING,
+            RateLimitedTTSQueue.SAMPLE_RATE
+        )
+
+    def set_listener_name(self, name: Optional[str]) -> None:
+        """Name to splice into banked audio for the rest of the current request"""
+        _listener_name.set(name.strip() if name and name.strip() else None)
+
+    async def banked_audio(self, text: str, personality: str = "friendly_companion") -> Optional[str]:
+        """Audio for text from the pre-rendered bank only - None if any part of it would need live TTS"""
+        name = _listener_name.get()
+        clips = self.audio_bank.plan(text, RateLimitedTTSQueue.resolve_model(personality), name)
+        if clips is None:
+            return None
+
+        name_clip = None
+        if any(clip is None for clip in clips):
+            # One short clip per child and voice, TTS-cached after the first time it is needed
+            try:
+                name_audio = await self._synthesize(name, personality)
+            except Exception as e:
+                logger.warning(f"Audio bank name clip failed: {str(e)}")
+                return None
+            if not name_audio:
+                return None
+            name_clip = base64.b64decode(name_audio)
+        return self.audio_bank.assemble(clips, name_clip)
+
+    async def _synthesize(self, text: str, personality: str, max_retries: int = 4, priority: int = TTSPriority.INTERACTIVE) -> Optional[str]:
+        """Serve from the audio bank or cache, or synthesize once through the rate-limited queue.
+
+        Only short interactive text can be a fixed reply - prefetched story chunks skip the bank.
+        """
+        if priority != TTSPriority.PREFETCH and len(text) <= MAX_BANKED_TEXT_CHARS:
+            banked_audio = await self.banked_audio(text, personality)
+            if banked_audio:
+                logger.info(f"🏦 AUDIO BANK HIT: {len(text)} chars")
+                return banked_audio
+        
+        key = self._tts_cache_key(text, personality)
+        
+        cached_audio = await self.tts_cache.get(key)
+        if cached_audio:
+            logger.info(f"⚡ TTS CACHE HIT: {len(text)} chars")
+            return cached_audio
+        
+        # Identical text already being synthesized - share its result
+        inflight = self._inflight_tts.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The owning request was cancelled - synthesize on our own below
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_tts[key] = future
+        try:
+            audio_base64 = await self.tts_queue.add_request(text, personality, max_retries=max_retries, priority=priority)
+            if audio_base64:
+                await self.tts_cache.put(key, audio_base64)
+            future.set_result(audio_base64)
+            return audio_base64
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self._inflight_tts.pop(key, None)
+
+    async def text_to_speech_chunked(self, text: str, personality: str = "friendly_companion", language: str = "en-US", priority: int = TTSPriority.INTERACTIVE, concurrent: bool = True, max_parallel: int = 3, stitch: bool = True, pause_ms: int = 0) -> Optional[str]:
+        """PRODUCTION-READY Chunked TTS - chunks go through the rate limiter in parallel and are stitched into one WAV"""
         try:
             start_time = time.time()
             logger.info(f"🎵 CHUNKED TTS: Processing {len(text)} chars with {personality}")
@@ -250,34 +376,18 @@ class VoiceAgent:
             
             if len(chunks) == 1:
                 # Single chunk - use regular TTS
-                return await self.text_to_speech(text, personality, language)
+                return await self.text_to_speech(text, personality, language, priority=priority)
             
-            # CRITICAL: Process chunks SEQUENTIALLY to avoid rate limits
+            # Rate limiting is enforced by the shared limiter, so chunks can be in flight together
             audio_chunks = []
             successful_chunks = 0
             
-            for i, chunk in enumerate(chunks):
-                logger.info(f"🎵 Processing chunk {i+1}/{len(chunks)}: {chunk[:50]}...")
-                
-                # Use rate-limited queue for reliable processing
-                audio_result = await self.tts_queue.add_request(chunk, personality, max_retries=5)
-                
+            async for index, audio_result in self.stream_tts_chunks(
+                chunks, personality, priority=priority, max_parallel=max_parallel if concurrent else 1
+            ):
                 if audio_result:
                     audio_chunks.append(audio_result)
                     successful_chunks += 1
-                    logger.info(f"✅ Chunk {i+1} completed successfully")
-                    
-                    # Small delay between chunks to ensure rate limit compliance
-                    if i < len(chunks) - 1:  # Don't delay after last chunk
-                        await asyncio.sleep(0.5)
-                else:
-                    logger.error(f"❌ Chunk {i+1} failed after retries")
-                    # FALLBACK: Generate simple placeholder audio
-                    fallback_text = f"... continuing story ..."
-                    fallback_audio = await self.tts_queue.add_request(fallback_text, personality, max_retries=3)
-                    if fallback_audio:
-                        audio_chunks.append(fallback_audio)
-                        successful_chunks += 1
             
             processing_time = time.time() - start_time
             logger.info(f"⏱️ Chunked TTS completed in {processing_time:.2f}s ({successful_chunks}/{len(chunks)} successful)")
@@ -286,8 +396,18 @@ class VoiceAgent:
                 logger.error("❌ No audio chunks generated - FALLBACK to single TTS")
                 return await self.text_to_speech(text[:500], personality, language)  # Truncated fallback
             
-            # PROPER AUDIO CONCATENATION - Return chunks as array for sequential playback
-            # Instead of concatenating (which causes WAV header issues), return metadata for frontend
+            # For backwards compatibility, if only one chunk, return the audio directly
+            if len(audio_chunks) == 1:
+                return audio_chunks[0]
+            
+            # PCM-LEVEL CONCATENATION - one continuous WAV, no per-chunk headers for the client to juggle
+            if stitch:
+                stitched_audio = self.stitch_audio_chunks(audio_chunks, pause_ms=pause_ms)
+                if stitched_audio:
+                    return stitched_audio
+                logger.warning("⚠️ Chunk stitching failed - returning chunk array")
+            
+            # Legacy shape: chunks as array for sequential playback on the frontend
             result = {
                 "audio_chunks": audio_chunks,
                 "total_chunks": len(audio_chunks),
@@ -296,10 +416,6 @@ class VoiceAgent:
                 "is_chunked": True
             }
             
-            # For backwards compatibility, if only one chunk, return the audio directly
-            if len(audio_chunks) == 1:
-                return audio_chunks[0]
-            
             # Return JSON string for frontend to parse
             import json
             return json.dumps(result)
@@ -310,6 +426,85 @@ class VoiceAgent:
             logger.info("🔄 Attempting single TTS fallback")
             return await self.text_to_speech(text[:500], personality, language)
 
+    def stitch_audio_chunks(self, audio_chunks: List[str], pause_ms: int = 0) -> Optional[str]:
+        """Join base64 WAV chunks into a single base64 WAV with optional inter-sentence silence"""
+        try:
+            stitched = stitch_wavs([base64.b64decode(chunk) for chunk in audio_chunks], silence_ms=pause_ms)
+            return base64.b64encode(stitched).decode('utf-8')
+        except (WavFormatError, ValueError) as e:
+            logger.error(f"❌ Audio stitching error: {str(e)}")
+            return None
+
+    async def text_to_speech_chunked_fast(self, text: str, personality: str = "friendly_companion", language: str = "en-US") -> Optional[str]:
+        """Chunked TTS with maximum parallelism allowed by the rate limiter"""
+        return await self.text_to_speech_chunked(text, personality, language, concurrent=True, max_parallel=self.tts_queue.max_concurrent)
+
+    async def stream_tts_chunks(self, chunks: List[str], personality: str = "friendly_companion", priority: int = TTSPriority.INTERACTIVE, max_parallel: int = 3) -> AsyncIterator[Tuple[int, Optional[str]]]:
+        """Synthesize chunks concurrently (bounded) and yield (index, audio) strictly in order.
+        
+        Chunk 0 is yielded the moment it is ready, while later chunks keep synthesizing.
+        Abandoning the iterator cancels whatever is still pending.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_parallel))
+        
+        async def synthesize_chunk(index: int, chunk: str) -> Optional[str]:
+            async with semaphore:
+                logger.info(f"🎵 Processing chunk {index + 1}/{len(chunks)}: {chunk[:50]}...")
+                audio_result = await self._synthesize(chunk, personality, max_retries=5, priority=priority)
+                if audio_result:
+                    logger.info(f"✅ Chunk {index + 1} completed successfully")
+                    return audio_result
+                
+                logger.error(f"❌ Chunk {index + 1} failed after retries")
+                # FALLBACK: Generate simple placeholder audio
+                fallback_text = f"... continuing story ..."
+                return await self._synthesize(fallback_text, personality, max_retries=3, priority=priority)
+        
+        tasks = [asyncio.create_task(synthesize_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+        try:
+            for index, task in enumerate(tasks):
+                try:
+                    audio_result = await task
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Chunk {index + 1} error: {str(e)}")
+                    audio_result = None
+                yield index, audio_result
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def stream_speech_wav(self, text: str, personality: str = "friendly_companion", priority: int = TTSPriority.INTERACTIVE) -> AsyncIterator[bytes]:
+        """Binary WAV stream: header plus first chunk's PCM as soon as it exists, then the rest in order.
+        
+        Raises before yielding anything if the first chunk cannot be synthesized, so HTTP
+        handlers can still answer with an error status.
+        """
+        # Short first chunk for fast first audio, larger ones while it plays
+        chunks = self.chunk_policy.split(text)
+        header_sent = False
+        
+        async for index, audio_result in self.stream_tts_chunks(chunks, personality, priority=priority):
+            if not audio_result:
+                if not header_sent:
+                    raise RuntimeError("TTS generation failed for first chunk")
+                continue
+            try:
+                fmt, pcm = parse_wav(base64.b64decode(audio_result))
+            except (WavFormatError, ValueError) as e:
+                logger.error(f"❌ Streaming TTS chunk {index + 1} unreadable: {str(e)}")
+                if not header_sent:
+                    raise
+                continue
+            
+            if not header_sent:
+                header_sent = True
+                yield streaming_wav_header(fmt["sample_rate"], fmt["channels"], fmt["bits_per_sample"]) + pcm
+            else:
+                yield bytes(pcm)
+
     async def text_to_speech_streaming(self, text: str, personality: str = "friendly_companion") -> Optional[str]:
         """Streaming TTS for immediate playback start"""
         # For Deepgram, we'll use chunked approach for streaming effect
@@ -337,87 +532,199 @@ class VoiceAgent:
         """Smart text chunking optimized for natural speech boundaries"""
         if len(text) <= max_chunk_size:
             return [text]
+        # Greedily pack whole sentences up to the size limit
+        return split_sentences(text, max_chars=max_chunk_size, target_chars=max_chunk_size)
+
+    def begin_transcript_scope(self) -> None:
+        """Start a fresh transcript memo for the current request so the same audio is transcribed once"""
+        _transcript_memo.set({})
+
+    async def speech_to_text_streaming(self, audio_data: bytes) -> str:
+        """Enhanced STT with Indian accents and kids' speech processing"""
+        memo = _transcript_memo.get()
+        if memo is None:
+            return await self._transcribe(audio_data)
         
-        # Split by sentences first for natural boundaries
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        chunks = []
-        current_chunk = ""
+        audio_key = hashlib.sha1(audio_data).hexdigest()
+        if audio_key in memo:
+            self.stt_metrics["memo_hits"] += 1
+            logger.info("♻️ STT memo hit: reusing transcript for this request")
+            return memo[audio_key]
         
-        for sentence in sentences:
-            # Check if adding sentence exceeds limit
-            if len(current_chunk) + len(sentence) + 1 <= max_chunk_size:
-                current_chunk += sentence + " "
-            else:
-                # Save current chunk and start new one
-                if current_chunk.strip():
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence + " "
+        # Empty results are memoized too, so fallback paths don't send unintelligible audio again
+        transcript = await self._transcribe(audio_data)
+        memo[audio_key] = transcript
+        return transcript
+
+    async def _transcribe(self, audio_data: bytes) -> Optional[str]:
+        """One Deepgram STT pass plus kids' speech post-processing.
+
+        NO_SPEECH when the clip holds no words, None when transcription failed.
+        """
+        start_time = time.time()
+        self.stt_metrics["bytes_in"] += len(audio_data)
         
-        # Add final chunk
-        if current_chunk.strip():
-            chunks.append(current_chunk.strip())
+        # Trim silence / downsample locally off the event loop; clips without speech never reach Deepgram
+        if self.stt_preprocess:
+            try:
+                prepared = await asyncio.to_thread(preprocess_for_stt, audio_data)
+            except Exception as e:
+                logger.warning(f"⚠️ STT preprocessing skipped: {str(e)}")
+                prepared = None
+            if prepared is not None:
+                if not prepared["has_speech"]:
+                    self.stt_metrics["vad_rejected"] += 1
+                    logger.info(f"🔇 VAD: no speech in {prepared['original_seconds']}s clip - skipping STT")
+                    return NO_SPEECH
+                audio_data = prepared["audio"]
         
-        return chunks
-
-    async def speech_to_text_streaming(self, audio_data: bytes) -> str:
-        """Enhanced STT with Indian accents and kids' speech processing"""
+        self.stt_metrics["requests"] += 1
+        self.stt_metrics["bytes_sent"] += len(audio_data)
         try:
-            start_time = time.time()
             logger.info(f"🎤 ENHANCED STT: Processing {len(audio_data)} bytes")
             
-            headers = {
-                "Authorization": f"Token {self.deepgram_api_key}",
-                "Content-Type": "audio/wav"
-            }
-            
-            # Enhanced parameters for Indian kids' speech
-            params = {
-                "model": "nova-2",
-                "language": "en-IN",  # Indian English
-                "smart_format": "true",
-                "punctuate": "true",
-                "diarize": "false",
-                "filler_words": "false",
-                "numerals": "true",
-                "paragraphs": "true",
-                "endpointing": "300",
-                "interim_results": "false",
-                "utterances": "true",
-                "profanity_filter": "true",
-                "alternatives": "1"
-            }
-            
-            response = requests.post(
-                f"{self.base_url}/listen",
-                headers=headers,
-                params=params,
-                data=audio_data,
-                timeout=8
-            )
-            
+            result = await self._request_deepgram_stt(audio_data)
             processing_time = time.time() - start_time
             
-            if response.status_code == 200:
-                result = response.json()
-                
-                if result.get("results") and result["results"].get("channels"):
-                    channel = result["results"]["channels"][0]
-                    if channel.get("alternatives") and len(channel["alternatives"]) > 0:
-                        raw_transcript = channel["alternatives"][0].get("transcript", "")
-                        
-                        if raw_transcript.strip():
-                            # Apply enhanced processing for Indian kids' speech
-                            enhanced_transcript = await self.enhance_indian_kids_speech(raw_transcript)
-                            logger.info(f"✅ ENHANCED STT: '{enhanced_transcript}' ({processing_time:.2f}s)")
-                            return enhanced_transcript
-            
-            logger.warning("⚠️ STT returned empty or invalid response")
+            if result and result.get("results") and result["results"].get("channels"):
+                channel = result["results"]["channels"][0]
+                if channel.get("alternatives") and len(channel["alternatives"]) > 0:
+                    raw_transcript = channel["alternatives"][0].get("transcript", "")
+                    
+                    if raw_transcript.strip():
+                        # Apply enhanced processing for Indian kids' speech
+                        enhanced_transcript = await self.enhance_indian_kids_speech(raw_transcript)
+                        self._record_stt_latency(processing_time, success=True)
+                        logger.info(f"✅ ENHANCED STT: '{enhanced_transcript}' ({processing_time:.2f}s)")
+                        return enhanced_transcript
+            
+            if result is not None:
+                self.stt_metrics["empty_transcripts"] += 1
+                self._record_stt_latency(processing_time, success=True)
+                logger.info("🔇 STT heard no words")
+                return NO_SPEECH
+            self._record_stt_latency(processing_time, success=False)
+            logger.warning("⚠️ STT returned no response")
             return None
             
         except Exception as e:
+            self._record_stt_latency(time.time() - start_time, success=False)
             logger.error(f"❌ Enhanced STT error: {str(e)}")
             return None
 
+    def open_streaming_stt(self, encoding: Optional[str] = None, sample_rate: Optional[int] = None) -> DeepgramStreamingSession:
+        """Live recognizer on the shared pool - use as `async with voice_agent.open_streaming_stt() as stt`"""
+        return DeepgramStreamingSession(self.http_pool, self.deepgram_api_key, encoding=encoding, sample_rate=sample_rate)
+
+    @staticmethod
+    def _sniff_audio_content_type(audio_data: bytes) -> str:
+        """Container type from magic bytes - raw uploads arrive as WAV, WebM or Ogg"""
+        head = bytes(audio_data[:4])
+        if head == b"\x1aE\xdf\xa3":
+            return "audio/webm"
+        if head == b"OggS":
+            return "audio/ogg"
+        return "audio/wav"
+
+    async def _request_deepgram_stt(self, audio_data: bytes, content_type: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """POST audio to Deepgram /listen on the shared pool with timeout and retry policy"""
+        headers = {
+            "Authorization": f"Token {self.deepgram_api_key}",
+            "Content-Type": content_type or self._sniff_audio_content_type(audio_data)
+        }
+        
+        # Enhanced parameters for Indian kids' speech
+        params = {
+            "model": "nova-2",
+            "language": "en-IN",  # Indian English
+            "smart_format": "true",
+            "punctuate": "true",
+            "diarize": "false",
+            "filler_words": "false",
+            "numerals": "true",
+            "paragraphs": "true",
+            "endpointing": "300",
+            "interim_results": "false",
+            "utterances": "true",
+            "profanity_filter": "true",
+            "alternatives": "1"
+        }
+        
+        timeout = aiohttp.ClientTimeout(total=self.stt_timeout)
+        
+        for attempt in range(self.stt_max_retries + 1):
+            retryable = False
+            try:
+                async with self.http_pool.post(
+                    "/v1/listen",
+                    headers=headers,
+                    params=params,
+                    data=audio_data,
+                    timeout=timeout
+                ) as response:
+                    if response.status == 200:
+                        return await response.json()
+                    
+                    error_text = await response.text()
+                    if response.status == 429:
+                        self.stt_metrics["rate_limited"] += 1
+                        retryable = True
+                    elif response.status >= 500:
+                        retryable = True
+                    logger.warning(f"⚠️ STT API error {response.status}: {error_text[:200]}")
+                    
+            except asyncio.TimeoutError:
+                self.stt_metrics["timeouts"] += 1
+                retryable = True
+                logger.warning(f"⚠️ STT timeout after {self.stt_timeout}s (attempt {attempt + 1})")
+            except aiohttp.ClientError as e:
+                retryable = True
+                logger.warning(f"⚠️ STT connection error: {str(e)} (attempt {attempt + 1})")
+            
+            if not retryable or attempt >= self.stt_max_retries:
+                break
+            
+            self.stt_metrics["retries"] += 1
+            await asyncio.sleep(self.stt_retry_delays[min(attempt, len(self.stt_retry_delays) - 1)])
+        
+        return None
+
+    def _record_stt_latency(self, latency: float, success: bool) -> None:
+        """Update STT latency/outcome counters"""
+        self.stt_metrics["successes" if success else "failures"] += 1
+        self.stt_metrics["total_latency"] += latency
+        self.stt_metrics["last_latency"] = latency
+        self.stt_metrics["max_latency"] = max(self.stt_metrics["max_latency"], latency)
+
+    # Ambient listening - thin async wrappers over AmbientListeningEngine
+
+    async def start_ambient_listening(self, session_id: str, user_profile: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Begin wake-word listening for a session"""
+        return self.ambient.start(session_id, user_profile)
+
+    async def process_ambient_audio(self, audio_data: bytes, session_id: str) -> Dict[str, Any]:
+        """Buffer an ambient audio chunk; only endpointed speech segments reach STT"""
+        return await self.ambient.process(session_id, audio_data)
+
+    async def stop_ambient_listening(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Stop one session (or all) and free its ring buffer"""
+        return self.ambient.stop(session_id)
+
+    async def handle_conversation_timeout(self, session_id: Optional[str] = None) -> Dict[str, Any]:
+        """Return idle post-wake-word conversations to listening mode"""
+        return self.ambient.handle_timeouts(session_id)
+
+    async def _transcribe_ambient_segment(self, samples, sample_rate: int) -> Optional[str]:
+        pcm = samples.astype("<i2").tobytes()
+        return await self._transcribe(build_wav_header(len(pcm), sample_rate) + pcm)
+
+    def get_stt_metrics(self) -> Dict[str, Any]:
+        """STT counters with average latency"""
+        metrics = dict(self.stt_metrics)
+        completed = metrics["successes"] + metrics["failures"]
+        metrics["avg_latency"] = metrics["total_latency"] / completed if completed else 0.0
+        return metrics
+
     async def enhance_indian_kids_speech(self, transcript: str) -> str:
         """Enhanced processing for Indian kids' speech patterns"""
         if not transcript:
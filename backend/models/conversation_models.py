@@ -47,6 +47,7 @@ class TextInput(BaseModel):
     session_id: str
     user_id: str
     message: str
+    text_only: bool = False  # Skip the TTS stage (e.g. captions-only clients)
 
 class StorySession(BaseModel):
     """Story session tracking for continuation"""
@@ -1,17 +1,18 @@
 """
 AI Companion Device Backend - Multi-Agent Architecture
 """
-from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
+import asyncio
 import logging
 from pathlib import Path
 import base64
 import json
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, AsyncIterator
 from datetime import datetime
 import time
 
@@ -23,6 +24,7 @@ from models.content_models import ContentCreate, ContentUpdate, ContentSuggestio
 
 # Import agents
 from agents.orchestrator import OrchestratorAgent
+from agents.voice_agent import NO_SPEECH
 
 # Load environment variables
 ROOT_DIR = Path(__file__).parent
@@ -520,7 +522,7 @@ async def get_stories():
         raise HTTPException(status_code=500, detail="Failed to fetch stories")
 
 @api_router.post("/content/stories/{story_id}/narrate")
-async def narrate_story(story_id: str, user_id: str = Form(...)):
+async def narrate_story(story_id: str, http_request: Request, user_id: str = Form(...), format: Optional[str] = None):
     """OPTIMIZED: Serve pre-cached story audio - No real-time generation"""
     try:
         logger.info(f"🎵 SERVING CACHED STORY AUDIO: {story_id} for user {user_id}")
@@ -543,6 +545,8 @@ async def narrate_story(story_id: str, user_id: str = Form(...)):
         
         if cached_audio:
             logger.info(f"✅ SERVING CACHED AUDIO: {story_title} ({len(cached_audio)} chars)")
+            if _wants_binary_audio(http_request, format):
+                return _binary_audio_response(cached_audio, {"X-Story-Id": story_id, "X-Audio-Source": "cached"})
             return {
                 "status": "success",
                 "response_text": story_text,
@@ -582,6 +586,7 @@ async def clear_content_cache():
         # Clear in-memory cache
         orchestrator.enhanced_content_agent.content_cache.clear()
         orchestrator.enhanced_content_agent.story_audio_cache.clear()
+        await orchestrator.voice_agent.tts_cache.clear()
         
         return {
             "status": "success",
@@ -620,7 +625,8 @@ async def get_cache_stats():
             "memory_cache": {
                 "content_cache_size": memory_cache_size,
                 "audio_cache_size": audio_cache_size
-            }
+            },
+            "tts_audio_cache": orchestrator.voice_agent.tts_cache.get_stats()
         }
         
     except Exception as e:
@@ -667,9 +673,109 @@ async def generate_story_audio_cache(force_regenerate: bool = False):
         }
 
 # Voice Processing Endpoints
-# Voice Processing Endpoints
+def _wants_binary_audio(http_request: Request, format: Optional[str] = None) -> bool:
+    """Binary audio is opt-in via ?format=binary or an audio/* Accept header - JSON stays the default"""
+    if format and format.lower() in ("binary", "wav"):
+        return True
+    accept = http_request.headers.get("accept", "").lower()
+    return any(media_type in accept for media_type in ("audio/wav", "audio/x-wav", "audio/*"))
+
+def _binary_audio_response(audio_base64: str, headers: Dict[str, str] = None) -> Response:
+    """Raw WAV bytes for audio that is already fully synthesized"""
+    return Response(content=base64.b64decode(audio_base64), media_type="audio/wav", headers=headers or {})
+
+async def _streaming_audio_response(audio_stream: AsyncIterator[bytes], headers: Dict[str, str] = None) -> StreamingResponse:
+    """Chunked WAV response; the first piece is awaited up front so failures still map to HTTP errors"""
+    try:
+        first_piece = await audio_stream.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="TTS generation failed")
+    except Exception as e:
+        logger.error(f"❌ Streaming TTS error: {str(e)}")
+        await audio_stream.aclose()
+        raise HTTPException(status_code=500, detail="TTS generation failed")
+    
+    async def body():
+        yield first_piece
+        async for piece in audio_stream:
+            yield piece
+    
+    return StreamingResponse(body(), media_type="audio/wav", headers=headers or {})
+
+RAW_AUDIO_CONTENT_TYPES = ("audio/", "application/octet-stream")
+
+async def _read_voice_upload(http_request: Request, audio: Optional[UploadFile] = None, audio_base64: Optional[str] = None) -> bytes:
+    """Microphone audio from a raw audio/* body, an 'audio' multipart part, or the legacy base64 field"""
+    content_type = http_request.headers.get("content-type", "").lower()
+    if content_type.startswith(RAW_AUDIO_CONTENT_TYPES):
+        return await http_request.body()
+    if audio is not None:
+        return await audio.read()
+    if audio_base64:
+        try:
+            return base64.b64decode(audio_base64)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid base64 audio data")
+    raise HTTPException(status_code=400, detail="Audio is required (raw audio body, 'audio' file part or audio_base64)")
+
+def _voice_upload_field(http_request: Request, value: Optional[str], name: str, default: Optional[str] = None) -> Optional[str]:
+    """Form value, falling back to the query string for raw-body uploads"""
+    return value or http_request.query_params.get(name) or default
+
+def _wants_ndjson(http_request: Request, format: Optional[str] = None) -> bool:
+    """Event streams are SSE unless ?format=ndjson or an application/x-ndjson Accept header asks otherwise"""
+    if format:
+        return format.lower() == "ndjson"
+    return "application/x-ndjson" in http_request.headers.get("accept", "").lower()
+
+def _event_stream_response(events: AsyncIterator[Dict[str, Any]], http_request: Request, format: Optional[str] = None,
+                           session_id: Optional[str] = None, audio: Optional[str] = None) -> StreamingResponse:
+    """Pipeline events as Server-Sent Events (default) or NDJSON, one event per stage output.
+
+    Story chunk audio events carry a /api/stories/chunk-audio URL instead of the audio
+    itself unless ?audio=inline; conversation sentence audio is always inline.
+    """
+    ndjson = _wants_ndjson(http_request, format)
+    inline_audio = (audio or "").lower() == "inline"
+    
+    async def body():
+        try:
+            async for event in events:
+                if event.get("type") == "audio" and "chunk_id" in event:
+                    if event["ready"] and session_id:
+                        event["url"] = f"/api/stories/chunk-audio/{session_id}/{event['chunk_id']}"
+                    if not inline_audio:
+                        event.pop("audio_base64", None)
+                payload = json.dumps(event, default=str)
+                yield f"{payload}\n" if ndjson else f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+        finally:
+            await events.aclose()
+    
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson" if ndjson else "text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def _streaming_user_profile(user_id: str) -> Dict[str, Any]:
+    """User profile as a dict for the streaming endpoints - a default profile when missing or unreadable"""
+    default_profile = {"id": user_id, "name": "Demo Kid", "age": 7, "voice_personality": "friendly_companion"}
+    try:
+        user_profile = await get_user_profile(user_id)
+    except HTTPException as e:
+        if e.status_code != 404:
+            raise
+        logger.info(f"User profile not found for {user_id}, using default profile")
+        return default_profile
+    except Exception as e:
+        logger.warning(f"Error retrieving user profile for {user_id}: {str(e)}, using default")
+        return default_profile
+    if hasattr(user_profile, 'dict'):
+        return user_profile.dict()
+    return dict(getattr(user_profile, '__dict__', None) or default_profile)
+
 @api_router.post("/voice/tts")
-async def text_to_speech_simple(request: dict):
+async def text_to_speech_simple(request: dict, http_request: Request, format: Optional[str] = None):
     """Simple TTS endpoint for initial greetings and basic text-to-speech"""
     try:
         if not orchestrator:
@@ -686,6 +792,13 @@ async def text_to_speech_simple(request: dict):
         # Generate TTS audio using voice agent with proper chunking for long texts
         voice_agent = orchestrator.voice_agent
         
+        # Binary mode: stream WAV bytes chunk by chunk as they are synthesized
+        if _wants_binary_audio(http_request, format):
+            return await _streaming_audio_response(
+                voice_agent.stream_speech_wav(text, personality),
+                {"X-Voice-Personality": personality}
+            )
+        
         # Use chunked processing for texts over 1500 characters
         if len(text) > 1500:
             response_audio = await voice_agent.text_to_speech_chunked(text, personality)
@@ -791,6 +904,8 @@ async def process_story_streaming(request: dict):
                 "remaining_chunks": result["remaining_chunks"],
                 "total_chunks": result["total_chunks"],
                 "total_words": result["total_words"],
+                "more_chunks": result["more_chunks"],
+                "text_complete": result["text_complete"],
                 "content_type": "story",
                 "metadata": result["metadata"]
             }
@@ -805,7 +920,7 @@ async def process_story_streaming(request: dict):
         }
 
 @api_router.post("/stories/chunk-tts") 
-async def generate_story_chunk_tts(request: dict):
+async def generate_story_chunk_tts(request: dict, http_request: Request, format: Optional[str] = None):
     """Generate TTS audio for individual story chunk with deduplication"""
     try:
         if not orchestrator:
@@ -834,6 +949,9 @@ async def generate_story_chunk_tts(request: dict):
         # Generate TTS for chunk with session support
         result = await orchestrator.process_story_chunk_tts(chunk_text, chunk_id, user_profile, session_id)
         
+        if result.get("status") == "success" and _wants_binary_audio(http_request, format):
+            return _binary_audio_response(result["audio_base64"], {"X-Chunk-Id": str(chunk_id)})
+        
         return result
         
     except Exception as e:
@@ -843,8 +961,127 @@ async def generate_story_chunk_tts(request: dict):
             "error": str(e)
         }
 
+@api_router.post("/stories/playback")
+async def report_story_playback(request: dict):
+    """Playback heartbeat for a streamed story - paces background synthesis of the chunks ahead"""
+    try:
+        if not orchestrator:
+            raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+        
+        session_id = request.get("session_id", "")
+        if not session_id:
+            raise HTTPException(status_code=400, detail="Missing required field: session_id")
+        
+        position = request.get("position_seconds")
+        return orchestrator.report_story_playback(
+            session_id,
+            int(request.get("chunk_id", 0)),
+            float(position) if position is not None else None
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Story playback report error: {str(e)}")
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+
+@api_router.post("/stories/stream/events")
+async def stream_story_events(request: dict, http_request: Request, format: Optional[str] = None, audio: Optional[str] = None):
+    """Progressive story delivery over one connection: SSE (or NDJSON) events for each chunk's
+    text as it is written, each chunk's audio as it is synthesized, and completion metadata"""
+    if not orchestrator:
+        raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+    
+    session_id = request.get("session_id", "")
+    user_id = request.get("user_id", "")
+    user_input = request.get("text", "")
+    
+    if not all([session_id, user_id, user_input]):
+        raise HTTPException(status_code=400, detail="Missing required fields: session_id, user_id, text")
+    
+    logger.info(f"🎭 STORY EVENT STREAM: '{user_input[:50]}...' for user {user_id}")
+    user_profile = await _streaming_user_profile(user_id)
+    context = await orchestrator._get_conversation_context(session_id)
+    
+    return _event_stream_response(
+        orchestrator.stream_story_events(session_id, user_input, user_profile, context),
+        http_request, format, session_id=session_id, audio=audio
+    )
+
+@api_router.get("/stories/chunks/{session_id}")
+async def get_story_chunks(session_id: str, after: int = -1, wait: float = 0.0):
+    """Story chunks written after chunk `after` - the rest of a story whose response had more_chunks.
+    ?wait=N holds the request up to N seconds (max 30) for the story to finish writing."""
+    if not orchestrator:
+        raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+    return await orchestrator.get_story_chunks(session_id, after, min(max(wait, 0.0), 30.0))
+
+@api_router.get("/stories/chunk-audio/{session_id}/{chunk_id}")
+async def get_story_chunk_audio(session_id: str, chunk_id: int):
+    """WAV for a chunk announced by an audio event of /stories/stream/events (waits if still synthesizing)"""
+    if not orchestrator:
+        raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+    
+    # The client fetches a chunk as the one before it starts playing - keeps the prefetch from going idle
+    orchestrator.report_story_playback(session_id, chunk_id - 1)
+    synthesis = orchestrator.chunk_audio.find(session_id, chunk_id)
+    if synthesis is None:
+        raise HTTPException(status_code=404, detail="No audio for this chunk")
+    try:
+        # Shielded: a dropped request must not cancel a synthesis the prefetch shares
+        audio_base64 = await asyncio.shield(synthesis)
+    except asyncio.CancelledError:
+        if not synthesis.cancelled():
+            raise
+        audio_base64 = None
+    if not audio_base64:
+        raise HTTPException(status_code=404, detail="No audio for this chunk")
+    return _binary_audio_response(audio_base64, {"X-Chunk-Id": str(chunk_id)})
+
+@api_router.post("/conversations/stream")
+async def stream_conversation_text(request: dict, http_request: Request, format: Optional[str] = None):
+    """Text turn as SSE (or NDJSON) events: reply sentences as they are written, each sentence's
+    audio as it is synthesized, then the turn result"""
+    if not orchestrator:
+        raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+    
+    session_id = request.get("session_id", "")
+    user_id = request.get("user_id", "")
+    message = (request.get("message") or "").strip()
+    
+    if not all([session_id, user_id, message]):
+        raise HTTPException(status_code=400, detail="Missing required fields: session_id, user_id, message")
+    
+    user_profile = await _streaming_user_profile(user_id)
+    return _event_stream_response(orchestrator.stream_turn_events(session_id, user_profile, text=message), http_request, format)
+
+@api_router.post("/voice/stream")
+async def stream_voice_turn(
+    http_request: Request,
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    audio_base64: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None),
+    format: Optional[str] = None
+):
+    """Voice turn as SSE (or NDJSON) events: the transcript first, then as /conversations/stream"""
+    if not orchestrator:
+        raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+    
+    session_id = _voice_upload_field(http_request, session_id, "session_id")
+    user_id = _voice_upload_field(http_request, user_id, "user_id")
+    if not session_id or not user_id:
+        raise HTTPException(status_code=400, detail="session_id and user_id are required")
+    
+    audio_data = await _read_voice_upload(http_request, audio, audio_base64)
+    user_profile = await _streaming_user_profile(user_id)
+    return _event_stream_response(orchestrator.stream_turn_events(session_id, user_profile, audio_data=audio_data), http_request, format)
+
 @api_router.post("/voice/tts/chunk")
-async def generate_audio_chunk(request: dict):
+async def generate_audio_chunk(request: dict, http_request: Request, format: Optional[str] = None):
     """Generate audio for a specific text chunk"""
     try:
         if not orchestrator:
@@ -861,6 +1098,8 @@ async def generate_audio_chunk(request: dict):
         audio_base64 = await voice_agent.generate_chunk_audio(text, personality)
         
         if audio_base64:
+            if _wants_binary_audio(http_request, format):
+                return _binary_audio_response(audio_base64)
             return {
                 "status": "success",
                 "audio_base64": audio_base64
@@ -880,18 +1119,25 @@ async def generate_audio_chunk(request: dict):
 
 @api_router.post("/voice/process_audio")
 async def process_voice_input(
-    session_id: str = Form(...),
-    user_id: str = Form(...),
-    audio_base64: str = Form(...)
+    http_request: Request,
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    audio_base64: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None)
 ):
     """ULTRA-LOW LATENCY: Process voice input with streaming pipeline"""
+    session_id = _voice_upload_field(http_request, session_id, "session_id")
+    user_id = _voice_upload_field(http_request, user_id, "user_id")
+    if not session_id or not user_id:
+        raise HTTPException(status_code=400, detail="session_id and user_id are required")
+    
     try:
         import time
         start_time = time.time()
         logger.info(f"🚀 ULTRA-FAST voice processing started for session {session_id}")
         
-        # Convert base64 to bytes
-        audio_data = base64.b64decode(audio_base64)
+        # Raw/multipart audio is used as-is; base64 form field is decoded for older clients
+        audio_data = await _read_voice_upload(http_request, audio, audio_base64)
         logger.info(f"📥 Audio data received: {len(audio_data)} bytes")
         
         # Get user profile with proper exception handling
@@ -923,10 +1169,12 @@ async def process_voice_input(
             user_profile = {"id": user_id, "name": "Demo Kid", "age": 7, "voice_personality": "friendly_companion"}
         
         # SMART AUTO-SELECTION: First get transcript to determine optimal pipeline
+        # The transcript is handed to the selected pipeline; the request memo covers any fallback path
+        orchestrator.voice_agent.begin_transcript_scope()
         try:
             # Quick STT to analyze user intent
             transcript = await orchestrator.voice_agent.speech_to_text(audio_data)
-            logger.info(f"🧠 SMART ROUTING: Analyzing transcript: '{transcript[:100]}...'")
+            logger.info(f"🧠 SMART ROUTING: Analyzing transcript: '{(transcript or '')[:100]}...'")
             
             # Smart pipeline selection based on content
             def should_use_fast_pipeline(text):
@@ -978,7 +1226,12 @@ async def process_voice_input(
             
             is_story_request = any(keyword in transcript.lower() for keyword in story_keywords) if transcript else False
             
-            if is_story_request:
+            if transcript == NO_SPEECH:
+                # Nothing was said - answer at once instead of running a pipeline on an empty transcript
+                logger.info("🔇 SMART ROUTING: No speech in the clip")
+                result = await orchestrator._canned_reply("no_speech", user_profile, transcript=NO_SPEECH)
+                result["selected_pipeline"] = "no_speech"
+            elif is_story_request:
                 logger.info("🎭 SMART ROUTING: Using STORY STREAMING pipeline for progressive experience")
                 try:
                     # Get conversation context
@@ -1000,35 +1253,40 @@ async def process_voice_input(
                                 "chunk_id": 0,
                                 "total_chunks": story_result["total_chunks"],
                                 "total_words": story_result["total_words"],
-                                "remaining_chunks": story_result["remaining_chunks"]
+                                "remaining_chunks": story_result["remaining_chunks"],
+                                "more_chunks": story_result["more_chunks"],
+                                "text_complete": story_result["text_complete"]
                             },
                             "selected_pipeline": "story_streaming"
                         }
+                    elif story_result.get("interrupted"):
+                        # Superseded by the child's next utterance - do not start a fallback turn
+                        result = story_result
                     else:
                         # Story streaming failed, fallback to regular processing
                         logger.warning("Story streaming failed, using enhanced pipeline")
-                        result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile)
+                        result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile, transcript=transcript)
                         result["selected_pipeline"] = "story_fallback"
                         
                 except Exception as story_error:
                     logger.error(f"❌ Story streaming error: {str(story_error)}")
                     # Fallback to enhanced processing
-                    result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile)
+                    result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile, transcript=transcript)
                     result["selected_pipeline"] = "story_error_fallback"
                     
             elif use_fast:
                 logger.info("🚀 SMART ROUTING: Using ULTRA-FAST pipeline")
-                result = await orchestrator.process_voice_input_fast(session_id, audio_data, user_profile)
+                result = await orchestrator.process_voice_input_fast(session_id, audio_data, user_profile, transcript=transcript)
                 result["selected_pipeline"] = "ultra_fast"
             else:
                 logger.info("🎭 SMART ROUTING: Using FULL pipeline for complete experience")
                 # Try streaming first, then fallback to enhanced
                 try:
-                    result = await orchestrator.process_voice_streaming(session_id, audio_data, user_profile)
+                    result = await orchestrator.process_voice_streaming(session_id, audio_data, user_profile, transcript=transcript)
                     result["selected_pipeline"] = "full_streaming"
                 except Exception as e:
                     logger.warning(f"Streaming failed, using enhanced: {str(e)}")
-                    result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile)
+                    result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile, transcript=transcript)
                     result["selected_pipeline"] = "full_enhanced"
                     
         except Exception as selection_error:
@@ -1042,6 +1300,10 @@ async def process_voice_input(
                 result = await orchestrator.process_voice_input_enhanced(session_id, audio_data, user_profile)
                 result["selected_pipeline"] = "fallback_enhanced"
         
+        # Barge-in superseded this request; the newer one owns the response
+        if result.get("interrupted"):
+            return {"status": "interrupted", "transcript": result.get("transcript", ""), "message": "Superseded by newer input"}
+        
         # Measure total latency
         total_latency = time.time() - start_time
         logger.info(f"⚡ TOTAL VOICE PROCESSING LATENCY: {total_latency:.2f}s")
@@ -1083,6 +1345,9 @@ async def process_voice_input(
             "smart_routing": "enabled"
         }
         
+    except HTTPException:
+        # Missing/invalid upload is a client error, not a 200 error body
+        raise
     except Exception as e:
         logger.error(f"❌ Voice processing error: {str(e)}")
         return {
@@ -1170,7 +1435,8 @@ async def process_text_input(text_input: TextInput):
         result = await orchestrator.process_text_input(
             text_input.session_id,
             text_input.message,
-            user_profile
+            user_profile,
+            text_only=text_input.text_only
         )
         
         if "error" in result:
@@ -1262,61 +1528,35 @@ async def process_voice_input(request: dict):
             logger.error(f"❌ Base64 decode error: {str(decode_error)}")
             raise HTTPException(status_code=400, detail="Invalid base64 audio data")
         
-        # Get or create user profile
-        user_profile = await db.user_profiles.find_one({"id": user_id})
-        if not user_profile:
-            # Create a default user profile
-            user_profile = {
-                "id": user_id,
-                "name": "Test Child",
-                "age": 8,
-                "language": "english",
-                "voice_personality": "friendly_companion",
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
-            await db.user_profiles.insert_one(user_profile)
-            logger.info(f"✅ Created default user profile: {user_id}")
-        
-        # Process through voice agent (STT)
-        voice_agent = orchestrator.voice_agent
-        transcript = await voice_agent.speech_to_text(audio_data)
-        
-        if not transcript:
-            return {
-                "status": "no_speech",
-                "response_text": "I didn't catch that. Could you please repeat?",
-                "response_audio": None,
-                "transcript": ""
-            }
-        
-        logger.info(f"🎤 STT result: '{transcript}'")
+        return await _process_conversation_voice(session_id, user_id, audio_data)
         
-        # Process through conversation agent (LLM)
-        conversation_agent = orchestrator.conversation_agent
-        response = await conversation_agent.generate_response(
-            user_input=transcript,
-            user_profile=user_profile,
-            conversation_context=[]  # Simple context for now
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Voice processing error: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Voice processing failed: {str(e)}")
+
+@api_router.post("/conversations/voice/audio")
+async def process_voice_audio_upload(
+    http_request: Request,
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None)
+):
+    """Binary variant of /conversations/voice - raw audio/* body or multipart 'audio' part, no base64"""
+    try:
+        if not orchestrator:
+            raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
         
-        # Generate TTS audio
-        response_audio = await voice_agent.text_to_speech(
-            response['text'],
-            user_profile.get('voice_personality', 'friendly_companion')
-        )
+        session_id = _voice_upload_field(http_request, session_id, "session_id")
+        user_id = _voice_upload_field(http_request, user_id, "user_id", "test_user")
         
-        result = {
-            "status": "success",
-            "response_text": response['text'],
-            "response_audio": response_audio,
-            "transcript": transcript,
-            "content_type": response.get('content_type', 'conversation'),
-            "processing_time": response.get('processing_time', 0.0)
-        }
+        audio_data = await _read_voice_upload(http_request, audio)
+        if not audio_data:
+            raise HTTPException(status_code=400, detail="Audio body is empty")
         
-        logger.info(f"✅ Voice processing complete: '{response['text'][:100]}...'")
-        return result
+        logger.info(f"🎤 Processing binary voice input: session={session_id}, audio_bytes={len(audio_data)}")
+        return await _process_conversation_voice(session_id, user_id, audio_data)
         
     except HTTPException:
         raise
@@ -1324,6 +1564,61 @@ async def process_voice_input(request: dict):
         logger.error(f"❌ Voice processing error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Voice processing failed: {str(e)}")
 
+async def _process_conversation_voice(session_id: Optional[str], user_id: str, audio_data: bytes) -> Dict[str, Any]:
+    """STT -> conversation -> TTS for /conversations/voice and its binary variant"""
+    # Get or create user profile
+    user_profile = await db.user_profiles.find_one({"id": user_id})
+    if not user_profile:
+        # Create a default user profile
+        user_profile = {
+            "id": user_id,
+            "name": "Test Child",
+            "age": 8,
+            "language": "english",
+            "voice_personality": "friendly_companion",
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        await db.user_profiles.insert_one(user_profile)
+        logger.info(f"✅ Created default user profile: {user_id}")
+    
+    # Process through voice agent (STT)
+    voice_agent = orchestrator.voice_agent
+    transcript = await voice_agent.speech_to_text(audio_data)
+    
+    if transcript == NO_SPEECH:
+        return await orchestrator._canned_reply("no_speech", user_profile, status="no_speech", transcript="")
+    if not transcript:
+        return await orchestrator._canned_reply("trouble", user_profile, status="stt_error", transcript="")
+    
+    logger.info(f"🎤 STT result: '{transcript}'")
+    
+    # Process through conversation agent (LLM)
+    conversation_agent = orchestrator.conversation_agent
+    response = await conversation_agent.generate_response(
+        user_input=transcript,
+        user_profile=user_profile,
+        conversation_context=[]  # Simple context for now
+    )
+    
+    # Generate TTS audio
+    response_audio = await voice_agent.text_to_speech(
+        response['text'],
+        user_profile.get('voice_personality', 'friendly_companion')
+    )
+    
+    result = {
+        "status": "success",
+        "response_text": response['text'],
+        "response_audio": response_audio,
+        "transcript": transcript,
+        "content_type": response.get('content_type', 'conversation'),
+        "processing_time": response.get('processing_time', 0.0)
+    }
+    
+    logger.info(f"✅ Voice processing complete: '{response['text'][:100]}...'")
+    return result
+
 # Voice Personalities
 @api_router.get("/voice/personalities")
 async def get_voice_personalities():
@@ -1374,6 +1669,31 @@ async def start_ambient_listening(request: dict):
         logger.error(f"Error starting ambient listening: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to start ambient listening")
 
+@api_router.post("/ambient/process")
+async def process_ambient_audio(
+    http_request: Request,
+    session_id: Optional[str] = Form(None),
+    audio_base64: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None)
+):
+    """Feed an ambient audio chunk (raw PCM/WAV body, multipart or base64) to the wake-word listener"""
+    try:
+        if not orchestrator:
+            raise HTTPException(status_code=500, detail="Multi-agent system not initialized")
+        
+        session_id = _voice_upload_field(http_request, session_id, "session_id")
+        if not session_id:
+            raise HTTPException(status_code=400, detail="session_id is required")
+        
+        audio_data = await _read_voice_upload(http_request, audio, audio_base64)
+        return await orchestrator.process_ambient_audio(session_id, audio_data)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing ambient audio: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to process ambient audio")
+
 @api_router.post("/ambient/stop")
 async def stop_ambient_listening(request: dict):
     """Stop ambient listening session"""
@@ -1408,7 +1728,8 @@ async def get_ambient_status(session_id: str):
             "status": "active", 
             "session_id": session_id,
             "start_time": session_data.get("start_time"),
-            "interaction_count": session_data.get("interaction_count", 0)
+            "interaction_count": session_data.get("interaction_count", 0),
+            "listener": orchestrator.voice_agent.ambient.get_session_status(session_id)
         }
         
     except Exception as e:
@@ -1710,7 +2031,8 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
                 result = await orchestrator.process_text_input(
                     message_data["session_id"],
                     message_data["message"],
-                    user_profile
+                    user_profile,
+                    text_only=message_data.get("text_only", False)
                 )
                 
                 await websocket.send_text(json.dumps(result))
@@ -1732,6 +2054,107 @@ async def websocket_endpoint(websocket: WebSocket, user_id: str):
         logger.error(f"WebSocket error: {str(e)}")
         await websocket.send_text(json.dumps({"error": "Connection error"}))
 
+# Streaming voice channel: audio frames in, interim/final transcripts and responses out
+@api_router.websocket("/voice/stream/{session_id}")
+async def voice_stream_endpoint(websocket: WebSocket, session_id: str, user_id: str = "test_user",
+                                encoding: Optional[str] = None, sample_rate: Optional[int] = None):
+    """Forward microphone frames to streaming STT as they are captured and answer each endpointed utterance.
+
+    Client sends binary audio frames plus JSON controls {"type": "finalize"} / {"type": "stop"}.
+    Server sends {"type": "transcript", "is_final", "text"}, {"type": "utterance", "text"},
+    {"type": "audio", "index", "text", "audio"} for each reply sentence as soon as it is
+    synthesized, and {"type": "response", ...pipeline result without audio} once the answer is complete.
+    """
+    await websocket.accept()
+    if not orchestrator:
+        await websocket.send_json({"type": "error", "error": "Multi-agent system not initialized"})
+        await websocket.close()
+        return
+    
+    user_profile = await db.user_profiles.find_one({"id": user_id}) or {
+        "id": user_id, "name": "Friend", "age": 7, "voice_personality": "friendly_companion"
+    }
+    user_profile.pop("_id", None)
+    
+    response_tasks = set()
+    client_connected = True
+    
+    async def send_sentence_audio(index: int, text: str, audio: Optional[str]):
+        if client_connected:
+            await websocket.send_json({"type": "audio", "index": index, "text": text, "audio": audio})
+    
+    async def respond(transcript: str):
+        # Endpointing fired - safety check and LLM start while the child is still finishing the breath
+        result = await orchestrator.process_streaming_utterance(session_id, transcript, user_profile, on_audio=send_sentence_audio)
+        result.pop("response_audio", None)  # Already delivered sentence by sentence
+        if client_connected:
+            await websocket.send_json({"type": "response", "transcript": transcript, **result})
+    
+    try:
+        async with orchestrator.voice_agent.open_streaming_stt(encoding, sample_rate) as stt:
+            async def pump_client_audio():
+                nonlocal client_connected
+                try:
+                    while True:
+                        message = await websocket.receive()
+                        if message["type"] == "websocket.disconnect":
+                            client_connected = False
+                            await stt.finish()
+                            return
+                        if message.get("bytes"):
+                            await stt.send_audio(message["bytes"])
+                        elif message.get("text"):
+                            control = json.loads(message["text"]).get("type")
+                            if control == "finalize":
+                                await stt.finalize()
+                            elif control == "stop":
+                                await stt.finish()
+                                return
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ Voice stream upload error: {str(e)}")
+                    await stt.close()
+            
+            pump_task = asyncio.create_task(pump_client_audio())
+            try:
+                async for event in stt.events():
+                    if not client_connected:
+                        break
+                    if event["type"] in ("interim", "final"):
+                        await websocket.send_json({"type": "transcript", "is_final": event["type"] == "final", "text": event["text"]})
+                    elif event["type"] == "speech_started":
+                        # Barge-in: the child is talking again - stop generating the previous answer now
+                        await orchestrator.interrupt_session(session_id)
+                        await websocket.send_json({"type": "speech_started"})
+                    elif event["type"] == "utterance":
+                        logger.info(f"🎙️ Streaming utterance: '{event['text'][:80]}'")
+                        await websocket.send_json({"type": "utterance", "text": event["text"]})
+                        task = asyncio.create_task(respond(event["text"]))
+                        response_tasks.add(task)
+                        task.add_done_callback(response_tasks.discard)
+            finally:
+                pump_task.cancel()
+        
+        if client_connected:
+            if response_tasks:
+                await asyncio.gather(*response_tasks, return_exceptions=True)
+            await websocket.close()
+            
+    except WebSocketDisconnect:
+        logger.info(f"Voice stream disconnected for session: {session_id}")
+    except Exception as e:
+        logger.error(f"❌ Voice stream error: {str(e)}")
+        if client_connected:
+            try:
+                await websocket.send_json({"type": "error", "error": "Streaming voice failed"})
+                await websocket.close()
+            except Exception:
+                pass
+    finally:
+        for task in list(response_tasks):
+            task.cancel()
+
 async def init_default_content():
     """Initialize default content if database is empty"""
     try:
@@ -1806,19 +2229,28 @@ async def test_fast_endpoint():
 
 @api_router.post("/voice/process_audio_ultra_fast")
 async def process_voice_ultra_latency(
-    session_id: str = Form(...),
-    user_id: str = Form(...),
-    audio_base64: str = Form(...)
+    http_request: Request,
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    audio_base64: Optional[str] = Form(None),
+    audio: Optional[UploadFile] = File(None)
 ):
     """ULTRA-LOW LATENCY VOICE ENDPOINT: <1 second end-to-end processing"""
+    session_id = _voice_upload_field(http_request, session_id, "session_id")
+    user_id = _voice_upload_field(http_request, user_id, "user_id")
+    if not session_id or not user_id:
+        raise HTTPException(status_code=400, detail="session_id and user_id are required")
+    
     try:
         import time
         start_time = time.time()
         logger.info(f"🚀 ULTRA-LOW LATENCY API: Starting <1s processing for session {session_id}")
         
-        # Convert base64 to bytes with ultra-fast processing
+        # Raw/multipart audio skips base64 entirely; the legacy form field is still decoded
         try:
-            audio_data = base64.b64decode(audio_base64)
+            audio_data = await _read_voice_upload(http_request, audio, audio_base64)
+        except HTTPException:
+            raise
         except Exception as decode_error:
             logger.error(f"❌ Audio decode error: {str(decode_error)}")
             return {
@@ -1871,6 +2303,8 @@ async def process_voice_ultra_latency(
             "smart_routing": "ultra_fast"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Ultra-low latency API error: {str(e)}")
         return {
@@ -1954,6 +2388,8 @@ app.add_middleware(
 @app.on_event("shutdown")
 async def shutdown_db_client():
     """Cleanup on shutdown"""
+    if orchestrator:
+        await orchestrator.shutdown()
     client.close()
 
 if __name__ == "__main__":
@@ -490,6 +490,10 @@ const SimplifiedChatInterface = ({ user, darkMode, setDarkMode, sessionId, messa
         if (isStoryStreaming) {
           console.log('🎭 STORY STREAMING DETECTED: Processing story response');
           
+          // The response only carries the chunks written so far - StoryStreamingComponent
+          // plays the first one now and fetches the rest while it plays
+          const remainingChunks = data.metadata.remaining_chunks || [];
+          
           // Create story streaming message
           const storyMessage = {
             id: Date.now() + 1,
@@ -504,9 +508,10 @@ const SimplifiedChatInterface = ({ user, darkMode, setDarkMode, sessionId, messa
                 chunk_id: 0,
                 word_count: data.response_text ? data.response_text.split(' ').length : 0
               },
-              remainingChunks: data.metadata.remaining_chunks || [],
-              totalChunks: data.metadata.total_chunks || 1,
-              totalWords: data.metadata.total_words || 0
+              remainingChunks: remainingChunks,
+              moreChunks: !!data.metadata.more_chunks,
+              totalChunks: remainingChunks.length + 1,
+              totalWords: remainingChunks.reduce((total, chunk) => total + (chunk.word_count || 0), data.response_text ? data.response_text.split(' ').length : 0)
             },
             metadata: data.metadata,
             timestamp: new Date()
@@ -981,6 +986,7 @@ const SimplifiedChatInterface = ({ user, darkMode, setDarkMode, sessionId, messa
                         <StoryStreamingComponent
                           firstChunk={message.storyData.firstChunk}
                           remainingChunks={message.storyData.remainingChunks}
+                          moreChunks={message.storyData.moreChunks}
                           totalChunks={message.storyData.totalChunks}
                           totalWords={message.storyData.totalWords}
                           sessionId={sessionId}
@@ -1,17 +1,22 @@
 import React, { useState, useEffect, useRef, useCallback } from 'react';
 import toast from 'react-hot-toast';
 
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+
+const chunkText = (chunk) => (typeof chunk === 'string' ? chunk : (chunk && chunk.text) || '');
+
 const StoryStreamingComponent = ({ 
   firstChunk, 
   remainingChunks, 
   totalChunks, 
+  moreChunks,
   sessionId, 
   userId, 
   onComplete 
 }) => {
   // SIMPLIFIED STATE MANAGEMENT - Single source of truth
   const [state, setState] = useState({
-    displayedText: '',
+    chunks: [],
     isPlaying: false,
     isLoading: false,
     currentChunkIndex: 0,
@@ -22,24 +27,32 @@ const StoryStreamingComponent = ({
   
   // SINGLE AUDIO CONTROL REF
   const audioRef = useRef(null);
-  const audioQueueRef = useRef([]);
+  const chunksRef = useRef([]);               // Story chunks written so far, in order
+  const audioCacheRef = useRef({});           // chunk index -> Promise of base64 audio
+  const writingRef = useRef(false);           // The server is still writing the story
+  const waitingForIndexRef = useRef(null);    // Playback reached a chunk that is not written yet
+  const pollRunRef = useRef(0);               // Only the latest mount's poll loop appends chunks
   const storyIdRef = useRef(`story_${Date.now()}`);
   const isActiveRef = useRef(true);
 
-  // Initialize story display
+  const setChunks = (chunks) => {
+    chunksRef.current = chunks;
+    setState(prev => ({ ...prev, chunks }));
+  };
+
+  // Show and play the first chunk straight away; the rest of the story arrives in the background
   useEffect(() => {
-    if (firstChunk && !state.displayedText) {
-      // Handle both string and object formats for firstChunk
-      const chunkText = typeof firstChunk === 'string' ? firstChunk : firstChunk.text || firstChunk;
-      
-      setState(prev => ({
-        ...prev,
-        displayedText: chunkText,
-        isLoading: true
-      }));
+    isActiveRef.current = true;
+    if (firstChunk) {
+      const first = typeof firstChunk === 'string' ? { text: firstChunk, chunk_id: 0 } : firstChunk;
+      setChunks([first, ...(remainingChunks || [])]);
+      writingRef.current = !!moreChunks;
       
-      // Start audio generation immediately
-      generateAndPlayAudio();
+      playChunk(0);
+      pollRunRef.current += 1;
+      if (moreChunks) {
+        fetchRemainingChunks(pollRunRef.current);
+      }
     }
     
     return () => {
@@ -52,93 +65,115 @@ const StoryStreamingComponent = ({
     console.log(`🛑 [${storyIdRef.current}] Stopping all audio`);
     
     if (audioRef.current) {
+      audioRef.current.onended = null;
       audioRef.current.pause();
       audioRef.current.currentTime = 0;
       audioRef.current = null;
     }
     
-    audioQueueRef.current = [];
+    waitingForIndexRef.current = null;
     setState(prev => ({ ...prev, isPlaying: false, audioReady: false }));
   }, []);
 
-  const generateAndPlayAudio = async () => {
-    try {
-      if (!isActiveRef.current) return;
-      
-      console.log(`🎵 [${storyIdRef.current}] Generating audio for story`);
-      setState(prev => ({ ...prev, isLoading: true, error: null }));
-
-      // Collect all story text - handle both string and object formats
-      let fullStoryText = '';
-      
-      // Handle firstChunk
-      if (firstChunk) {
-        fullStoryText = typeof firstChunk === 'string' ? firstChunk : (firstChunk.text || firstChunk);
+  const fetchRemainingChunks = async (run) => {
+    // Long-poll /stories/chunks until the story is fully written
+    const current = () => isActiveRef.current && pollRunRef.current === run;
+    while (current() && writingRef.current) {
+      const written = chunksRef.current;
+      const lastChunkId = written.length ? written[written.length - 1].chunk_id : 0;
+      try {
+        const response = await fetch(`${BACKEND_URL}/api/stories/chunks/${sessionId}?after=${lastChunkId}&wait=30`);
+        if (!response.ok) {
+          throw new Error(`Story chunks error: ${response.status}`);
+        }
+        const data = await response.json();
+        if (!current()) return;
+        
+        if (data.chunks && data.chunks.length > 0) {
+          console.log(`📝 [${storyIdRef.current}] ${data.chunks.length} more story chunk(s) written`);
+          setChunks([...chunksRef.current, ...data.chunks]);
+        }
+        writingRef.current = data.status === 'success' && !!data.more_chunks;
+      } catch (error) {
+        console.error(`❌ [${storyIdRef.current}] Failed to fetch remaining story chunks:`, error);
+        writingRef.current = false;
       }
       
-      // Handle remainingChunks
-      if (remainingChunks && remainingChunks.length > 0) {
-        const remainingText = remainingChunks.map(chunk => 
-          typeof chunk === 'string' ? chunk : (chunk.text || chunk)
-        ).join('\n\n');
-        fullStoryText += '\n\n' + remainingText;
-      }
-
-      if (!fullStoryText.trim()) {
-        throw new Error('No story text available');
+      // Playback caught up with the writing - continue with what just arrived
+      const waitingFor = waitingForIndexRef.current;
+      if (waitingFor !== null && (waitingFor < chunksRef.current.length || !writingRef.current)) {
+        waitingForIndexRef.current = null;
+        playChunk(waitingFor);
       }
+    }
+  };
 
-      console.log(`📝 [${storyIdRef.current}] Generating TTS for ${fullStoryText.length} characters`);
-
-      // Make TTS API call
-      const response = await fetch(`${process.env.REACT_APP_BACKEND_URL}/api/voice/tts`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-          text: fullStoryText,
-          voice_personality: 'story_narrator',
-          session_id: sessionId
-        })
-      });
+  const chunkAudio = (index) => {
+    // One request per chunk; /stories/chunk-tts serves audio the server already prefetched
+    if (!audioCacheRef.current[index]) {
+      const chunk = chunksRef.current[index];
+      audioCacheRef.current[index] = (index === 0 && chunk.audio_base64)
+        ? Promise.resolve(chunk.audio_base64)
+        : fetch(`${BACKEND_URL}/api/stories/chunk-tts`, {
+            method: 'POST',
+            headers: {
+              'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+              text: chunkText(chunk),
+              chunk_id: chunk.chunk_id,
+              user_id: userId,
+              session_id: sessionId
+            })
+          })
+            .then(response => response.json())
+            .then(result => {
+              if (result.status !== 'success' || !result.audio_base64) {
+                throw new Error(result.error || result.message || 'Chunk TTS failed');
+              }
+              return result.audio_base64;
+            })
+            .catch(error => {
+              delete audioCacheRef.current[index];  // Retry on the next request
+              throw error;
+            });
+    }
+    return audioCacheRef.current[index];
+  };
 
-      if (!response.ok) {
-        const errorData = await response.json().catch(() => ({}));
-        throw new Error(`TTS API error: ${response.status} - ${errorData.detail || 'Unknown error'}`);
+  const playChunk = async (index) => {
+    if (!isActiveRef.current) return;
+    
+    if (index >= chunksRef.current.length) {
+      if (writingRef.current) {
+        // Still being written - fetchRemainingChunks resumes playback when it arrives
+        console.log(`⏳ [${storyIdRef.current}] Waiting for chunk ${index + 1} to be written`);
+        waitingForIndexRef.current = index;
+        setState(prev => ({ ...prev, isLoading: true }));
+        return;
       }
-
-      const audioData = await response.json();
-      
+      // Story completed
+      setState(prev => ({ 
+        ...prev, 
+        isPlaying: false, 
+        isLoading: false,
+        completed: true 
+      }));
+      console.log(`🎉 [${storyIdRef.current}] Story narration completed`);
+      if (onComplete) onComplete();
+      return;
+    }
+    
+    setState(prev => ({ ...prev, currentChunkIndex: index, isLoading: true, error: null }));
+    try {
+      const audioBase64 = await chunkAudio(index);
       if (!isActiveRef.current) return;
-
-      // Handle both single audio and chunked response
-      let audioToPlay = null;
       
-      try {
-        // Try to parse as JSON (chunked response)
-        const parsedData = typeof audioData.audio === 'string' 
-          ? JSON.parse(audioData.audio) 
-          : audioData.audio;
-          
-        if (parsedData && parsedData.is_chunked && parsedData.audio_chunks) {
-          console.log(`🎵 [${storyIdRef.current}] Received ${parsedData.audio_chunks.length} audio chunks`);
-          audioToPlay = parsedData.audio_chunks[0]; // Start with first chunk
-          audioQueueRef.current = parsedData.audio_chunks.slice(1); // Queue remaining
-        } else {
-          audioToPlay = audioData.audio;
-        }
-      } catch (e) {
-        // Not JSON, treat as single audio response
-        audioToPlay = audioData.audio;
+      // Ask for the next chunk while this one plays
+      if (index + 1 < chunksRef.current.length) {
+        chunkAudio(index + 1).catch(() => {});
       }
-
-      if (!audioToPlay) {
-        throw new Error('No audio data received from TTS API');
-      }
-
-      await playAudio(audioToPlay);
-
+      await playAudio(audioBase64, index);
     } catch (error) {
       console.error(`❌ [${storyIdRef.current}] Audio generation error:`, error);
       setState(prev => ({ 
@@ -151,11 +186,11 @@ const StoryStreamingComponent = ({
     }
   };
 
-  const playAudio = async (audioBase64) => {
+  const playAudio = async (audioBase64, index) => {
     try {
       if (!isActiveRef.current || !audioBase64) return;
 
-      console.log(`🔊 [${storyIdRef.current}] Playing audio chunk`);
+      console.log(`🔊 [${storyIdRef.current}] Playing audio chunk ${index + 1}`);
       
       // Create new audio element
       const audio = new Audio(`data:audio/wav;base64,${audioBase64}`);
@@ -184,22 +219,9 @@ const StoryStreamingComponent = ({
 
       audio.onended = () => {
         if (!isActiveRef.current) return;
-        console.log(`✅ [${storyIdRef.current}] Audio chunk completed`);
-        
-        // Play next chunk if available
-        if (audioQueueRef.current.length > 0) {
-          const nextChunk = audioQueueRef.current.shift();
-          setTimeout(() => playAudio(nextChunk), 100); // Small gap between chunks
-        } else {
-          // Story completed
-          setState(prev => ({ 
-            ...prev, 
-            isPlaying: false, 
-            completed: true 
-          }));
-          console.log(`🎉 [${storyIdRef.current}] Story narration completed`);
-          if (onComplete) onComplete();
-        }
+        console.log(`✅ [${storyIdRef.current}] Audio chunk ${index + 1} completed`);
+        audioRef.current = null;
+        setTimeout(() => playChunk(index + 1), 100); // Small gap between chunks
       };
 
       audio.onerror = (e) => {
@@ -229,7 +251,7 @@ const StoryStreamingComponent = ({
   const handlePlayPause = () => {
     if (!audioRef.current) {
       // No audio ready, generate it
-      generateAndPlayAudio();
+      playChunk(state.completed ? 0 : state.currentChunkIndex);
       return;
     }
 
@@ -251,7 +273,7 @@ const StoryStreamingComponent = ({
       completed: false,
       error: null
     }));
-    setTimeout(() => generateAndPlayAudio(), 100);
+    setTimeout(() => playChunk(0), 100);
   };
 
   return (
@@ -276,14 +298,9 @@ const StoryStreamingComponent = ({
       {/* Story Text Display */}
       <div className="bg-white rounded-xl p-4 mb-4 max-h-48 overflow-y-auto">
         <div className="prose prose-sm max-w-none">
-          {state.displayedText && (
-            <p className="text-gray-700 leading-relaxed whitespace-pre-line">
-              {state.displayedText}
-            </p>
-          )}
-          {remainingChunks && remainingChunks.map((chunk, index) => (
-            <p key={index} className="text-gray-700 leading-relaxed whitespace-pre-line mt-3">
-              {typeof chunk === 'string' ? chunk : chunk.text || chunk}
+          {state.chunks.map((chunk, index) => (
+            <p key={chunk.chunk_id !== undefined ? chunk.chunk_id : index} className={`text-gray-700 leading-relaxed whitespace-pre-line${index > 0 ? ' mt-3' : ''}`}>
+              {chunkText(chunk)}
             </p>
           ))}
         </div>
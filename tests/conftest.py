@@ -0,0 +1,4 @@
+import os
+
+# Agents import LlmChat through llm_client; the stub keeps emergentintegrations and Gemini out of unit tests
+os.environ.setdefault("LLM_BACKEND", "stub")
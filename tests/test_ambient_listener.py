@@ -0,0 +1,164 @@
+import asyncio
+
+import numpy as np
+
+from backend.agents.ambient_listener import AmbientListeningEngine, PcmRingBuffer, match_wake_word
+
+RATE = 16000
+FRAME = 480  # 30 ms
+
+
+def tone(seconds, hz=220.0):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (0.5 * 32767 * np.sin(2 * np.pi * hz * t)).astype(np.int16)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.int16)
+
+
+class FakeTranscriber:
+    """transcribe(samples, rate) double: replies in order and records what it was sent"""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.lengths = []
+
+    async def __call__(self, samples, sample_rate):
+        self.lengths.append(len(samples))
+        return self.replies.pop(0) if self.replies else None
+
+
+def engine(transcribe=None, **options):
+    return AmbientListeningEngine(transcribe or FakeTranscriber(), sample_rate=RATE, ring_seconds=options.pop("ring_seconds", 6), **options)
+
+
+def stream(listener, session, *clips, chunk_seconds=0.3):
+    """Write clips in real-time-sized chunks, classifying after each like process() does"""
+    audio = np.concatenate(clips)
+    chunk = int(chunk_seconds * RATE)
+    segments = []
+    for start in range(0, len(audio), chunk):
+        session.ring.write(audio[start:start + chunk])
+        segments.extend(listener._classify(session))
+    return segments
+
+
+def test_ring_wraps_around_and_reads_by_absolute_position():
+    ring = PcmRingBuffer(8)
+    ring.write(np.arange(1, 6, dtype=np.int16))
+    ring.write(np.arange(6, 11, dtype=np.int16))  # Wraps: 1 and 2 are overwritten
+
+    assert ring.write_pos == 10 and ring.oldest_pos == 2
+    assert ring.read(2, 10).tolist() == [3, 4, 5, 6, 7, 8, 9, 10]
+    assert ring.read(6, 9).tolist() == [7, 8, 9]
+
+
+def test_ring_write_larger_than_capacity_keeps_the_newest_samples():
+    ring = PcmRingBuffer(8)
+    ring.write(np.arange(3, dtype=np.int16))
+    ring.write(np.arange(100, 120, dtype=np.int16))
+
+    assert ring.write_pos == 23 and ring.oldest_pos == 15
+    assert ring.read(15, 23).tolist() == list(range(112, 120))
+
+
+def test_ring_reads_are_clamped_to_what_is_still_buffered():
+    ring = PcmRingBuffer(8)
+    ring.write(np.arange(1, 11, dtype=np.int16))
+
+    assert ring.read(0, 5).tolist() == [3, 4, 5]    # 1 and 2 are gone
+    assert ring.read(8, 50).tolist() == [9, 10]     # Nothing written past 10 yet
+    assert len(ring.read(12, 20)) == 0 and len(ring.read(6, 6)) == 0
+
+
+def test_segment_includes_preroll_and_ends_after_the_hangover():
+    listener = engine()
+    listener.start("s")
+    session = listener.sessions["s"]
+
+    # 32 silent frames, 20 frames of speech, then silence
+    segments = stream(listener, session, silence(32 * FRAME / RATE), tone(20 * FRAME / RATE), silence(1.5))
+
+    speech_start, speech_end = 32 * FRAME, 52 * FRAME
+    assert segments == [(speech_start - listener.preroll, speech_end + listener.hangover_frames * FRAME, 20 * FRAME)]
+    assert session.speech_start is None
+
+
+def test_preroll_never_reaches_before_the_oldest_buffered_sample():
+    listener = engine()
+    listener.start("s")
+    segments = stream(listener, listener.sessions["s"], tone(0.6), silence(1.0))
+    assert segments[0][0] == 0
+
+
+def test_short_pause_inside_speech_does_not_split_the_segment():
+    listener = engine()
+    listener.start("s")
+    pause = silence((listener.hangover_frames - 2) * FRAME / RATE)
+    segments = stream(listener, listener.sessions["s"], silence(0.3), tone(0.6), pause, tone(0.6), silence(1.0))
+    assert len(segments) == 1
+
+
+def test_continuous_speech_is_cut_at_max_segment():
+    listener = engine(ring_seconds=2)
+    listener.start("s")
+    session = listener.sessions["s"]
+    segments = stream(listener, session, tone(3.0))
+
+    first_start, first_end, speech_samples = segments[0]
+    assert speech_samples == first_end - first_start
+    assert first_start == 0 and first_end - first_start >= listener.max_segment
+    assert first_end - first_start < listener.max_segment + FRAME
+    # Speech goes on - the next segment opens with preroll overlapping the cut
+    assert session.speech_start == first_end - listener.preroll
+
+
+def test_wake_word_then_command_in_the_next_segment():
+    transcriber = FakeTranscriber("um hey buddy tell me a joke", "why is the sky blue")
+    listener = engine(transcriber)
+    listener.start("s")
+    utterance = np.concatenate([silence(0.3), tone(0.6), silence(1.0)]).tobytes()
+
+    async def scenario():
+        woke = await listener.process("s", utterance)
+        asked = await listener.process("s", utterance)
+        short = await listener.process("s", np.concatenate([tone(0.1), silence(1.0)]).tobytes())
+        return woke, asked, short
+
+    woke, asked, short = asyncio.run(scenario())
+    assert woke["status"] == "wake_word_detected" and woke["command"] == "tell me a joke"
+    assert asked["status"] == "conversation_active" and asked["transcript"] == "why is the sky blue"
+    assert short == {"status": "conversation_active", "speech_active": False, "session_id": "s"}
+    assert len(transcriber.lengths) == 2  # The 0.1 s blip never reached STT
+    assert listener.get_stats()["segments_too_short"] == 1
+
+
+def test_idle_speech_without_wake_word_is_only_head_transcribed():
+    transcriber = FakeTranscriber("what's for dinner")
+    listener = engine(transcriber, wake_window_seconds=0.5)
+    listener.start("s")
+
+    result = asyncio.run(listener.process("s", np.concatenate([tone(1.5), silence(1.0)]).tobytes()))
+    assert result["status"] == "listening"
+    assert transcriber.lengths == [int(0.5 * RATE)]
+
+
+def test_wake_word_exact_and_fuzzy():
+    assert match_wake_word("Hey Buddy, what's the weather?") == {
+        "wake_word": "hey buddy", "confidence": 1.0, "command": "what's the weather"
+    }
+    fuzzy = match_wake_word("hey budy sing a song")
+    assert fuzzy["wake_word"] == "hey buddy" and 0.8 <= fuzzy["confidence"] < 1.0
+    assert fuzzy["command"] == "sing a song"
+
+
+def test_wake_word_after_one_filler_word_only():
+    assert match_wake_word("um hey buddy sing a song")["command"] == "sing a song"
+    assert match_wake_word("so um hey buddy sing a song") is None
+
+
+def test_no_wake_word():
+    assert match_wake_word("hey mom look at this") is None
+    assert match_wake_word("") is None
+    assert match_wake_word("?!") is None
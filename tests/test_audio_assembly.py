@@ -0,0 +1,80 @@
+import struct
+
+import pytest
+
+from backend.agents.audio_assembly import (
+    WavFormatError, build_wav_header, parse_wav, stitch_wavs, wav_duration_seconds
+)
+
+
+def wav(pcm: bytes, sample_rate=24000, bits=16, data_length=None) -> bytes:
+    length = len(pcm) if data_length is None else data_length
+    return build_wav_header(length, sample_rate, 1, bits) + pcm
+
+
+def test_parse_returns_format_and_payload():
+    fmt, pcm = parse_wav(wav(b"\x01\x00\x02\x00"))
+
+    assert fmt == {"channels": 1, "sample_rate": 24000, "bits_per_sample": 16, "block_align": 2}
+    assert bytes(pcm) == b"\x01\x00\x02\x00"
+
+
+def test_streaming_placeholder_size_reads_to_the_end_on_whole_frames():
+    _, pcm = parse_wav(wav(b"\x01\x00\x02\x00\x03", data_length=0xFFFFFFFF))
+
+    assert bytes(pcm) == b"\x01\x00\x02\x00"
+
+
+def test_extra_chunks_before_data_are_skipped():
+    header = build_wav_header(2)
+    odd_chunk = b"LIST" + struct.pack("<I", 3) + b"abc\x00"  # padded to an even length
+    buffer = header[:36] + odd_chunk + header[36:] + b"\x05\x00"
+
+    assert bytes(parse_wav(buffer)[1]) == b"\x05\x00"
+
+
+@pytest.mark.parametrize("buffer", [
+    b"",
+    b"RIFF\x00\x00\x00\x00WAVX",
+    build_wav_header(0)[:36],  # fmt but no data chunk
+    b"RIFF\x00\x00\x00\x00WAVE" + b"fmt " + struct.pack("<I", 16) + b"\x01\x00\x01\x00\xc0\x5d",  # fmt body cut short
+    b"RIFF\x00\x00\x00\x00WAVE" + b"fmt " + struct.pack("<I", 2) + b"\x01\x00" + b"data\x00\x00\x00\x00",
+    b"RIFF\x00\x00\x00\x00WAVE" + b"data\x02\x00\x00\x00\x00\x00",
+])
+def test_malformed_buffers_raise_wav_format_error(buffer):
+    with pytest.raises(WavFormatError):
+        parse_wav(buffer)
+
+
+def test_non_pcm_encoding_is_rejected():
+    header = bytearray(build_wav_header(2))
+    struct.pack_into("<H", header, 20, 3)  # IEEE float
+
+    with pytest.raises(WavFormatError, match="PCM only"):
+        parse_wav(bytes(header) + b"\x00\x00")
+
+
+def test_stitch_concatenates_payloads_with_silence_gap():
+    out = stitch_wavs([wav(b"\x01\x00", sample_rate=1000), wav(b"\x02\x00", sample_rate=1000)], silence_ms=2)
+
+    fmt, pcm = parse_wav(out)
+    assert fmt["sample_rate"] == 1000
+    assert bytes(pcm) == b"\x01\x00" + b"\x00" * 4 + b"\x02\x00"
+
+
+def test_eight_bit_silence_is_the_unsigned_midpoint():
+    out = stitch_wavs([wav(b"\x10", sample_rate=1000, bits=8), wav(b"\x20", sample_rate=1000, bits=8)], silence_ms=3)
+
+    assert bytes(parse_wav(out)[1]) == b"\x10\x80\x80\x80\x20"
+
+
+def test_stitch_rejects_mixed_formats_and_empty_input():
+    with pytest.raises(WavFormatError):
+        stitch_wavs([wav(b"\x00\x00", sample_rate=24000), wav(b"\x00\x00", sample_rate=16000)])
+    with pytest.raises(WavFormatError):
+        stitch_wavs([])
+
+
+def test_duration_of_unparseable_buffer_is_zero():
+    assert wav_duration_seconds(wav(b"\x00\x00" * 12000)) == pytest.approx(0.5)
+    assert wav_duration_seconds(b"not audio") == 0.0
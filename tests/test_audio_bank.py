@@ -0,0 +1,91 @@
+import asyncio
+import base64
+
+from backend.agents.audio_assembly import build_wav_header, parse_wav
+from backend.agents.audio_bank import AudioBank, build_audio_bank, expand_slots, phrase_fragments
+
+MODEL = "aura-2-amalthea-en"
+
+
+def wav(payload: bytes) -> bytes:
+    return build_wav_header(len(payload), 1000, 1, 8) + payload
+
+
+def fake_tts(rendered):
+    """synthesize(text, personality) returning a clip whose samples spell out the text"""
+    async def synthesize(text, personality):
+        rendered.append(text)
+        return base64.b64encode(wav(text.encode())).decode()
+    return synthesize
+
+
+def build(bank_dir, phrases, rendered=None):
+    synthesize = fake_tts([] if rendered is None else rendered)
+    return asyncio.run(build_audio_bank(phrases, {"friendly_companion": MODEL}, synthesize, bank_dir=bank_dir))
+
+
+def pcm_of(audio_base64: str) -> bytes:
+    return bytes(parse_wav(base64.b64decode(audio_base64))[1])
+
+
+def test_fragments_split_sentences_around_the_name():
+    fragments = phrase_fragments("Great job Mia! Let's play again.", "Mia")
+    assert fragments == ["Great job", None, "Let's play again."]
+    assert phrase_fragments("Amelia is here.", "Mia") == ["Amelia is here."]  # Whole words only
+
+
+def test_slots_expand_up_to_max_variants():
+    values = {"animal": ["cat", "dog"], "color": ["red", "blue", "green"]}
+    assert expand_slots("A {color} {animal}!", values) == [
+        "A red cat!", "A red dog!", "A blue cat!", "A blue dog!", "A green cat!", "A green dog!"
+    ]
+    assert expand_slots("A {color} {animal}!", values, max_variants=4) == []
+    assert expand_slots("Hi {name}!", values) == ["Hi {name}!"]  # Unknown slots stay for the renderer
+
+
+def test_whole_reply_hit_is_the_banked_clip(tmp_path):
+    stats = build(tmp_path, ["Time for a story!", "Time for a story!", "  "])
+    bank = AudioBank(tmp_path)
+
+    audio = bank.assemble(bank.plan("Time  for a story!", MODEL))
+    assert pcm_of(audio) == b"Time for a story!"
+    assert stats["clips"] == 1 and bank.get_stats()["whole_hits"] == 1
+    assert bank.plan("Time for a story!", "aura-2-thalia-en") is None
+
+
+def test_name_is_spliced_between_banked_sentences(tmp_path):
+    build(tmp_path, ["Great job", "Let's play again."])
+    bank = AudioBank(tmp_path)
+
+    plan = bank.plan("Great job Mia! Let's play again.", MODEL, name="Mia")
+    assert plan[1] is None
+    assert bank.assemble(plan) is None  # No name clip, no reply
+
+    audio = bank.assemble(plan, name_clip=wav(b"Mia"))
+    assert pcm_of(audio) == b"Great job" + b"Mia" + b"Let's play again."
+    assert bank.get_stats()["spliced_hits"] == 1 and bank.get_stats()["name_splices"] == 1
+
+
+def test_any_missing_sentence_misses_the_whole_reply(tmp_path):
+    build(tmp_path, ["Great job"])
+    bank = AudioBank(tmp_path)
+
+    assert bank.plan("Great job Mia! Something new.", MODEL, name="Mia") is None
+    assert bank.plan("Mia", MODEL, name="Mia") is None
+    assert bank.get_stats()["misses"] == 1
+
+
+def test_rebuild_reuses_banked_clips(tmp_path):
+    build(tmp_path, ["Hello there!"])
+    rendered = []
+    stats = build(tmp_path, ["Hello there!", "Good night!"], rendered)
+
+    assert rendered == ["Good night!"]
+    assert stats["reused"] == 1 and stats["synthesized"] == 1
+    assert len(AudioBank(tmp_path)) == 2
+
+
+def test_missing_bank_is_disabled(tmp_path):
+    bank = AudioBank(tmp_path / "absent")
+    assert not bank.enabled
+    assert bank.plan("Time for a story!", MODEL) is None
@@ -0,0 +1,129 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from backend.agents.audio_assembly import build_wav_header, parse_wav
+from backend.agents.audio_preprocessing import decode_wav, preprocess_for_stt, resample, to_mono
+
+RATE = 16000
+
+
+def tone(seconds, rate=RATE, hz=220.0, amplitude=0.5):
+    t = np.arange(int(seconds * rate)) / rate
+    return amplitude * np.sin(2 * np.pi * hz * t)
+
+
+def silence(seconds, rate=RATE):
+    return np.zeros(int(seconds * rate))
+
+
+def noise(seconds, rate=RATE, amplitude=0.3, seed=7):
+    return amplitude * np.random.default_rng(seed).uniform(-1.0, 1.0, int(seconds * rate))
+
+
+def wav(*channels, rate=RATE):
+    """16-bit PCM WAV from one float signal per channel (interleaved)"""
+    frames = np.stack(channels, axis=1)
+    pcm = (np.clip(frames, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+    return build_wav_header(len(pcm), rate, len(channels), 16) + pcm
+
+
+def dominant_hz(signal, rate):
+    spectrum = np.abs(np.fft.rfft(signal))
+    return np.fft.rfftfreq(len(signal), 1.0 / rate)[np.argmax(spectrum)]
+
+
+def test_decode_scales_each_bit_depth_to_unit_range():
+    samples, rate = decode_wav(wav(np.array([0.5, -0.5, 1.0])))
+    assert rate == RATE and samples.shape == (3, 1)
+    assert np.allclose(samples[:, 0], [0.5, -0.5, 1.0], atol=1e-4)
+
+    eight_bit = build_wav_header(3, 8000, 1, 8) + bytes([128, 192, 0])
+    samples, rate = decode_wav(eight_bit)
+    assert rate == 8000 and np.allclose(samples[:, 0], [0.0, 0.5, -1.0])
+
+
+def test_stereo_is_downmixed_to_the_channel_mean():
+    samples, _ = decode_wav(wav(np.array([0.5, 0.2]), np.array([0.1, -0.2])))
+    assert samples.shape == (2, 2)
+    assert np.allclose(to_mono(samples), [0.3, 0.0], atol=1e-4)
+
+
+def test_resampling_keeps_duration_and_pitch():
+    signal = tone(1.0, rate=48000, hz=440.0).astype(np.float32)
+    resampled = resample(signal, 48000, RATE)
+    assert len(resampled) == RATE
+    assert abs(dominant_hz(resampled, RATE) - 440.0) <= 1.0
+
+
+def test_downsampling_filters_out_tones_above_the_new_nyquist():
+    # 11 kHz would fold back to 5 kHz at 16 kHz without the low-pass
+    signal = (tone(0.5, rate=48000, hz=1000.0) + tone(0.5, rate=48000, hz=11000.0)).astype(np.float32)
+    spectrum = np.abs(np.fft.rfft(resample(signal, 48000, RATE)))
+    freqs = np.fft.rfftfreq(RATE // 2, 1.0 / RATE)
+    assert spectrum[np.argmin(np.abs(freqs - 5000))] < 0.05 * spectrum[np.argmin(np.abs(freqs - 1000))]
+
+
+def test_speech_is_trimmed_to_mono_16k_with_padding():
+    clip = np.concatenate([silence(0.6, 48000), tone(0.6, 48000), silence(0.6, 48000)])
+    prepared = preprocess_for_stt(wav(clip, clip * 0.5, rate=48000))
+
+    fmt, pcm = parse_wav(prepared["audio"])
+    assert prepared["has_speech"]
+    assert (fmt["sample_rate"], fmt["channels"], fmt["bits_per_sample"]) == (RATE, 1, 16)
+    assert prepared["original_seconds"] == pytest.approx(1.8)
+    # 0.6 s of tone plus 0.2 s of padding either side, to the 30 ms frame
+    assert prepared["trimmed_seconds"] == pytest.approx(1.0, abs=0.06)
+    assert len(pcm) == int(prepared["trimmed_seconds"] * RATE) * 2
+    assert prepared["processed_bytes"] < prepared["original_bytes"]
+
+
+def test_low_rate_audio_is_not_upsampled():
+    prepared = preprocess_for_stt(wav(tone(0.5, rate=8000), rate=8000))
+    assert parse_wav(prepared["audio"])[0]["sample_rate"] == 8000
+
+
+def test_silence_and_noise_are_rejected():
+    for clip in (silence(1.0), noise(1.0), silence(1.0) + noise(1.0, amplitude=0.001)):
+        prepared = preprocess_for_stt(wav(clip))
+        assert not prepared["has_speech"] and prepared["audio"] == b""
+
+
+def test_a_click_shorter_than_min_speech_is_rejected():
+    clip = np.concatenate([silence(0.5), tone(0.03), silence(0.5)])
+    assert not preprocess_for_stt(wav(clip))["has_speech"]
+
+
+def test_containers_other_than_wav_pass_through():
+    assert preprocess_for_stt(b"\x1aE\xdf\xa3webm-cluster") is None
+
+
+def test_transcribe_answers_no_speech_without_calling_stt(monkeypatch):
+    pytest.importorskip("aiohttp")
+    from backend.agents.voice_agent import NO_SPEECH, VoiceAgent
+
+    agent = VoiceAgent("key")
+    agent.stt_preprocess = True
+
+    async def deepgram(audio_data, content_type=None):
+        raise AssertionError("silence must not reach STT")
+
+    monkeypatch.setattr(agent, "_request_deepgram_stt", deepgram)
+    transcript = asyncio.run(agent._transcribe(wav(silence(1.0))))
+    assert transcript == NO_SPEECH and transcript is not None
+    assert agent.stt_metrics["vad_rejected"] == 1 and agent.stt_metrics["requests"] == 0
+
+
+def test_transcribe_failure_is_not_no_speech(monkeypatch):
+    pytest.importorskip("aiohttp")
+    from backend.agents.voice_agent import VoiceAgent
+
+    agent = VoiceAgent("key")
+    agent.stt_preprocess = True
+
+    async def deepgram(audio_data, content_type=None):
+        return None  # Retries exhausted
+
+    monkeypatch.setattr(agent, "_request_deepgram_stt", deepgram)
+    assert asyncio.run(agent._transcribe(wav(tone(0.5)))) is None
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from backend.agents.cancellation import CancellationScope, SessionCancellationRegistry
+
+
+async def forever():
+    await asyncio.Event().wait()
+
+
+def test_cancel_stops_every_live_task_in_the_scope():
+    async def scenario():
+        scope = CancellationScope("s", 1)
+        llm = scope.spawn(forever(), name="llm")
+        tts = scope.spawn(forever())
+        finished = scope.spawn(asyncio.sleep(0, result="done"))
+        await finished
+        assert scope.active_tasks == 2 and llm.get_name() == "llm"
+
+        cancelled = scope.cancel()
+        await asyncio.gather(llm, tts, return_exceptions=True)
+        return cancelled, llm.cancelled(), tts.cancelled(), finished.result(), scope.cancel_reason
+
+    assert asyncio.run(scenario()) == (2, True, True, "done", "barge-in")
+
+
+def test_spawn_in_a_cancelled_scope_is_cancelled_at_once():
+    async def scenario():
+        scope = CancellationScope("s", 1)
+        scope.cancel("new turn")
+        task = scope.spawn(forever())
+        with pytest.raises(asyncio.CancelledError):
+            await scope.run(asyncio.sleep(0))
+        await asyncio.gather(task, return_exceptions=True)
+        return task.cancelled()
+
+    assert asyncio.run(scenario())
+
+
+def test_cancel_from_inside_a_scope_task_spares_the_caller():
+    async def scenario():
+        scope = CancellationScope("s", 1)
+        sibling = scope.spawn(forever())
+
+        async def barge_in():
+            return scope.cancel()
+
+        cancelled = await scope.spawn(barge_in())
+        await asyncio.gather(sibling, return_exceptions=True)
+        return cancelled, sibling.cancelled()
+
+    assert asyncio.run(scenario()) == (1, True)
+
+
+def test_new_turn_supersedes_the_previous_one():
+    async def scenario():
+        registry = SessionCancellationRegistry()
+        first = registry.begin_turn("s")
+        stale = first.spawn(forever())
+        other_session = registry.current("other").spawn(forever())
+
+        second = registry.begin_turn("s")
+        await asyncio.gather(stale, return_exceptions=True)
+        assert registry.current("s") is second and second.turn == first.turn + 1
+        assert stale.cancelled() and not other_session.done()
+
+        registry.discard("other")
+        await asyncio.gather(other_session, return_exceptions=True)
+        return registry.get_stats(), other_session.cancelled()
+
+    stats, discarded = asyncio.run(scenario())
+    assert discarded
+    assert stats["turns"] == 2 and stats["interrupts"] == 2 and stats["tasks_cancelled"] == 2
+    assert stats["sessions"] == 1 and stats["active_tasks"] == 0
+
+
+def test_current_replaces_a_cancelled_scope():
+    registry = SessionCancellationRegistry()
+    scope = registry.current("s")
+    assert registry.cancel("s") == 0  # Nothing running - not counted as an interrupt
+    assert scope.cancelled
+
+    fresh = registry.current("s")
+    assert fresh is not scope and not fresh.cancelled and fresh.turn == 2
+    assert registry.get_stats()["interrupts"] == 0
@@ -0,0 +1,152 @@
+import asyncio
+import types
+
+import pytest
+
+from backend.agents import chunk_audio_store
+from backend.agents.chunk_audio_store import StoryChunkAudioStore
+
+
+class Synthesis:
+    """start() callback for get_or_start that counts calls and hands out controllable futures"""
+
+    def __init__(self):
+        self.futures = []
+
+    def __call__(self):
+        future = asyncio.get_running_loop().create_future()
+        self.futures.append(future)
+        return future
+
+
+def test_inflight_then_ready_reuse_one_synthesis():
+    async def scenario():
+        store = StoryChunkAudioStore()
+        start = Synthesis()
+
+        first, source = store.get_or_start(["session"], 1, "Once upon a time", start)
+        assert source == "started"
+        second, source = store.get_or_start(["session"], 1, "Once  upon a time ", start)  # whitespace-insensitive
+        assert source == "inflight" and second is first
+
+        first.set_result("UklGRg==")
+        await asyncio.sleep(0)
+        third, source = store.get_or_start(["session"], 1, "Once upon a time", start)
+        assert source == "ready" and third is first
+
+        _, source = store.get_or_start(["session"], 1, "A different chunk text", start)
+        assert source == "started"
+        return len(start.futures), store.get_stats()
+
+    started, stats = asyncio.run(scenario())
+    assert started == 2
+    assert stats["synthesized"] == 2 and stats["inflight_hits"] == 1 and stats["ready_hits"] == 1
+
+
+def test_hit_under_one_owner_is_aliased_under_the_others():
+    async def scenario():
+        store = StoryChunkAudioStore()
+        start = Synthesis()
+
+        future, _ = store.get_or_start(["session"], 2, "The dragon sneezed", start)
+        _, source = store.get_or_start(["user", "session"], 2, "The dragon sneezed", start)
+        assert source == "inflight"
+
+        # Found under the user now, even for a caller that only knows the user
+        aliased, source = store.get_or_start(["user"], 2, "The dragon sneezed", start)
+        assert source == "inflight" and aliased is future
+        assert store.find("user", 2) is future and store.find("session", 2) is future
+        assert store.find("user", 3) is None
+        return len(start.futures)
+
+    assert asyncio.run(scenario()) == 1
+
+
+@pytest.mark.parametrize("finish", [
+    lambda future: future.set_result(None),
+    lambda future: future.set_result(""),
+    lambda future: future.set_exception(RuntimeError("TTS failed")),
+    lambda future: future.cancel(),
+])
+def test_unusable_results_are_dropped_so_the_chunk_starts_again(finish):
+    async def scenario():
+        store = StoryChunkAudioStore()
+        start = Synthesis()
+
+        future, _ = store.get_or_start(["session", "user"], 1, "The moon giggled", start)
+        finish(future)
+        await asyncio.sleep(0)
+
+        assert store.find("session", 1) is None and store.find("user", 1) is None
+        _, source = store.get_or_start(["user"], 1, "The moon giggled", start)
+        return source, store.get_stats()
+
+    source, stats = asyncio.run(scenario())
+    assert source == "started"
+    assert stats["dropped"] == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(chunk_audio_store, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+
+    async def scenario():
+        store = StoryChunkAudioStore(ttl_seconds=300.0)
+        start = Synthesis()
+
+        future, _ = store.get_or_start(["session"], 1, "Stars hummed", start)
+        future.set_result("UklGRg==")
+        await asyncio.sleep(0)
+
+        clock.now += 120.0
+        _, source = store.get_or_start(["session"], 1, "Stars hummed", start)
+        assert source == "ready"
+
+        clock.now += 301.0
+        _, source = store.get_or_start(["session"], 1, "Stars hummed", start)
+        return source
+
+    assert asyncio.run(scenario()) == "started"
+
+
+def test_cancelled_shielded_wait_leaves_the_shared_synthesis_running():
+    async def scenario():
+        store = StoryChunkAudioStore()
+        release = asyncio.Event()
+
+        async def synthesize():
+            await release.wait()
+            return "UklGRg=="
+
+        future, _ = store.get_or_start(["session"], 1, "The owl whispered",
+                                       lambda: asyncio.ensure_future(synthesize()))
+
+        async def chunk_audio_request():
+            # Waits the way /stories/chunk-audio does; the client then drops the request
+            return await asyncio.shield(future)
+
+        request = asyncio.create_task(chunk_audio_request())
+        prefetch, source = store.get_or_start(["session"], 1, "The owl whispered", lambda: None)
+        assert source == "inflight"
+        await asyncio.sleep(0)
+
+        request.cancel()
+        await asyncio.sleep(0)
+        assert request.cancelled() and not future.cancelled()
+
+        release.set()
+        return await prefetch, store.find("session", 1) is future
+
+    assert asyncio.run(scenario()) == ("UklGRg==", True)
+
+
+def test_oldest_owner_is_evicted_past_max_owners():
+    async def scenario():
+        store = StoryChunkAudioStore(max_owners=2)
+        start = Synthesis()
+        for owner in ("a", "b", "c"):
+            store.get_or_start([owner], 1, "Frogs sang", start)
+        store.discard("b")
+        return store.get_stats()["owners"], store.find("a", 1)
+
+    assert asyncio.run(scenario()) == (1, None)
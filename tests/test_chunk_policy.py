@@ -0,0 +1,45 @@
+import pytest
+
+from backend.agents.chunk_policy import AdaptiveChunkPolicy
+from backend.agents.rate_limiter import PriorityRateLimiter
+
+STORY = " ".join(
+    f"Sentence number {index} tells the next small part of the story about Pip the mouse."
+    for index in range(60)
+)
+
+
+@pytest.mark.parametrize("buffered_seconds", [0.0, 1.0, 5.0, 20.0, 120.0, 1000.0])
+def test_target_words_stay_within_bounds(buffered_seconds):
+    policy = AdaptiveChunkPolicy(min_words=20, max_words=120)
+    assert 20 <= policy.next_target_words(buffered_seconds) <= 120
+
+
+def test_target_grows_with_the_playback_buffer():
+    policy = AdaptiveChunkPolicy(min_words=10, max_words=500)
+    targets = [policy.next_target_words(seconds) for seconds in (4.0, 8.0, 16.0)]
+    assert targets == sorted(targets)
+    assert targets[0] < targets[-1]
+
+
+def test_low_rate_limit_headroom_enlarges_segments():
+    limiter = PriorityRateLimiter(requests_per_minute=10)
+    policy = AdaptiveChunkPolicy(limiter, min_words=10, max_words=500)
+    full = policy.next_target_words(10.0)
+
+    limiter.on_rate_limited()  # Empty bucket
+    drained = policy.next_target_words(10.0)
+
+    assert full < drained <= min(2 * full, 500)
+
+
+def test_split_opens_with_one_sentence_and_respects_limits():
+    policy = AdaptiveChunkPolicy(min_words=20, max_words=60, max_chars=400)
+    segments = policy.split(STORY)
+
+    assert segments[0] == "Sentence number 0 tells the next small part of the story about Pip the mouse."
+    assert all(len(segment) <= 400 for segment in segments)
+    assert " ".join(segments).split() == STORY.split()
+    # Later segments are bigger than the opener but never past the word cap plus one sentence
+    assert all(len(segment.split()) > len(segments[0].split()) for segment in segments[1:-1])
+    assert all(len(segment.split()) < 60 + 16 for segment in segments)
@@ -0,0 +1,106 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from backend.agents.llm_client import GeminiStreamClient
+
+# A streamGenerateContent?alt=sse response body as the API frames it: CRLF-delimited "data:" events
+RECORDED_STREAM = Path(__file__).parent / "fixtures" / "gemini_stream.sse"
+
+
+class RecordedResponse:
+    def __init__(self, payload: bytes, status: int = 200):
+        self.status = status
+        self.reason = "OK" if status == 200 else "Too Many Requests"
+        self._payload = payload
+
+    @property
+    def content(self):
+        async def lines():
+            for line in self._payload.splitlines(keepends=True):
+                yield line
+        return lines()
+
+    async def text(self):
+        return self._payload.decode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class RecordingSession:
+    closed = False
+
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    def post(self, url, **kwargs):
+        self.requests.append((url, kwargs))
+        return self.response
+
+
+def stream_with(response, **kwargs):
+    client = GeminiStreamClient(base_url="https://gemini.test/")
+    session = RecordingSession(response)
+    client._session = session
+
+    async def scenario():
+        return [delta async for delta in client.stream("AIza-test", "gemini-2.0-flash", **kwargs)]
+
+    return asyncio.run(scenario()), session.requests
+
+
+def test_recorded_stream_yields_each_text_part_in_order():
+    deltas, _ = stream_with(RecordedResponse(RECORDED_STREAM.read_bytes()),
+                            system_message="", history=[], text="why is the sky blue")
+
+    assert deltas == [
+        "The sky looks blue because",
+        " sunlight bounces off tiny bits of air. Blue light",
+        " bounces the most, so we see it everywhere!",
+    ]
+
+
+def test_request_carries_history_system_message_and_token_limit():
+    _, requests = stream_with(RecordedResponse(RECORDED_STREAM.read_bytes()),
+                              system_message="You are Buddy", history=[("user", "hi"), ("model", "Hello!")],
+                              text="why is the sky blue", max_tokens=200)
+
+    url, kwargs = requests[0]
+    assert url == "https://gemini.test/v1beta/models/gemini-2.0-flash:streamGenerateContent"
+    assert kwargs["params"] == {"alt": "sse"}
+    assert kwargs["headers"] == {"x-goog-api-key": "AIza-test"}
+    assert kwargs["json"] == {
+        "contents": [
+            {"role": "user", "parts": [{"text": "hi"}]},
+            {"role": "model", "parts": [{"text": "Hello!"}]},
+            {"role": "user", "parts": [{"text": "why is the sky blue"}]},
+        ],
+        "systemInstruction": {"parts": [{"text": "You are Buddy"}]},
+        "generationConfig": {"maxOutputTokens": 200},
+    }
+
+
+def test_error_status_is_raised():
+    error = json.dumps({"error": {"code": 429, "status": "RESOURCE_EXHAUSTED"}}).encode()
+    with pytest.raises(Exception, match="429"):
+        stream_with(RecordedResponse(error, status=429), system_message="", history=[], text="hi")
+
+
+def test_native_streaming_is_on_by_default_for_studio_keys(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "")
+    monkeypatch.delenv("LLM_NATIVE_STREAMING", raising=False)
+    assert GeminiStreamClient.supports("gemini", "AIza-test")
+    assert not GeminiStreamClient.supports("gemini", "sk-emergent-test")
+    assert not GeminiStreamClient.supports("openai", "AIza-test")
+
+    monkeypatch.setenv("LLM_NATIVE_STREAMING", "0")
+    assert not GeminiStreamClient.supports("gemini", "AIza-test")
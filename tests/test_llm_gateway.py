@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from backend.agents import llm_gateway
+from backend.agents.llm_gateway import LLMGateway
+
+
+class HeldChat:
+    """LlmChat double whose replies wait until the test releases them"""
+
+    def __init__(self, api_key=None, session_id=None, system_message=None):
+        self.session_id = session_id
+        self.system_message = system_message
+        self.model = None
+        self.max_tokens = None
+        self.release = asyncio.Event()
+        self.sent = []
+
+    def with_model(self, provider, model):
+        self.model = (provider, model)
+        return self
+
+    def with_max_tokens(self, max_tokens):
+        self.max_tokens = max_tokens
+        return self
+
+    async def send_message(self, message):
+        self.sent.append(message.text)
+        await self.release.wait()
+        return f"reply to {message.text}"
+
+
+@pytest.fixture(autouse=True)
+def held_chat(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LlmChat", HeldChat)
+    monkeypatch.delenv("LLM_NATIVE_STREAMING", raising=False)
+    return HeldChat
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_each_conversation_gets_a_fresh_client():
+    gateway = LLMGateway(api_key="key")
+    first = gateway.open_conversation("You are Buddy", max_tokens=120)
+    second = gateway.open_conversation("You are Buddy", session_id="session-7")
+
+    assert first.client is not second.client
+    assert first.client.max_tokens == 120 and second.client.max_tokens is None
+    assert first.client.model == ("gemini", "gemini-2.0-flash")
+    assert second.client.session_id == "session-7" and first.client.session_id.startswith("gateway_")
+    assert gateway.get_stats()["clients_created"] == 2
+
+
+def test_calls_beyond_max_concurrency_queue_for_a_slot():
+    async def scenario():
+        gateway = LLMGateway(api_key="key", max_concurrency=2)
+        chats = [gateway.open_conversation("sys") for _ in range(4)]
+        calls = [asyncio.create_task(chat.send(f"q{index}")) for index, chat in enumerate(chats)]
+        await settle()
+        queued = (gateway.in_flight, gateway.waiting, [len(chat.client.sent) for chat in chats])
+
+        for chat in chats:
+            chat.client.release.set()
+        replies = await asyncio.gather(*calls)
+        return queued, replies, gateway.get_stats()
+
+    queued, replies, stats = asyncio.run(scenario())
+    assert queued == (2, 2, [1, 1, 0, 0])
+    assert replies == ["reply to q0", "reply to q1", "reply to q2", "reply to q3"]
+    assert stats["peak_in_flight"] == 2 and stats["in_flight"] == 0
+    assert stats["profiles"]["gemini-2.0-flash/default"]["calls"] == 4
+
+
+def test_timeout_covers_the_wait_for_a_slot():
+    async def scenario():
+        gateway = LLMGateway(api_key="key", max_concurrency=1)
+        busy = gateway.open_conversation("sys")
+        holding = asyncio.create_task(busy.send("long"))
+        await settle()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await gateway.open_conversation("sys").send("quick", timeout=0.05)
+
+        busy.client.release.set()
+        await holding
+        return gateway.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["profiles"]["gemini-2.0-flash/default"]["timeouts"] == 1
+    assert stats["waiting"] == 0 and stats["in_flight"] == 0
+
+
+def test_stream_without_native_streaming_is_one_delta_and_frees_its_slot():
+    async def scenario():
+        gateway = LLMGateway(api_key="AIza-key", max_concurrency=1)
+        chat = gateway.open_conversation("sys")
+        chat.client.release.set()
+        deltas = [delta async for delta in chat.stream("hello")]
+
+        # Stopping early releases the slot too
+        other = gateway.open_conversation("sys")
+        other.client.release.set()
+        stream = other.stream("again")
+        await stream.__anext__()
+        await stream.aclose()
+        return deltas, chat.native, gateway.in_flight, gateway.get_stats()["native_streams"]
+
+    assert asyncio.run(scenario()) == (["reply to hello"], False, 0, 0)
+
+
+
+class FailingStreamClient:
+    """GeminiStreamClient double whose streams fail before the first delta"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def stream(self, api_key, model, system_message, history, text, max_tokens=None):
+        self.calls += 1
+        raise Exception("403 Forbidden: Gemini stream failed")
+        yield  # pragma: no cover - makes this an async generator
+
+    async def close(self):
+        pass
+
+
+def test_failed_first_native_stream_falls_back_to_llmchat(monkeypatch):
+    monkeypatch.setattr(llm_gateway.GeminiStreamClient, "supports", staticmethod(lambda provider, api_key: True))
+
+    async def scenario():
+        gateway = LLMGateway(api_key="AIza-key", max_concurrency=1)
+        gateway.native_client = FailingStreamClient()
+        chat = gateway.open_conversation("sys")
+        chat.client.release.set()
+        deltas = [delta async for delta in chat.stream("hello")]
+        again = [delta async for delta in chat.stream("more")]  # LlmChat owns the conversation now
+        return deltas, again, chat.native, gateway.native_client.calls, gateway.in_flight, gateway.get_stats()
+
+    deltas, again, native, native_calls, in_flight, stats = asyncio.run(scenario())
+    assert deltas == ["reply to hello"] and again == ["reply to more"]
+    assert native is False and native_calls == 1 and in_flight == 0
+    assert stats["native_streams"] == 1 and stats["native_fallbacks"] == 1
@@ -0,0 +1,159 @@
+import asyncio
+import base64
+import types
+
+import pytest
+
+from backend.agents import prefetch_scheduler
+from backend.agents.audio_assembly import build_wav_header
+from backend.agents.prefetch_scheduler import StoryPrefetchScheduler
+
+# 10 words - estimated at 4 s of narration until the chunk's real audio is known
+CHUNK_TEXT = "the little fox ran all the way to the river"
+
+
+def clip(seconds: float) -> str:
+    """Base64 WAV of silence, 8-bit mono at 1 kHz"""
+    samples = int(seconds * 1000)
+    return base64.b64encode(build_wav_header(samples, 1000, 1, 8) + b"\x80" * samples).decode()
+
+
+def chunks(*chunk_ids):
+    return [{"chunk_id": chunk_id, "text": CHUNK_TEXT} for chunk_id in chunk_ids]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(prefetch_scheduler, "time", types.SimpleNamespace(monotonic=lambda: clock.now))
+    return clock
+
+
+class Synthesizer:
+    """synthesize callback that records chunk ids and holds each chunk until released"""
+
+    def __init__(self, seconds: float = 4.0, hold: bool = False):
+        self.seconds = seconds
+        self.hold = hold
+        self.started = []
+        self.gates = {}
+
+    async def __call__(self, chunk):
+        self.started.append(chunk["chunk_id"])
+        if self.hold:
+            await self.gates.setdefault(chunk["chunk_id"], asyncio.Event()).wait()
+        return clip(self.seconds)
+
+    def release(self, chunk_id):
+        self.gates.setdefault(chunk_id, asyncio.Event()).set()
+
+
+async def settle():
+    for _ in range(20):
+        await asyncio.sleep(0)
+
+
+async def stop(run):
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+
+
+def test_chunks_start_only_while_below_the_buffer_window(clock):
+    async def scenario():
+        synthesize = Synthesizer(seconds=4.0)
+        scheduler = StoryPrefetchScheduler("s", chunks(1, 2, 3, 4, 5), synthesize,
+                                           playing_chunk_id=0, playing_duration=4.0,
+                                           buffer_seconds=10.0, max_inflight=4)
+        run = asyncio.create_task(scheduler.run())
+        await settle()
+        # 4 s left of chunk 0 + 4 s of chunk 1 is under 10 s; chunk 2 would make it 12 s
+        started_at_first = list(synthesize.started)
+
+        clock.now += 4.0
+        scheduler.report_playback(1)
+        await settle()
+        await stop(run)
+        return started_at_first, synthesize.started
+
+    first, later = asyncio.run(scenario())
+    assert first == [1, 2]
+    assert later == [1, 2, 3]
+
+
+def test_immediately_next_chunk_starts_even_with_a_full_buffer(clock):
+    async def scenario():
+        synthesize = Synthesizer()
+        scheduler = StoryPrefetchScheduler("s", chunks(1, 2, 3), synthesize,
+                                           playing_chunk_id=0, playing_duration=60.0, buffer_seconds=5.0)
+        run = asyncio.create_task(scheduler.run())
+        await settle()
+        started_at_first = list(synthesize.started)
+
+        scheduler.report_playback(1, position_seconds=0.0)
+        await settle()
+        await stop(run)
+        return started_at_first, synthesize.started
+
+    assert asyncio.run(scenario()) == ([1], [1, 2])
+
+
+def test_at_most_max_inflight_syntheses_run_at_once(clock):
+    async def scenario():
+        synthesize = Synthesizer(hold=True)
+        scheduler = StoryPrefetchScheduler("s", chunks(1, 2, 3, 4), synthesize,
+                                           buffer_seconds=1000.0, max_inflight=2)
+        run = asyncio.create_task(scheduler.run())
+        await settle()
+        capped = list(synthesize.started)
+
+        synthesize.release(1)
+        await settle()
+        after_one = list(synthesize.started)
+
+        for chunk_id in (2, 3, 4):
+            synthesize.release(chunk_id)
+        return capped, after_one, await run
+
+    capped, after_one, stats = asyncio.run(scenario())
+    assert capped == [1, 2]
+    assert after_one == [1, 2, 3]
+    assert stats["stopped"] == "complete" and stats["completed"] == 4
+
+
+def test_scheduling_stops_without_playback_reports(clock):
+    async def scenario():
+        synthesize = Synthesizer(hold=True)
+        scheduler = StoryPrefetchScheduler("s", chunks(1, 2, 3), synthesize,
+                                           buffer_seconds=1000.0, max_inflight=2, idle_timeout=90.0)
+        run = asyncio.create_task(scheduler.run())
+        await settle()
+
+        clock.now += 91.0
+        synthesize.release(1)  # Wakes the scheduler, which finds no report for 91 s
+        stats = await run
+        return stats, synthesize.started, scheduler.tasks[2].cancelled()
+
+    stats, started, second_cancelled = asyncio.run(scenario())
+    assert stats["stopped"] == "idle"
+    assert started == [1, 2]
+    assert second_cancelled
+
+
+def test_chunks_added_while_the_story_is_still_being_written(clock):
+    async def scenario():
+        synthesize = Synthesizer()
+        scheduler = StoryPrefetchScheduler("s", chunks(1), synthesize, buffer_seconds=1000.0, more_chunks=True)
+        run = asyncio.create_task(scheduler.run())
+        await settle()
+        # Chunk 1 is done, but the story is not - keep waiting for more
+        waiting = not run.done()
+
+        scheduler.add_chunks(chunks(2, 3))
+        await settle()
+        scheduler.no_more_chunks()
+        return waiting, await run, synthesize.started
+
+    waiting, stats, started = asyncio.run(scenario())
+    assert waiting
+    assert started == [1, 2, 3]
+    assert stats["stopped"] == "complete" and stats["synthesized_chunks"] == 3
@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from backend.agents.rate_limiter import PriorityRateLimiter, TTSPriority
+
+
+def test_freed_slot_goes_to_highest_priority_lane():
+    async def scenario():
+        limiter = PriorityRateLimiter(max_concurrent=1, requests_per_minute=600, interactive_reserve=0)
+        await limiter.acquire(TTSPriority.INTERACTIVE)
+
+        granted = []
+
+        async def wait(priority):
+            await limiter.acquire(priority)
+            granted.append(priority)
+
+        # Queued lowest priority first
+        waiters = [asyncio.create_task(wait(priority))
+                   for priority in (TTSPriority.BATCH, TTSPriority.PREFETCH, TTSPriority.INTERACTIVE)]
+        await asyncio.sleep(0)
+        assert granted == []
+
+        for _ in waiters:
+            limiter.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*waiters)
+        return granted
+
+    assert asyncio.run(scenario()) == [TTSPriority.INTERACTIVE, TTSPriority.PREFETCH, TTSPriority.BATCH]
+
+
+def test_background_lanes_leave_the_interactive_reserve():
+    async def scenario():
+        limiter = PriorityRateLimiter(max_concurrent=10, requests_per_minute=6, burst=3, interactive_reserve=2)
+
+        await asyncio.wait_for(limiter.acquire(TTSPriority.PREFETCH), timeout=0.1)  # 3 tokens -> 2
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(limiter.acquire(TTSPriority.PREFETCH), timeout=0.1)
+
+        await asyncio.wait_for(limiter.acquire(TTSPriority.INTERACTIVE), timeout=0.1)
+        await asyncio.wait_for(limiter.acquire(TTSPriority.INTERACTIVE), timeout=0.1)
+        return limiter.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["lanes"]["prefetch"]["granted"] == 1
+    assert stats["lanes"]["prefetch"]["cancelled"] == 1
+    assert stats["lanes"]["interactive"]["granted"] == 2
+
+
+def test_cancelled_after_grant_returns_the_slot():
+    async def scenario():
+        limiter = PriorityRateLimiter(max_concurrent=1, requests_per_minute=600)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()  # Grants the waiter's future before its task has resumed
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert limiter.active_requests == 0
+        await asyncio.wait_for(limiter.acquire(), timeout=0.1)  # The slot is usable again
+        return limiter.get_stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["lanes"]["interactive"]["cancelled"] == 1
+    assert stats["active_requests"] == 1
@@ -0,0 +1,85 @@
+import pytest
+
+from backend.agents.audio_bank import NAME_SLOT
+from backend.agents.response_cache import SemanticResponseCache, normalize_intent
+
+PROFILE = {"name": "Mia", "age": 7}
+
+
+def cache_key(cache, text, content_type="conversation", profile=PROFILE):
+    key, reason = cache.cache_key(text, profile, content_type)
+    assert key is not None, reason
+    return key
+
+
+@pytest.mark.parametrize("text", [
+    "tell me more",
+    "why is it blue",
+    "what did I say yesterday",
+    "yes",
+    "what's the weather today",
+])
+def test_context_dependent_turns_are_excluded(text):
+    intent, reason = normalize_intent(text)
+    assert intent is None and reason
+
+
+def test_equivalent_questions_share_an_intent():
+    assert normalize_intent("Why is the sky blue?")[0] == normalize_intent("hey buddy, why is the sky so blue")[0]
+    assert normalize_intent("Why is the sky blue?")[0] == normalize_intent("please tell me why the sky is blue")[0]
+    assert normalize_intent("how do fish breathe")[0] == normalize_intent("how do fishes breathing")[0]
+
+
+def test_stories_and_disabled_cache_are_excluded():
+    assert SemanticResponseCache().cache_key("tell me a story about dragons", PROFILE, "story")[0] is None
+    assert SemanticResponseCache(enabled=False).cache_key("why is the sky blue", PROFILE, "conversation") == (None, "disabled")
+
+
+def test_age_groups_do_not_share_answers():
+    cache = SemanticResponseCache()
+    assert cache_key(cache, "why is the sky blue", profile={"age": 4}) != cache_key(cache, "why is the sky blue", profile={"age": 11})
+
+
+def test_variants_rotate_and_a_session_never_hears_one_twice():
+    cache = SemanticResponseCache(max_variants=2)
+    key = cache_key(cache, "why is the sky blue")
+    cache.store(key, "Sunlight scatters in the air.", PROFILE, session_id="asker")
+    cache.store(key, "Blue light bounces around the most.", PROFILE, session_id="asker")
+
+    assert cache.lookup(key, PROFILE, "asker") is None  # Heard both while they were generated
+    assert cache.stats["exhausted"] == 1
+
+    first = cache.lookup(key, PROFILE, "listener")
+    second = cache.lookup(key, PROFILE, "listener")
+    assert {first, second} == {"Sunlight scatters in the air.", "Blue light bounces around the most."}
+    assert cache.lookup(key, PROFILE, "listener") is None
+
+    cache.store(key, "Air is full of tiny bits that scatter blue.", PROFILE, session_id="listener")
+    assert len(cache._entries[key]) == 2  # The oldest variant made room
+    assert cache.lookup(key, PROFILE, "another") is not None
+
+
+def test_child_name_is_slotted_in_any_case():
+    cache = SemanticResponseCache()
+    key = cache_key(cache, "why is the sky blue")
+    assert cache.store(key, "Good question, MIA! The sky is blue, mia. Miami is sunny.", PROFILE)
+
+    assert NAME_SLOT in cache._entries[key][0]["text"]
+    assert cache.lookup(key, {"name": "Leo", "age": 7}, "other") == "Good question, Leo! The sky is blue, Leo. Miami is sunny."
+
+
+def test_name_that_is_an_intent_word_is_not_stored():
+    cache = SemanticResponseCache()
+    key = cache_key(cache, "why is the sky blue", profile={"name": "Sky", "age": 7})
+    assert not cache.store(key, "Great question, Sky! The sky is blue because of sunlight.", {"name": "Sky", "age": 7})
+    assert cache.lookup(key, PROFILE, "other") is None
+
+
+def test_answers_mentioning_interests_are_not_stored():
+    cache = SemanticResponseCache()
+    profile = {**PROFILE, "interests": ["dinosaurs"]}
+    key = cache_key(cache, "why is the sky blue", profile=profile)
+    terms = cache.personal_terms(profile)
+
+    assert not cache.store(key, "Even dinosaurs saw a blue sky!", profile, personal_terms=terms)
+    assert cache.stats["rejected"] == 1
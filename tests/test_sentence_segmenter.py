@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from backend.agents.sentence_segmenter import SentenceSegmenter, split_sentences
+
+TEXTS = [
+    "Once upon a time there was a dragon. It was very small! Did it fly? Yes.",
+    'Dr. Lee met J. K. Rowling at 3 p.m. on Main St. "Run!" shouted Tom. They ran.',
+    "The owl waited... and waited. Then... Something moved! \"Who's there?\" she asked.",
+    "First paragraph without an ending\n\nSecond paragraph starts here. And it ends.",
+    "A very long sentence with commas, clauses, and more clauses, that goes on and on, " * 8 + "The end.",
+]
+
+SETTINGS = [
+    {},
+    {"min_chars": 40},
+    {"target_words": 12},
+    {"max_chars": 60},
+    {"min_chars": 20, "max_chars": 120, "target_chars": 80},
+]
+
+
+def stream(text, settings, sizes):
+    segmenter = SentenceSegmenter(**settings)
+    segments = []
+    position = 0
+    while position < len(text):
+        size = sizes()
+        segments.extend(segmenter.feed(text[position:position + size]))
+        position += size
+    segments.extend(segmenter.flush())
+    return segments
+
+
+@pytest.mark.parametrize("settings", SETTINGS)
+@pytest.mark.parametrize("text", TEXTS)
+def test_streamed_segments_match_one_shot(text, settings):
+    expected = split_sentences(text, **settings)
+    rng = random.Random(7)
+
+    assert stream(text, settings, lambda: 1) == expected
+    assert stream(text, settings, lambda: rng.randint(1, 9)) == expected
+
+
+def test_abbreviations_and_initials_do_not_split():
+    assert split_sentences("Dr. Lee met J. K. Rowling. They talked.") == ["Dr. Lee met J. K. Rowling.", "They talked."]
+
+
+def test_boundary_waits_for_the_next_word():
+    segmenter = SentenceSegmenter()
+    assert list(segmenter.feed("Hello there. ")) == []
+    assert list(segmenter.feed("Next")) == ["Hello there."]
+    assert list(segmenter.flush()) == ["Next"]
+
+
+@pytest.mark.parametrize("text, splits, max_chars", [
+    # Terminator whose next word has not arrived when the run passes max_chars
+    ("the Mr. mat Dr. hello Smith cat on to cat cat Dr.. Jones", [42, 51, 54], 50),
+    # Trailing space that turns into a paragraph break
+    ("once there was a tiny mouse, who lived under the old mill by the river bank yy \n\nThe end.", [79], 78),
+])
+def test_hard_cut_waits_for_a_pending_boundary(text, splits, max_chars):
+    segmenter = SentenceSegmenter(max_chars=max_chars)
+    pieces = [text[start:end] for start, end in zip([0] + splits, splits + [len(text)])]
+    streamed = [segment for piece in pieces for segment in segmenter.feed(piece)] + list(segmenter.flush())
+
+    assert streamed == split_sentences(text, max_chars=max_chars)
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import types
+
+import pytest
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from backend.agents.streaming_stt import DeepgramStreamingSession
+
+
+def results(transcript, is_final=False, speech_final=False, confidence=0.98):
+    """A Deepgram live Results message, trimmed to the fields the parser reads"""
+    return {
+        "type": "Results",
+        "is_final": is_final,
+        "speech_final": speech_final,
+        "channel": {"alternatives": [{"transcript": transcript, "confidence": confidence}]}
+    }
+
+
+def parse(*payloads):
+    session = DeepgramStreamingSession(None, "key")
+    return [event for payload in payloads for event in session._parse(payload)]
+
+
+def test_interim_results_include_the_finalized_words_before_them():
+    events = parse(
+        results("tell me"),
+        results("tell me a story", is_final=True),
+        results("about a"),
+        results("about a dragon")
+    )
+    assert events == [
+        {"type": "interim", "text": "tell me"},
+        {"type": "final", "text": "tell me a story", "confidence": 0.98},
+        {"type": "interim", "text": "tell me a story about a"},
+        {"type": "interim", "text": "tell me a story about a dragon"},
+    ]
+
+
+def test_speech_final_closes_the_utterance():
+    events = parse(
+        results("tell me a story", is_final=True),
+        results("about a dragon", is_final=True, speech_final=True),
+        results("thanks", is_final=True, speech_final=True)
+    )
+    assert [event["type"] for event in events] == ["final", "final", "utterance", "final", "utterance"]
+    assert events[2]["text"] == "tell me a story about a dragon"
+    assert events[4]["text"] == "thanks"  # The next utterance starts empty
+
+
+def test_utterance_end_flushes_finals_without_speech_final():
+    events = parse(
+        results("is it raining", is_final=True),
+        {"type": "UtteranceEnd", "last_word_end": 2.1},
+        {"type": "UtteranceEnd", "last_word_end": 2.1}  # Already flushed by the first
+    )
+    assert events[-1] == {"type": "utterance", "text": "is it raining"}
+    assert len(events) == 2
+
+
+def test_speech_final_with_nothing_finalized_is_not_an_utterance():
+    assert parse(results("", is_final=True, speech_final=True)) == []
+
+
+def test_speech_started():
+    assert parse({"type": "SpeechStarted", "timestamp": 0.4}) == [{"type": "speech_started"}]
+
+
+def test_empty_and_unknown_messages_produce_nothing():
+    assert parse(
+        results(""),
+        results("   ", is_final=True),
+        {"type": "Results"},
+        {"type": "Results", "channel": None},
+        {"type": "Results", "channel": {"alternatives": []}},
+        {"type": "Metadata", "request_id": "abc"},
+        {}
+    ) == []
+
+
+def test_events_skip_malformed_messages_and_flush_on_close():
+    messages = [
+        "not json",
+        json.dumps(["a", "list"]),
+        json.dumps(results("good night", is_final=True)),
+        b"\x00binary",
+    ]
+
+    async def scenario():
+        session = DeepgramStreamingSession(None, "key")
+        session._ws = FakeWebSocket(messages)
+        return [event async for event in session.events()]
+
+    assert asyncio.run(scenario()) == [
+        {"type": "final", "text": "good night", "confidence": 0.98},
+        {"type": "utterance", "text": "good night"},  # Stream ended mid-utterance
+        {"type": "closed"},
+    ]
+
+
+class FakeWebSocket:
+    """Async-iterable stand-in for the aiohttp WebSocket: str as TEXT frames, bytes as BINARY"""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.closed = False
+
+    async def __aiter__(self):
+        for data in self.messages:
+            kind = aiohttp.WSMsgType.TEXT if isinstance(data, str) else aiohttp.WSMsgType.BINARY
+            yield types.SimpleNamespace(type=kind, data=data)
@@ -0,0 +1,99 @@
+import asyncio
+import base64
+import os
+import threading
+from pathlib import Path
+
+from backend.agents.tts_cache import TTSAudioCache
+
+
+def b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+def test_key_ignores_whitespace_but_not_voice_or_format(tmp_path):
+    cache = TTSAudioCache(cache_dir=tmp_path)
+    key = cache.make_key("Hello  there,\n Mia", "aura-2-amalthea-en", "linear16", 24000)
+
+    assert key == cache.make_key(" Hello there, Mia ", "aura-2-amalthea-en", "linear16", 24000)
+    assert key != cache.make_key("Hello there, Mia", "aura-2-thalia-en", "linear16", 24000)
+    assert key != cache.make_key("Hello there, Mia", "aura-2-amalthea-en", "linear16", 16000)
+
+
+def test_memory_hit_then_disk_hit_in_a_new_process(tmp_path):
+    async def scenario():
+        cache = TTSAudioCache(cache_dir=tmp_path)
+        key = cache.make_key("Good night", "aura", "linear16", 24000)
+        assert await cache.get(key) is None
+
+        await cache.put(key, b64(b"RIFF-audio"))
+        assert await cache.get(key) == b64(b"RIFF-audio")
+
+        restarted = TTSAudioCache(cache_dir=tmp_path)
+        assert restarted.get_stats()["disk_entries"] == 1
+        assert await restarted.get(key) == b64(b"RIFF-audio")
+        assert await restarted.get(key) == b64(b"RIFF-audio")
+        return cache.get_stats(), restarted.get_stats()
+
+    first, restarted = asyncio.run(scenario())
+    assert first["memory_hits"] == 1 and first["misses"] == 1
+    assert restarted["disk_hits"] == 1 and restarted["memory_hits"] == 1
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    async def scenario():
+        cache = TTSAudioCache(cache_dir=tmp_path, max_memory_bytes=24)
+        await cache.put("a", b64(b"123456789"))  # 12 base64 bytes each
+        await cache.put("b", b64(b"abcdefghi"))
+        await cache.get("a")
+        await cache.put("c", b64(b"ABCDEFGHI"))
+        return list(cache._memory), cache.get_stats()["memory_evictions"]
+
+    assert asyncio.run(scenario()) == (["a", "c"], 1)
+
+
+def test_disk_tier_evicts_oldest_clips_over_budget(tmp_path):
+    cache = TTSAudioCache(cache_dir=tmp_path, max_disk_bytes=100)
+    cache._write_disk("old", b"x" * 40)
+    cache._write_disk("recent", b"x" * 40)
+    os.utime(tmp_path / "old.wav", (0, 0))
+
+    cache._write_disk("new", b"x" * 40)  # 120 bytes - trimmed back under 90
+
+    assert sorted(path.stem for path in tmp_path.glob("*.wav")) == ["new", "recent"]
+    assert cache.get_stats()["disk_bytes"] == 80 and cache.get_stats()["disk_evictions"] == 1
+
+
+def test_concurrent_writes_of_one_key_leave_one_whole_clip(tmp_path):
+    cache = TTSAudioCache(cache_dir=tmp_path)
+    clips = [bytes([value]) * 256 * 1024 for value in range(8)]
+    barrier = threading.Barrier(len(clips))
+
+    def write(clip):
+        barrier.wait()
+        cache._write_disk("same-key", clip)
+
+    threads = [threading.Thread(target=write, args=(clip,)) for clip in clips]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stored = (tmp_path / "same-key.wav").read_bytes()
+    assert stored in clips
+    assert list(tmp_path.glob("*.tmp")) == []
+    # Every writer passed the exists() check, but the clip is counted once
+    assert cache.get_stats()["disk_entries"] == 1
+    assert cache.get_stats()["disk_bytes"] == len(stored)
+
+
+def test_rewriting_a_key_counts_only_the_size_difference(tmp_path, monkeypatch):
+    cache = TTSAudioCache(cache_dir=tmp_path)
+    cache._write_disk("clip", b"x" * 100)
+
+    # A writer that checked exists() before the first write landed
+    monkeypatch.setattr(Path, "exists", lambda path: False)
+    cache._write_disk("clip", b"y" * 60)
+
+    assert (tmp_path / "clip.wav").read_bytes() == b"y" * 60
+    assert cache.get_stats()["disk_entries"] == 1 and cache.get_stats()["disk_bytes"] == 60